@@ -0,0 +1,53 @@
+"""create blog_posts table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created through Base.metadata.create_all already have the table
+    if sa.inspect(op.get_bind()).has_table("blog_posts"):
+        return
+
+    op.create_table(
+        "blog_posts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column(
+            "date",
+            sa.DateTime(),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=False,
+        ),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("author", sa.String(length=255), nullable=False),
+        sa.Column("published", sa.String(length=100), nullable=False),
+        sa.Column("readTime", sa.String(length=50), nullable=False),
+        sa.Column("slug", sa.String(length=255), nullable=False),
+        sa.Column("category", sa.String(length=100), nullable=False),
+        sa.Column("image", sa.String(length=255), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_blog_posts_id"), "blog_posts", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_blog_posts_id"), table_name="blog_posts")
+    op.drop_table("blog_posts")
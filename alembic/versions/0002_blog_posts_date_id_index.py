@@ -0,0 +1,31 @@
+"""add (date, id) index for keyset pagination of blog_posts
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 09:05:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    indexes = sa.inspect(op.get_bind()).get_indexes("blog_posts")
+    if any(index["name"] == "ix_blog_posts_date_id" for index in indexes):
+        return
+    op.create_index("ix_blog_posts_date_id", "blog_posts", ["date", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_blog_posts_date_id", table_name="blog_posts")
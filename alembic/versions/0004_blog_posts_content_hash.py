@@ -0,0 +1,53 @@
+"""add content_hash to blog_posts for incremental reindexing
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 11:45:00.000000
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    columns = sa.inspect(op.get_bind()).get_columns("blog_posts")
+    if not any(column["name"] == "content_hash" for column in columns):
+        op.add_column(
+            "blog_posts", sa.Column("content_hash", sa.String(length=64), nullable=True)
+        )
+
+    # Backfill existing rows so the first reindex can skip unchanged posts
+    blog_posts = sa.table(
+        "blog_posts",
+        sa.column("id", sa.Integer),
+        sa.column("content", sa.Text),
+        sa.column("content_hash", sa.String),
+    )
+    bind = op.get_bind()
+    rows = bind.execute(
+        sa.select(blog_posts.c.id, blog_posts.c.content).where(
+            blog_posts.c.content_hash.is_(None)
+        )
+    ).all()
+    for post_id, content in rows:
+        bind.execute(
+            blog_posts.update()
+            .where(blog_posts.c.id == post_id)
+            .values(content_hash=hashlib.sha256(content.encode()).hexdigest())
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("blog_posts", "content_hash")
@@ -0,0 +1,31 @@
+"""store blog_posts.date with microseconds on SQLite
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 16:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows dated by CURRENT_TIMESTAMP lack the fractional seconds SQLAlchemy
+    # binds, so keyset pagination compared them as different (and smaller)
+    # strings; PostgreSQL compares real timestamps and needs nothing
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute("UPDATE blog_posts SET date = date || '.000000' WHERE length(date) = 19")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
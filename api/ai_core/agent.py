@@ -1,22 +1,41 @@
 # retrieval_service.py with caching
 
 import os
-import json
 import opik
 import redis
-import hashlib
+import time
 
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient, models
-from langchain_qdrant import QdrantVectorStore
-from langchain_huggingface import HuggingFaceEmbeddings
-
-from langchain.memory import ConversationBufferMemory
+from langchain_qdrant import (
+    QdrantVectorStore,
+    RetrievalMode,
+    SparseEmbeddings,
+    SparseVector,
+)
+
+from langchain_core.documents import Document
 from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.chains import ConversationalRetrievalChain
-from langchain_community.chat_message_histories import RedisChatMessageHistory
 from api.ai_core.prompt import create_answer_prompt, create_standalone_question_prompt
-from api.ai_core.config import QDRANT_URL, QDRANT_API_KEY, COLLECTION_NAME
+from api.ai_core.chat_pipeline import ChatPipeline
+from api.ai_core.chat_history import SharedRedisChatMessageHistory
+from api.ai_core.retrieval_cache import RetrievalCache
+from api.ai_core.answer_cache import SemanticAnswerCache
+from api.ai_core.query_cache import CachedQueryEmbeddings
+from api.ai_core.embedding_service import BatchedEmbeddings, query_embedder
+from api.ai_core.search_profiles import search_params
+from api.ai_core.config import (
+    QDRANT_URL,
+    QDRANT_API_KEY,
+    COLLECTION_NAME,
+    CHAT_SEARCH_PROFILE,
+    VECTOR_NAME,
+    SPARSE_VECTOR_NAME,
+    CHAT_RETRIEVAL_MODE,
+    COLLECTION_VERSION_REFRESH_SECONDS,
+)
+from api.ai_core.providers import alias_target, get_qdrant_client
+from api.ai_core.hybrid_search import embed_sparse_documents, embed_sparse_query
 
 
 load_dotenv()
@@ -25,6 +44,31 @@ os.environ["OPIK_WORKSPACE"] = os.getenv("OPIK_WORKSPACE")
 os.environ["OPIK_PROJECT_NAME"] = os.getenv("OPIK_PROJECT_NAME")
 
 
+def article_filter(article_id):
+    """Qdrant filter on the chunks of one article"""
+    return models.Filter(
+        must=[
+            models.FieldCondition(
+                key="original_id", match=models.MatchValue(value=article_id)
+            )
+        ]
+    )
+
+
+class SharedSparseEmbeddings(SparseEmbeddings):
+    """LangChain sparse embeddings backed by the process-wide sparse model"""
+
+    def embed_documents(self, texts):
+        return [
+            SparseVector(indices=vector.indices, values=vector.values)
+            for vector in embed_sparse_documents(texts)
+        ]
+
+    def embed_query(self, text):
+        vector = embed_sparse_query(text)
+        return SparseVector(indices=vector.indices, values=vector.values)
+
+
 class RetrievalService:
     def __init__(
         self,
@@ -35,7 +79,10 @@ class RetrievalService:
         redis_port=6379,
         redis_password="",
         cache_ttl=3600,
-        embedding_model_name="sentence-transformers/all-MiniLM-L6-v2",
+        redis_url=None,
+        embedder=None,
+        client=None,
+        retrieval_mode=CHAT_RETRIEVAL_MODE,
     ):
         """Initialize the retrieval service with vector store and caching.
 
@@ -47,41 +94,75 @@ class RetrievalService:
             redis_port: Redis port
             redis_password: Redis password
             cache_ttl: Cache time-to-live in seconds
-            embedding_model_name: Name of the HuggingFace embedding model to use
+            redis_url: Redis URL, used instead of redis_host/port/password when set
+            embedder: BatchingEmbedder for queries (default: the process-wide one,
+                shared with NeuralSearcher)
+            client: QdrantClient to use instead of connecting to qdrant_url
+            retrieval_mode: "dense", or "hybrid" to fuse dense and sparse (BM25) results
         """
         # Initialize Redis cache
-        self.redis_client = redis.Redis(
-            host=redis_host,
-            port=redis_port,
-            password=redis_password,
-            decode_responses=True,
-        )
+        if redis_url:
+            self.redis_client = redis.Redis.from_url(redis_url, decode_responses=True)
+        else:
+            self.redis_client = redis.Redis(
+                host=redis_host,
+                port=redis_port,
+                password=redis_password,
+                decode_responses=True,
+            )
 
         # Cache TTL in seconds
         self.cache_ttl = cache_ttl
 
         # Initialize Qdrant client
-        self.client = QdrantClient(
+        self.client = client or QdrantClient(
             url=qdrant_url,
             api_key=qdrant_api_key,
         )
 
-        # Initialize embedding model
-        self.embedding_model = HuggingFaceEmbeddings(model_name=embedding_model_name)
+        # Cache of retrieved chunks, keyed on the query and the collection version
+        self.collection_name = collection_name
+        self.retrieval_mode = retrieval_mode
+        self._collection_version = (None, float("-inf"))
+        self.retrieval_cache = RetrievalCache(
+            self.redis_client,
+            ttl=cache_ttl,
+            collection_version=self.collection_version,
+        )
+
+        # Initialize embedding model; repeated queries skip the forward pass and
+        # concurrent ones are batched with the searchers' queries
+        embedder = embedder or query_embedder
+        self.embedding_model = CachedQueryEmbeddings(
+            BatchedEmbeddings(embedder), model_name=embedder.model_name
+        )
 
         # Initialize vector store
+        hybrid = {}
+        if retrieval_mode == "hybrid":
+            hybrid = {
+                "retrieval_mode": RetrievalMode.HYBRID,
+                "sparse_embedding": SharedSparseEmbeddings(),
+                "sparse_vector_name": SPARSE_VECTOR_NAME,
+            }
         self.vector_store = QdrantVectorStore(
             client=self.client,
             collection_name=collection_name,
             embedding=self.embedding_model,
             content_payload_key="page_content",
             metadata_payload_key="metadata",
-            vector_name="fast-all-minilm-l6-v2",
+            vector_name=VECTOR_NAME,
+            **hybrid,
         )
 
     @opik.track(capture_input=True, capture_output=True)
     def vectorstore_backed_retriever(
-        self, article_id, search_type="similarity", k=4, score_threshold=None
+        self,
+        article_id,
+        search_type="similarity",
+        k=4,
+        score_threshold=None,
+        profile=CHAT_SEARCH_PROFILE,
     ):
         """Create a vectorsore-backed retriever.
 
@@ -90,6 +171,7 @@ class RetrievalService:
             search_type: Type of search - "similarity" (default), "mmr", or "similarity_score_threshold"
             k: Number of documents to return (Default: 4)
             score_threshold: Minimum relevance threshold for similarity_score_threshold (default=None)
+            profile: Search profile (fast, balanced or exact) setting hnsw_ef and quantization rescoring
 
         Returns:
             The retriever object
@@ -100,74 +182,90 @@ class RetrievalService:
         if score_threshold is not None:
             search_kwargs["score_threshold"] = score_threshold
 
-        metadata_filter = models.Filter(
-            must=[
-                models.FieldCondition(
-                    key="original_id", match=models.MatchValue(value=article_id)
-                )
-            ]
-        )
-        search_kwargs["filter"] = metadata_filter
+        search_kwargs["filter"] = article_filter(article_id)
+        search_kwargs["search_params"] = search_params(profile)
 
         retriever = self.vector_store.as_retriever(
             search_type=search_type, search_kwargs=search_kwargs
         )
         return retriever
 
-    @opik.track(capture_input=False, capture_output=False)
-    def _generate_cache_key(self, article_id):
-        """Generate a deterministic cache key from request parameters.
+    def collection_version(self):
+        """Collection the alias currently points to, re-read every few seconds"""
+        version, checked_at = self._collection_version
+        if time.monotonic() - checked_at > COLLECTION_VERSION_REFRESH_SECONDS:
+            version = alias_target(self.client) or self.collection_name
+            self._collection_version = (version, time.monotonic())
+        return version
+
+    def search_article(self, query, article_id, k=4, profile=CHAT_SEARCH_PROFILE):
+        """Search the chunks of one article, without building a retriever.
+
+        Results are served from the retrieval cache when the same (normalized)
+        query was answered for the article since its last invalidation.
 
         Args:
-            article_id: ID of the article
+            query: Search query
+            article_id: ID of the article to search in
+            k: Number of documents to return (Default: 4)
+            profile: Search profile (fast, balanced or exact)
 
         Returns:
-            Cache key string
+            List of the most similar Documents
         """
-        key_string = f"article:{article_id}"
-        # Create a hash to keep the key size manageable
-        return f"retrieval:{hashlib.md5(key_string.encode()).hexdigest()}"
+
+        def search():
+            documents = self.vector_store.similarity_search(
+                query,
+                k=k,
+                filter=article_filter(int(article_id)),
+                search_params=search_params(profile),
+            )
+            return [
+                {"content": doc.page_content, "metadata": doc.metadata}
+                for doc in documents
+            ]
+
+        chunks, _ = self.retrieval_cache.get_or_retrieve(
+            int(article_id),
+            query,
+            k,
+            f"similarity:{self.retrieval_mode}:{profile}",
+            search,
+        )
+        return [
+            Document(page_content=chunk["content"], metadata=chunk["metadata"])
+            for chunk in chunks
+        ]
 
     @opik.track(capture_input=True, capture_output=True)
     def retrieve_documents(self, request):
-        """Retrieve documents for a given article ID, with caching.
+        """Retrieve documents for a given article ID and query, with caching.
 
         Args:
-            request: RetrievalRequest object with article_id
+            request: RetrievalRequest object with article_id and query
 
         Returns:
             RetrievalResponse object with chunks and cache_hit status
         """
         try:
-            # Generate cache key
-            cache_key = self._generate_cache_key(request.article_id)
-
-            # Try to get from cache first
-            cached_result = self.redis_client.get(cache_key)
-            if cached_result:
-                chunks = json.loads(cached_result)
-                return chunks  # RetrievalResponse(chunks=chunks, cache_hit=True)
-
-            # Get retriever and search
             retriever = self.vectorstore_backed_retriever(
                 int(request.article_id),
                 search_type="similarity",
                 k=4,
                 score_threshold=None,
             )
-
-            results = retriever.invoke(request.query)
-
-            # Format results
-            chunks = [
-                {"content": doc.page_content, "metadata": doc.metadata}
-                for doc in results
-            ]
-
-            # Cache the results
-            self.redis_client.setex(cache_key, self.cache_ttl, json.dumps(chunks))
-
-            return chunks  # RetrievalResponse(chunks=chunks, cache_hit=False)
+            chunks, _ = self.retrieval_cache.get_or_retrieve(
+                int(request.article_id),
+                request.query or "",
+                4,
+                f"similarity:{self.retrieval_mode}:{CHAT_SEARCH_PROFILE}",
+                lambda: [
+                    {"content": doc.page_content, "metadata": doc.metadata}
+                    for doc in retriever.invoke(request.query)
+                ],
+            )
+            return chunks  # RetrievalResponse(chunks=chunks, cache_hit=cache_hit)
 
         except Exception as e:
             # Return the error
@@ -177,29 +275,19 @@ class RetrievalService:
     def invalidate_cache(self, article_id):
         """Invalidate all cached results for a specific article.
 
+        Bumps the article's cache namespace, a single Redis command however
+        many queries were cached.
+
         Args:
             article_id: ID of the article to invalidate cache for
 
         Returns:
             Dictionary with message about invalidated entries
         """
-        pattern = f"retrieval:*article:{article_id}*"
-        keys_to_delete = []
-
-        # Scan for matching keys
-        cursor = 0
-        while True:
-            cursor, keys = self.redis_client.scan(cursor, pattern, 100)
-            keys_to_delete.extend(keys)
-            if cursor == 0:
-                break
-
-        # Delete the keys
-        if keys_to_delete:
-            self.redis_client.delete(*keys_to_delete)
-
+        namespace = self.retrieval_cache.invalidate(int(article_id))
         return {
-            "message": f"Invalidated {len(keys_to_delete)} cache entries for article {article_id}"
+            "message": f"Invalidated cache entries for article {article_id}",
+            "namespace": namespace,
         }
 
     def get_stats(self):
@@ -213,6 +301,7 @@ class RetrievalService:
         misses = self.redis_client.info().get("keyspace_misses", 1)
 
         cache_info = {
+            "retrieval": self.retrieval_cache.stats(),
             "cache_size": self.redis_client.dbsize(),
             "cache_hit_rate": (hits / (hits + misses)) * 100
             if (hits + misses) > 0
@@ -224,11 +313,14 @@ class RetrievalService:
 
 class ConversationalRetrievalBot:
     """
-    A class for creating and managing conversational retrieval chains for multiple users.
+    A class answering the conversations of multiple users with one shared chat pipeline.
     """
 
     def __init__(
         self,
+        retrieve,
+        embed=None,
+        article_version=None,
         redis_url="http://127.0.0.1:6379",
         google_api_key=None,
         model="gemini-2.0-flash-lite",
@@ -239,6 +331,9 @@ class ConversationalRetrievalBot:
         Initialize the bot with configuration parameters.
 
         Args:
+            retrieve (callable): Maps (question, article_id) to the article's relevant Documents.
+            embed (callable, optional): Maps a question to its vector; enables the semantic answer cache.
+            article_version (callable, optional): Maps an article ID to the version of its indexed chunks, which cached answers are checked against.
             redis_url (str, optional): Redis URL for chat history persistence. Defaults to environment variable.
             google_api_key (str, optional): Google API key. Defaults to environment variable.
             model (str, optional): Model name for Google Generative AI. Defaults to "gemini-2.0-flash-lite".
@@ -256,6 +351,8 @@ class ConversationalRetrievalBot:
         self.redis_url = redis_url  # or os.environ.get("REDIS_URL")
         if not self.redis_url:
             raise ValueError("Redis URL is required for persistent chat history")
+        # One client (and connection pool) for the history of every session
+        self.redis_client = redis.Redis.from_url(self.redis_url)
 
         # Create LLM instance
         self.llm = ChatGoogleGenerativeAI(
@@ -269,90 +366,68 @@ class ConversationalRetrievalBot:
         # Use the same LLM for question condensation
         self.condense_question_llm = self.llm
 
-        # Store user chains
-        self.user_chains = {}
-
         # During development - use prompts without versioning
         self.answer_prompt = create_answer_prompt(language="english")
         self.standalone_question_prompt = create_standalone_question_prompt()
 
-    @opik.track(capture_input=False, capture_output=False)
-    def _create_memory(self, session_id):
+        # Answers to first-turn questions, reused for similar ones per article
+        self.answer_cache = SemanticAnswerCache(article_version=article_version)
+
+        # One pipeline for all sessions; history and article are per-call inputs
+        self.pipeline = ChatPipeline(
+            llm=self.llm,
+            answer_prompt=self.answer_prompt,
+            retrieve=retrieve,
+            condense_question_llm=self.condense_question_llm,
+            standalone_question_prompt=self.standalone_question_prompt,
+            answer_cache=self.answer_cache,
+            embed=embed,
+        )
+
+    def get_history(self, session_id):
         """
-        Create memory specific to a user session.
+        Chat history of a user session.
 
         Args:
             session_id (str): Unique identifier for the user session.
 
         Returns:
-            ConversationBufferMemory: Memory instance for the specified session.
+            SharedRedisChatMessageHistory: History of the specified session.
         """
-        message_history = RedisChatMessageHistory(
-            session_id=session_id, url=self.redis_url
-        )
-        memory = ConversationBufferMemory(
-            chat_memory=message_history,
-            return_messages=True,
-            memory_key="chat_history",
-            output_key="answer",
-            input_key="question",
+        return SharedRedisChatMessageHistory(
+            session_id=session_id, redis_client=self.redis_client
         )
-        return memory
 
     @opik.track(capture_input=True, capture_output=True)
-    def get_chain_for_user(self, session_id, retriever, language="english"):
+    def process_query(self, session_id, question, article_id, language="english"):
         """
-        Get or create a conversational chain for a specific user.
+        Process a user query and return the response.
 
         Args:
             session_id (str): Unique identifier for the user session.
-            retriever: Document retriever instance.
-            language (str, optional): Language for responses. Defaults to "english".
+            question (str): User's question.
+            article_id: ID of the article to search within.
+            language (str, optional): Language for the response. Defaults to "english".
 
         Returns:
-            ConversationalRetrievalChain: Chain for the specified user.
+            dict: Response containing the answer, source documents and chat history.
         """
-        # Return existing chain if already created
-        if session_id in self.user_chains:
-            return self.user_chains[session_id]
-
-        # Create user-specific memory
-        memory = self._create_memory(session_id)
-
-        # Create the chain
-        chain = ConversationalRetrievalChain.from_llm(
-            condense_question_prompt=self.standalone_question_prompt,
-            combine_docs_chain_kwargs={"prompt": self.answer_prompt},
-            condense_question_llm=self.condense_question_llm,
-            memory=memory,
-            retriever=retriever,
-            llm=self.llm,
-            chain_type="stuff",
-            verbose=False,
-            return_source_documents=True,
-        )
-
-        # Store chain for future use
-        self.user_chains[session_id] = chain
-
-        return chain
+        return self.pipeline.invoke(question, article_id, self.get_history(session_id))
 
-    @opik.track(capture_input=True, capture_output=True)
-    def process_query(self, session_id, question, retriever, language="english"):
+    def stream_query(self, session_id, question, article_id, language="english"):
         """
-        Process a user query and return the response.
+        Stream the response to a user query, see `ChatPipeline.stream`.
 
         Args:
             session_id (str): Unique identifier for the user session.
             question (str): User's question.
-            retriever: Document retriever instance.
+            article_id: ID of the article to search within.
             language (str, optional): Language for the response. Defaults to "english".
 
         Returns:
-            dict: Response containing the answer and source documents.
+            Iterator: (event name, event data) pairs.
         """
-        chain = self.get_chain_for_user(session_id, retriever, language)
-        return chain.invoke({"question": question})
+        return self.pipeline.stream(question, article_id, self.get_history(session_id))
 
     @opik.track(capture_input=True, capture_output=False)
     def clear_user_history(self, session_id):
@@ -362,15 +437,7 @@ class ConversationalRetrievalBot:
         Args:
             session_id (str): Unique identifier for the user session.
         """
-        if session_id in self.user_chains:
-            # Remove from cache
-            del self.user_chains[session_id]
-
-        # Create and immediately clear Redis history
-        message_history = RedisChatMessageHistory(
-            session_id=session_id, url=self.redis_url
-        )
-        message_history.clear()
+        self.get_history(session_id).clear()
 
 
 class ChatbotService:
@@ -385,12 +452,23 @@ class ChatbotService:
         Args:
             redis_url (str, optional): Redis URL for chat history persistence.
         """
-        # Initialize the conversational bot
-        self.bot = ConversationalRetrievalBot(redis_url=redis_url)
         self.retriever = RetrievalService(
             qdrant_url=QDRANT_URL,
             qdrant_api_key=QDRANT_API_KEY,
             collection_name=COLLECTION_NAME,
+            redis_url=redis_url,
+            client=get_qdrant_client(),
+        )
+        # Initialize the conversational bot
+        # Questions are embedded through the same cached query embeddings as
+        # retrieval, so a cache miss costs no extra forward pass
+        self.bot = ConversationalRetrievalBot(
+            retrieve=self.retriever.search_article,
+            embed=self.retriever.embedding_model.embed_query,
+            # Cached answers go stale with the article's retrieval cache
+            # namespace, which every process bumps on reindex
+            article_version=self.retriever.retrieval_cache.version,
+            redis_url=redis_url,
         )
 
     @opik.track(capture_input=True, capture_output=True)
@@ -407,35 +485,41 @@ class ChatbotService:
             language (str, optional): Language for the response. Defaults to "english".
 
         Returns:
-            dict: Chatbot's response containing the answer and source documents.
+            dict: Chatbot's answer and the conversation's chat history.
         """
         # Create a session ID that includes both user ID and article ID
         # This ensures separate conversation history for each user-article pair
         session_id = f"{user_id}:{article_id}"
-        adapted_retriever = self.retriever.vectorstore_backed_retriever(int(article_id))
-
-        # Process the query
         response = self.bot.process_query(
             session_id=session_id,
             question=message,
-            retriever=adapted_retriever,
+            article_id=int(article_id),
             language=language,
         )
-        chain = self.bot.get_chain_for_user(session_id, adapted_retriever, language)
-        chat_history = (
-            chain.memory.chat_memory.messages if hasattr(chain, "memory") else []
-        )
+        return {"answer": response["answer"], "chat_history": response["chat_history"]}
+
+    def stream_chat(
+        self, user_id: str, article_id: str, message: str, language: str = "english"
+    ):
+        """
+        Process a user message, streaming the chatbot's response as it is generated.
 
-        # Process the chat history to a more usable format
-        processed_history = []
-        for msg in chat_history:
-            # Convert LangChain message objects to a simpler dict format
-            # Typically messages have a 'type' (human/ai) and 'content'
-            msg_type = "user" if msg.type == "human" else "assistant"
-            processed_history.append({"role": msg_type, "content": msg.content})
+        Args:
+            user_id (str): Unique identifier for the user.
+            article_id (str): ID of the article to search within.
+            message (str): User's message.
+            language (str, optional): Language for the response. Defaults to "english".
 
-        # Return the full response including answer and source documents
-        return {"answer": response["answer"], "chat_history": processed_history}
+        Returns:
+            Iterator: (event name, event data) pairs, ending with "done" or "error".
+        """
+        session_id = f"{user_id}:{article_id}"
+        return self.bot.stream_query(
+            session_id=session_id,
+            question=message,
+            article_id=int(article_id),
+            language=language,
+        )
 
     @opik.track(capture_input=True, capture_output=False)
     def reset_conversation(self, user_id: str, article_id: str):
@@ -0,0 +1,156 @@
+import time
+import threading
+from collections import OrderedDict
+import numpy as np
+from api.ai_core.config import (
+    ANSWER_CACHE_MAX_ARTICLES,
+    ANSWER_CACHE_MAX_PER_ARTICLE,
+    ANSWER_CACHE_THRESHOLD,
+    ANSWER_CACHE_TTL_SECONDS,
+)
+
+
+class SemanticAnswerCache:
+    """
+    In-process cache of chat answers, looked up by question similarity per article.
+
+    Each article keeps the unit-normalized vectors of its answered questions
+    in one matrix, so a lookup is a single matrix-vector product; the best
+    match is served when its cosine similarity reaches `threshold`. Articles
+    are evicted least recently used first, and each keeps at most
+    `max_per_article` answers (the oldest are dropped). Only answers that do
+    not depend on earlier turns of a conversation belong here.
+
+    Answers are stored with the version of the article's indexed chunks
+    (`article_version`, e.g. `RetrievalCache.version`: the collection behind
+    the alias and the article's Redis namespace), so a rebuild or a reindex
+    by any process makes them stale; articles unused for `ttl` seconds are
+    dropped as well.
+
+    Args:
+        threshold (float): Minimum cosine similarity of a hit
+        max_articles (int): Articles kept in memory
+        max_per_article (int): Answers kept per article
+        ttl (float): Seconds an unused article is kept, 0 for no expiry
+        article_version (callable): Maps an article ID to its current version
+    """
+
+    def __init__(
+        self,
+        threshold: float = ANSWER_CACHE_THRESHOLD,
+        max_articles: int = ANSWER_CACHE_MAX_ARTICLES,
+        max_per_article: int = ANSWER_CACHE_MAX_PER_ARTICLE,
+        ttl: float = ANSWER_CACHE_TTL_SECONDS,
+        article_version=None,
+    ):
+        self.threshold = threshold
+        self.max_articles = max_articles
+        self.max_per_article = max_per_article
+        self.ttl = ttl
+        self.article_version = article_version or (lambda article_id: "")
+        # article_id -> (version, last used, vectors matrix, [(question, answer)])
+        self._articles = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @staticmethod
+    def _normalize(vector):
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def version(self, article_id):
+        """Current version of an article, or None if it cannot be read"""
+        try:
+            return self.article_version(article_id)
+        except Exception as e:
+            print(f"Answer cache version lookup failed: {e}")
+            with self._lock:
+                self.errors += 1
+            return None
+
+    def _entry(self, article_id, version, now):
+        """Live entry of an article, dropping it if stale or expired"""
+        entry = self._articles.get(article_id)
+        if entry is None:
+            return None
+        if entry[0] != version or (self.ttl and now - entry[1] > self.ttl):
+            del self._articles[article_id]
+            self.invalidations += 1
+            return None
+        return entry
+
+    def get(self, article_id, vector, version=""):
+        """
+        Cached answer to the closest question asked about an article.
+
+        Args:
+            article_id: ID of the article
+            vector (list): Embedding of the (standalone) question
+            version: Current version of the article, see `version`
+
+        Returns:
+            tuple: (answer, similarity), or None below the threshold
+        """
+        query = self._normalize(vector)
+        now = time.monotonic()
+        with self._lock:
+            entry = None
+            if version is not None:
+                entry = self._entry(article_id, version, now)
+            if entry is not None:
+                _, _, vectors, answers = entry
+                self._articles[article_id] = (version, now, vectors, answers)
+                self._articles.move_to_end(article_id)
+                similarities = vectors @ query
+                best = int(np.argmax(similarities))
+                if similarities[best] >= self.threshold:
+                    self.hits += 1
+                    return answers[best][1], float(similarities[best])
+            self.misses += 1
+            return None
+
+    def set(self, article_id, question: str, vector, answer: str, version=""):
+        """
+        Store the answer to a question about an article.
+
+        `version` must be read before the answer's chunks were retrieved, so
+        a reindex in between leaves the answer stale rather than current.
+        """
+        if version is None:
+            return
+        vector = self._normalize(vector)[None, :]
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entry(article_id, version, now)
+            if entry is None:
+                vectors, answers = vector, [(question, answer)]
+            else:
+                vectors = np.vstack([entry[2], vector])[-self.max_per_article :]
+                answers = (entry[3] + [(question, answer)])[-self.max_per_article :]
+            self._articles[article_id] = (version, now, vectors, answers)
+            self._articles.move_to_end(article_id)
+            while len(self._articles) > self.max_articles:
+                self._articles.popitem(last=False)
+
+    def invalidate(self, article_id):
+        """Forget every answer about an article, e.g. once it is reindexed"""
+        with self._lock:
+            if self._articles.pop(article_id, None) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "articles": len(self._articles),
+                "answers": sum(len(entry[3]) for entry in self._articles.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "errors": self.errors,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,82 @@
+import time
+from typing import List
+from qdrant_client import QdrantClient, models
+from api.ai_core.config import SEARCH_PROFILE, TEXT_FIELD_NAME, VECTOR_NAME
+from api.ai_core.embedding_service import query_embedder
+from api.ai_core.providers import get_qdrant_client
+from api.ai_core.query_cache import query_vector_cache
+from api.ai_core.search_profiles import search_params
+
+
+class BatchSearcher:
+    """
+    Many dense searches served with one embedding batch and one Qdrant round trip.
+
+    Query vectors come from the shared cache, the misses being embedded
+    together; the searches then run through `query_batch_points`, each with
+    its own filter and limit, and the results come back in request order.
+    """
+
+    def __init__(
+        self, collection_name: str, client: QdrantClient = None, embedder=None
+    ):
+        self.collection_name = collection_name
+        self.qdrant_client = client or get_qdrant_client()
+        self.embedder = embedder or query_embedder
+
+    def search(
+        self, queries: List[dict], profile: str = SEARCH_PROFILE
+    ) -> List[List[dict]]:
+        """
+        Run several searches at once.
+
+        Args:
+            queries (list): Dicts with the query "text", and optionally a
+                "filter_" (Qdrant filter as a dict) and a "limit" (default 5)
+            profile (str): Search profile shared by all queries
+
+        Returns:
+            list: Per query, the payloads of its hits without the document text
+        """
+        if not queries:
+            return []
+        start_time = time.time()
+        vectors = query_vector_cache.get_or_embed_many(
+            self.embedder.model_name,
+            [query["text"] for query in queries],
+            self.embedder.embed_many,
+        )
+        params = search_params(profile)
+        responses = self.qdrant_client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=[
+                models.QueryRequest(
+                    query=vector,
+                    using=VECTOR_NAME,
+                    filter=(
+                        models.Filter(**query["filter_"])
+                        if query.get("filter_")
+                        else None
+                    ),
+                    limit=query.get("limit", 5),
+                    params=params,
+                    with_payload=True,
+                )
+                for query, vector in zip(queries, vectors)
+            ],
+        )
+        print(
+            f"Batch search of {len(queries)} queries took "
+            f"{time.time() - start_time} seconds"
+        )
+        return [
+            [
+                {
+                    key: value
+                    for key, value in hit.payload.items()
+                    if key != TEXT_FIELD_NAME
+                }
+                for hit in response.points
+            ]
+            for response in responses
+        ]
@@ -0,0 +1,42 @@
+import json
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import message_to_dict, messages_from_dict
+
+
+class SharedRedisChatMessageHistory(BaseChatMessageHistory):
+    """
+    Redis chat history on a shared client instead of a connection pool per session.
+
+    Stores messages like RedisChatMessageHistory (a list at key_prefix +
+    session_id, newest first), whose constructor opens a client of its own
+    and probes the server with INFO for every history object.
+
+    Args:
+        session_id (str): ID of the chat session
+        redis_client: Redis client shared by every session
+        key_prefix (str): Prefix of the session's key
+        ttl (int): Seconds the history is kept after its last message
+    """
+
+    def __init__(self, session_id, redis_client, key_prefix="message_store:", ttl=None):
+        self.redis_client = redis_client
+        self.session_id = session_id
+        self.key_prefix = key_prefix
+        self.ttl = ttl
+
+    @property
+    def key(self):
+        return self.key_prefix + self.session_id
+
+    @property
+    def messages(self):
+        items = self.redis_client.lrange(self.key, 0, -1)
+        return messages_from_dict([json.loads(item) for item in items[::-1]])
+
+    def add_message(self, message):
+        self.redis_client.lpush(self.key, json.dumps(message_to_dict(message)))
+        if self.ttl:
+            self.redis_client.expire(self.key, self.ttl)
+
+    def clear(self):
+        self.redis_client.delete(self.key)
@@ -0,0 +1,202 @@
+import time
+from typing import Callable, Iterator, List, Tuple
+
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.documents import Document
+from langchain.chains.conversational_retrieval.base import _get_chat_history
+from api.ai_core.chat_stream import history_messages
+from api.ai_core.answer_cache import SemanticAnswerCache
+
+# Separator of the retrieved chunks in the prompt context, as in the "stuff" chain
+DOCUMENT_SEPARATOR = "\n\n"
+
+
+class ChatPipeline:
+    """
+    Conversational RAG pipeline built once and shared by every chat session.
+
+    Follows the steps of ConversationalRetrievalChain as LCEL runnables: a
+    follow-up question is rephrased into a standalone one, the article's
+    chunks are retrieved for it and "stuffed" into the answer prompt. The
+    session history and the article are inputs of each call rather than
+    state of the pipeline, so a session costs nothing beyond its history.
+
+    With an `answer_cache`, the first question of a conversation (whose
+    answer does not depend on any history) is embedded and answered from
+    earlier answers about the same article when one is similar enough,
+    skipping retrieval and the LLM.
+
+    Args:
+        llm: Chat model answering the question
+        answer_prompt: Prompt with chat_history, context and question variables
+        retrieve (callable): Maps (question, article_id) to a list of Documents
+        condense_question_llm: Chat model rephrasing follow-ups (default: llm)
+        standalone_question_prompt: Prompt with chat_history and question
+            variables; without it follow-ups are not rephrased
+        answer_cache (SemanticAnswerCache): Answers to first-turn questions
+        embed (callable): Maps a question to its vector, for the answer cache
+    """
+
+    def __init__(
+        self,
+        llm,
+        answer_prompt,
+        retrieve: Callable[[str, object], List[Document]],
+        condense_question_llm=None,
+        standalone_question_prompt=None,
+        answer_cache: SemanticAnswerCache = None,
+        embed: Callable[[str], List[float]] = None,
+    ):
+        self.retrieve = retrieve
+        self.answer_cache = answer_cache if embed is not None else None
+        self.embed = embed
+        self.condense = None
+        if standalone_question_prompt is not None:
+            self.condense = standalone_question_prompt | (condense_question_llm or llm)
+        # Messages are read with .content: an output parser step costs as
+        # much per call as the prompt formatting itself
+        self.answer = answer_prompt | llm
+
+    def prepare(self, question: str, article_id, messages) -> Tuple[dict, list]:
+        """
+        Answer prompt inputs of a chat message, and the retrieved documents.
+
+        The glue between the LCEL chains is plain Python: wrapping it in
+        RunnableLambda/RunnablePassthrough steps adds callback and config
+        plumbing (and a thread pool for `assign`) that costs more per turn
+        than the steps themselves.
+        """
+        chat_history = _get_chat_history(messages)
+        if messages and self.condense is not None:
+            question = self.condense.invoke(
+                {"chat_history": chat_history, "question": question}
+            ).content
+        documents = self.retrieve(question, article_id)
+        inputs = {
+            "chat_history": chat_history,
+            "context": DOCUMENT_SEPARATOR.join(
+                document.page_content for document in documents
+            ),
+            "question": question,
+        }
+        return inputs, documents
+
+    def cached_answer(self, question: str, article_id, messages):
+        """
+        Answer cached for a first-turn question, and what caching it takes.
+
+        Returns:
+            tuple: (answer or None, (vector, article version) or None); the
+                latter is None when the answer cannot be cached (follow-up or
+                no cache)
+        """
+        if self.answer_cache is None or messages:
+            return None, None
+        vector = self.embed(question)
+        # Read before retrieval, so a reindex meanwhile makes the answer stale
+        version = self.answer_cache.version(article_id)
+        hit = self.answer_cache.get(article_id, vector, version)
+        return (hit[0] if hit else None), (vector, version)
+
+    def _cache(self, question: str, article_id, key, answer: str):
+        if key is not None:
+            vector, version = key
+            self.answer_cache.set(article_id, question, vector, answer, version)
+
+    @staticmethod
+    def _save(history, messages, question, answer):
+        """Add the turn to the session history, returning the updated history"""
+        history.add_user_message(question)
+        history.add_ai_message(answer)
+        return history_messages(messages) + [
+            {"role": "user", "content": question},
+            {"role": "assistant", "content": answer},
+        ]
+
+    def invoke(
+        self, question: str, article_id, history: BaseChatMessageHistory
+    ) -> dict:
+        """
+        Answer a chat message and add the turn to `history`.
+
+        Returns:
+            dict: answer, source_documents, the updated chat_history and
+                whether the answer came from the answer cache
+        """
+        # Snapshot: in-memory histories return their live message list
+        messages = list(history.messages)
+        answer, key = self.cached_answer(question, article_id, messages)
+        cached = answer is not None
+        documents = []
+        if not cached:
+            inputs, documents = self.prepare(question, article_id, messages)
+            answer = self.answer.invoke(inputs).content
+            self._cache(question, article_id, key, answer)
+        return {
+            "answer": answer,
+            "source_documents": documents,
+            "chat_history": self._save(history, messages, question, answer),
+            "cached": cached,
+        }
+
+    def stream(
+        self, question: str, article_id, history: BaseChatMessageHistory
+    ) -> Iterator[Tuple[str, dict]]:
+        """
+        Answer a chat message token by token, as (event, data) pairs.
+
+        The events are:
+            - retrieval: once the chunks are retrieved, with their count, or
+              right away with cached=True for an answer from the answer cache
+            - first_token: when the LLM produced its first token
+            - token: every piece of the answer
+            - done: the full answer and chat history, once saved
+            - error: if any step failed; nothing is saved then
+
+        The turn is added to `history` only once the answer is complete, so
+        an interrupted stream leaves the conversation unchanged.
+        """
+        start = time.perf_counter()
+        try:
+            messages = list(history.messages)
+            answer, key = self.cached_answer(question, article_id, messages)
+            cached = answer is not None
+            if cached:
+                yield "retrieval", {
+                    "documents": 0,
+                    "cached": True,
+                    "seconds": time.perf_counter() - start,
+                }
+                yield "first_token", {"seconds": time.perf_counter() - start}
+                yield "token", {"text": answer}
+            else:
+                inputs, documents = self.prepare(question, article_id, messages)
+                yield "retrieval", {
+                    "documents": len(documents),
+                    "cached": False,
+                    "seconds": time.perf_counter() - start,
+                }
+
+                tokens = []
+                for chunk in self.answer.stream(inputs):
+                    token = chunk.content
+                    if not token:
+                        continue
+                    if not tokens:
+                        yield "first_token", {"seconds": time.perf_counter() - start}
+                    tokens.append(token)
+                    yield "token", {"text": token}
+
+                answer = "".join(tokens)
+                self._cache(question, article_id, key, answer)
+            chat_history = self._save(history, messages, question, answer)
+        except Exception as e:
+            yield "error", {"detail": str(e)}
+            return
+
+        yield "done", {
+            "answer": answer,
+            "chat_history": chat_history,
+            "cached": cached,
+            "seconds": time.perf_counter() - start,
+        }
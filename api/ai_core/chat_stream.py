@@ -0,0 +1,17 @@
+import json
+
+
+def sse_event(event: str, data: dict) -> str:
+    """One Server-Sent Event frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def history_messages(messages) -> list:
+    """Chat messages as {"role", "content"} dicts, as returned by /ask"""
+    return [
+        {
+            "role": "user" if message.type == "human" else "assistant",
+            "content": message.content,
+        }
+        for message in messages
+    ]
@@ -0,0 +1,67 @@
+import uuid
+import hashlib
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+# Namespace of the chunk point ids; changing it re-keys every point in Qdrant
+CHUNK_ID_NAMESPACE = uuid.UUID("6f1c7a52-3b8e-5d4a-9c2f-0e7b1d5a8c34")
+
+text_splitter = RecursiveCharacterTextSplitter(
+    chunk_size=1000,
+    chunk_overlap=100,
+    separators=["\n\n", "\n", " ", ""],
+)
+
+
+def content_hash(text: str) -> str:
+    """SHA-256 hex digest of a piece of text."""
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def chunk_point_id(post_id: int, chunk_index: int, chunk: str) -> str:
+    """
+    Deterministic Qdrant point id of a chunk.
+
+    The same post, position and text always map to the same UUIDv5, so
+    re-indexing a post is an idempotent upsert and no id allocation against
+    the collection is needed.
+    """
+    name = f"{post_id}:{chunk_index}:{content_hash(chunk)}"
+    return str(uuid.uuid5(CHUNK_ID_NAMESPACE, name))
+
+
+def build_chunk_records(
+    post_id: int,
+    title: str,
+    content: str,
+    category: str = None,
+    author: str = None,
+):
+    """
+    Split a post into chunks with their payload metadata and point ids.
+
+    `category` and `author` are copied onto every chunk so searches can be
+    filtered on them through their payload indexes.
+
+    Returns:
+        tuple: (chunks, metadata, ids), three lists of equal length
+    """
+    chunks = text_splitter.split_text(content)
+    post_hash = content_hash(content)
+    metadata = []
+    ids = []
+    for i, chunk in enumerate(chunks):
+        metadata.append(
+            {
+                "original_id": post_id,
+                "title": title,
+                "chunk_index": i,
+                "chunk_count": len(chunks),
+                "category": category,
+                "author": author,
+                "page_content": chunk,
+                # Lets reindexing detect edited posts without re-chunking them
+                "content_hash": post_hash,
+            }
+        )
+        ids.append(chunk_point_id(post_id, i, chunk))
+    return chunks, metadata, ids
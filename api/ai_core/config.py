@@ -10,10 +10,82 @@ STATIC_DIR = os.path.join(ROOT_DIR, "static")
 
 QDRANT_URL = os.getenv("QDRANT_URL", "http://localhost:6333/")
 QDRANT_API_KEY = os.getenv("QDRANT_API_KEY", "")
+# The shared client talks gRPC when possible; REST calls reuse pooled connections
+QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "true").lower() == "true"
+QDRANT_POOL_SIZE = int(os.getenv("QDRANT_POOL_SIZE", "32"))
 
+# Alias searchers query; it points at the live versioned collection
+# (see rebuild_collection in init_blogposts_collection.py)
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "text-demo")
 EMBEDDINGS_MODEL = os.getenv(
     "EMBEDDINGS_MODEL", "sentence-transformers/all-MiniLM-L6-v2"
 )
 
+# Disk cache of chunk embeddings reused across indexing runs; empty disables it
+EMBEDDING_CACHE_DIR = os.getenv(
+    "EMBEDDING_CACHE_DIR", os.path.join(DATA_DIR, "embedding_cache")
+)
+
+# Named vector qdrant-client's fastembed integration uses for EMBEDDINGS_MODEL
+VECTOR_NAME = f"fast-{EMBEDDINGS_MODEL.split('/')[-1].lower()}"
+
+# Sparse (lexical) model stored next to the dense vector for hybrid search
+SPARSE_EMBEDDINGS_MODEL = os.getenv("SPARSE_EMBEDDINGS_MODEL", "Qdrant/bm25")
+SPARSE_VECTOR_NAME = f"fast-sparse-{SPARSE_EMBEDDINGS_MODEL.split('/')[-1].lower()}"
+# Candidates each of the dense and sparse searches contributes before fusion
+HYBRID_PREFETCH_LIMIT = int(os.getenv("HYBRID_PREFETCH_LIMIT", "20"))
+# Chat retrieval: "dense", or "hybrid" once the collection has sparse vectors
+CHAT_RETRIEVAL_MODE = os.getenv("CHAT_RETRIEVAL_MODE", "dense")
+
+# Vector quantization of new collections: scalar, binary, product or none
+QUANTIZATION = os.getenv("QUANTIZATION", "scalar")
+# Default search profiles (fast, balanced or exact) of /ai-search and chat retrieval
+SEARCH_PROFILE = os.getenv("SEARCH_PROFILE", "balanced")
+CHAT_SEARCH_PROFILE = os.getenv("CHAT_SEARCH_PROFILE", "balanced")
+# Grouped /ai-search: most posts one page can reach (offset + limit) and
+# most chunks returned per post
+MAX_SEARCH_GROUPS = int(os.getenv("MAX_SEARCH_GROUPS", "100"))
+MAX_GROUP_SIZE = int(os.getenv("MAX_GROUP_SIZE", "5"))
+# Most queries one /ai-search/batch request may carry, and results per query
+MAX_BATCH_QUERIES = int(os.getenv("MAX_BATCH_QUERIES", "32"))
+MAX_BATCH_LIMIT = int(os.getenv("MAX_BATCH_LIMIT", "50"))
+
+# Query embeddings cached across searchers; a TTL of 0 keeps entries until evicted
+QUERY_CACHE_MAX_ENTRIES = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "10000"))
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "0"))
+# Redis holding the chat retrieval cache; the indexing CLI bumps the cache
+# namespace of every post it reindexes so all API processes drop stale results
+REDIS_URL = os.getenv("REDIS_URL", "")
+# How often chat retrieval re-reads the collection behind the alias, which is
+# part of the retrieval cache key so a rebuild never serves stale chunks
+COLLECTION_VERSION_REFRESH_SECONDS = float(
+    os.getenv("COLLECTION_VERSION_REFRESH_SECONDS", "30")
+)
+
+# Chat answers to first-turn questions are reused for questions about the same
+# article whose embedding is at least this cosine-similar
+ANSWER_CACHE_THRESHOLD = float(os.getenv("ANSWER_CACHE_THRESHOLD", "0.95"))
+ANSWER_CACHE_MAX_ARTICLES = int(os.getenv("ANSWER_CACHE_MAX_ARTICLES", "1000"))
+ANSWER_CACHE_MAX_PER_ARTICLE = int(os.getenv("ANSWER_CACHE_MAX_PER_ARTICLE", "256"))
+# Articles whose cached answers went unused this long are dropped; 0 keeps them
+ANSWER_CACHE_TTL_SECONDS = float(os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600"))
+
+# Concurrent query embeddings are grouped into batches of up to QUERY_BATCH_SIZE,
+# waiting at most QUERY_BATCH_MAX_LATENCY_MS for a batch to fill
+QUERY_BATCH_SIZE = int(os.getenv("QUERY_BATCH_SIZE", "32"))
+QUERY_BATCH_MAX_LATENCY_MS = float(os.getenv("QUERY_BATCH_MAX_LATENCY_MS", "5"))
+
+# Saved BM25 index of chunk text used by keyword search; empty keeps it in memory only
+LEXICAL_INDEX_DIR = os.getenv(
+    "LEXICAL_INDEX_DIR", os.path.join(DATA_DIR, "lexical_index")
+)
+# The index lives in each API process; besides the posts that process embeds,
+# it is re-synced with the posts table this often (0 only syncs at startup)
+LEXICAL_INDEX_SYNC_SECONDS = float(os.getenv("LEXICAL_INDEX_SYNC_SECONDS", "300"))
+
+# Keyword search returns up to HIGHLIGHT_MAX_SNIPPETS windows of about
+# HIGHLIGHT_SNIPPET_CHARS around the matches instead of whole chunks (0 disables)
+HIGHLIGHT_SNIPPET_CHARS = int(os.getenv("HIGHLIGHT_SNIPPET_CHARS", "200"))
+HIGHLIGHT_MAX_SNIPPETS = int(os.getenv("HIGHLIGHT_MAX_SNIPPETS", "2"))
+
 TEXT_FIELD_NAME = "document"
@@ -0,0 +1,234 @@
+import os
+import re
+import json
+import fcntl
+import hashlib
+import threading
+import numpy as np
+
+# Bytes of a sha256 digest, the on-disk key of every cached vector
+KEY_BYTES = 32
+# Tail entries kept in a dict before they are merged into the sorted key index
+MIN_TAIL_SIZE = 4096
+
+
+class EmbeddingCache:
+    """
+    Disk-backed, append-only cache of embeddings keyed by sha256(chunk text).
+
+    Each model gets its own directory holding:
+        - vectors.f32: row-major float32 matrix, memory-mapped for reads
+        - keys.bin: the sha256 digest of row i at offset 32 * i
+        - meta.json: model name and vector dimension
+
+    Lookups go through a compact in-memory index: the first 8 bytes of every
+    digest as a sorted uint64 array (plus a small dict for rows appended since
+    the last sort), with the full digest compared on the memory-mapped keys.
+    Appends write vectors before keys under an flock on keys.bin, so rows
+    past the shorter file are an unfinished or torn append: they are left out
+    of the index, and truncated only by whoever holds the lock.
+    """
+
+    def __init__(self, directory, model_name):
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.directory = os.path.join(directory, slug)
+        self.model_name = model_name
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.vectors_path = os.path.join(self.directory, "vectors.f32")
+        self.keys_path = os.path.join(self.directory, "keys.bin")
+        self.meta_path = os.path.join(self.directory, "meta.json")
+
+        self.dim = None
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path) as f:
+                self.dim = json.load(f)["dim"]
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._load_on_open()
+
+    @staticmethod
+    def key(text):
+        return hashlib.sha256(text.encode()).digest()
+
+    def __len__(self):
+        return self._rows
+
+    def _load_on_open(self):
+        """
+        Load the index, dropping torn appends if no other process is appending.
+
+        Truncating while another process holds the lock could cut off the
+        vectors it wrote before its keys, so then the tail is only ignored.
+        """
+        with open(self.keys_path, "ab") as keys_file:
+            try:
+                fcntl.flock(keys_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                self._load()
+                return
+            try:
+                self._load(truncate=True)
+            finally:
+                fcntl.flock(keys_file, fcntl.LOCK_UN)
+
+    def _file_rows(self):
+        if self.dim is None or not os.path.exists(self.vectors_path):
+            return 0
+        return min(
+            os.path.getsize(self.keys_path) // KEY_BYTES,
+            os.path.getsize(self.vectors_path) // (self.dim * 4),
+        )
+
+    def _load(self, truncate=False):
+        """
+        (Re)build the in-memory index from the files.
+
+        Rows past the shorter of the two files belong to an unfinished or torn
+        append; with `truncate` (only while holding the append lock) they are
+        cut off, otherwise they are just left out of the index.
+        """
+        rows = self._file_rows()
+        if truncate and self.dim is not None:
+            for path, row_bytes in (
+                (self.keys_path, KEY_BYTES),
+                (self.vectors_path, self.dim * 4),
+            ):
+                if os.path.exists(path) and os.path.getsize(path) > rows * row_bytes:
+                    os.truncate(path, rows * row_bytes)
+
+        self._rows = rows
+        self._tail = {}
+        if rows:
+            self._keys = np.memmap(
+                self.keys_path, dtype=np.uint8, mode="r", shape=(rows, KEY_BYTES)
+            )
+            self._vectors = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim)
+            )
+            prefixes = np.ascontiguousarray(self._keys[:, :8]).view("<u8").ravel()
+            self._order = np.argsort(prefixes, kind="stable")
+            self._sorted_prefixes = prefixes[self._order]
+        else:
+            self._keys = np.empty((0, KEY_BYTES), dtype=np.uint8)
+            self._vectors = np.empty((0, self.dim or 0), dtype=np.float32)
+            self._order = np.empty(0, dtype=np.int64)
+            self._sorted_prefixes = np.empty(0, dtype="<u8")
+
+    def _find(self, digest):
+        row = self._tail.get(digest)
+        if row is not None:
+            return row
+        prefix = np.frombuffer(digest[:8], dtype="<u8")[0]
+        i = int(np.searchsorted(self._sorted_prefixes, prefix))
+        while i < len(self._sorted_prefixes) and self._sorted_prefixes[i] == prefix:
+            row = int(self._order[i])
+            if self._keys[row].tobytes() == digest:
+                return row
+            i += 1
+        return None
+
+    def get_many(self, texts):
+        """Cached vectors for `texts`, with None where the text is not cached"""
+        with self._lock:
+            vectors = []
+            for text in texts:
+                row = self._find(self.key(text))
+                if row is None:
+                    self.misses += 1
+                    vectors.append(None)
+                else:
+                    self.hits += 1
+                    vectors.append(np.array(self._vectors[row]))
+            return vectors
+
+    def put_many(self, texts, vectors):
+        """Append vectors for texts that are not cached yet"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(vectors):
+            return
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                with open(self.meta_path, "w") as f:
+                    json.dump({"model": self.model_name, "dim": self.dim}, f)
+
+            with open(self.keys_path, "ab") as keys_file:
+                # Serialize appends across processes (API worker and CLI runs)
+                fcntl.flock(keys_file, fcntl.LOCK_EX)
+                try:
+                    # Appends of other processes, or the torn tail of a crashed
+                    # one, which must go before our rows are written after it
+                    if os.path.getsize(self.keys_path) != self._rows * KEY_BYTES or (
+                        os.path.exists(self.vectors_path)
+                        and os.path.getsize(self.vectors_path)
+                        != self._rows * self.dim * 4
+                    ):
+                        self._load(truncate=True)
+
+                    new_keys = {}
+                    for text, vector in zip(texts, vectors):
+                        digest = self.key(text)
+                        if digest not in new_keys and self._find(digest) is None:
+                            new_keys[digest] = vector
+                    if not new_keys:
+                        return
+
+                    with open(self.vectors_path, "ab") as vectors_file:
+                        vectors_file.write(np.stack(list(new_keys.values())).tobytes())
+                    keys_file.write(b"".join(new_keys))
+                    keys_file.flush()
+                    self._append_index(list(new_keys))
+                finally:
+                    fcntl.flock(keys_file, fcntl.LOCK_UN)
+
+    def _append_index(self, new_keys):
+        start = self._rows
+        self._rows += len(new_keys)
+        if len(self._tail) + len(new_keys) > max(MIN_TAIL_SIZE, start // 4):
+            # Called with the append lock held
+            self._load(truncate=True)
+            return
+
+        self._keys = np.memmap(
+            self.keys_path, dtype=np.uint8, mode="r", shape=(self._rows, KEY_BYTES)
+        )
+        self._vectors = np.memmap(
+            self.vectors_path,
+            dtype=np.float32,
+            mode="r",
+            shape=(self._rows, self.dim),
+        )
+        for row, digest in enumerate(new_keys, start=start):
+            self._tail[digest] = row
+
+    def embed(self, texts, embed_fn):
+        """
+        Embed `texts`, running `embed_fn` only on those missing from the cache.
+
+        Args:
+            texts (list): Texts to embed
+            embed_fn (callable): Maps a list of texts to a list of vectors
+
+        Returns:
+            list: One list of floats per text
+        """
+        vectors = self.get_many(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            computed = embed_fn([texts[i] for i in missing])
+            self.put_many([texts[i] for i in missing], computed)
+            for i, vector in zip(missing, computed):
+                vectors[i] = vector
+        return [np.asarray(vector, dtype=np.float32).tolist() for vector in vectors]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._rows,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
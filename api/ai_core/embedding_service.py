@@ -0,0 +1,149 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from typing import List
+from langchain_core.embeddings import Embeddings
+from api.ai_core.config import (
+    EMBEDDINGS_MODEL,
+    QUERY_BATCH_SIZE,
+    QUERY_BATCH_MAX_LATENCY_MS,
+)
+from api.ai_core.providers import get_embedding_model
+
+
+def embed_queries(texts):
+    """Embed a batch of query texts with the shared fastembed model"""
+    return [
+        vector.tolist()
+        for vector in get_embedding_model().query_embed(texts, batch_size=len(texts))
+    ]
+
+
+def embed_passages(texts):
+    """Embed document texts with the shared fastembed model"""
+    return [vector.tolist() for vector in get_embedding_model().passage_embed(texts)]
+
+
+class BatchingEmbedder:
+    """
+    Micro-batches concurrent embedding requests into single model calls.
+
+    Callers on any thread submit texts and block on a future; one background
+    thread takes the first pending text, keeps collecting until `max_batch_size`
+    texts are waiting or `max_latency` seconds have passed, embeds them in one
+    forward pass and resolves every future. A lone request therefore waits at
+    most `max_latency` longer than an unbatched call, while a burst of
+    concurrent requests shares the vectorized throughput of the backend
+    instead of queueing for it one forward pass at a time.
+    """
+
+    def __init__(
+        self,
+        embed_fn=embed_queries,
+        model_name: str = EMBEDDINGS_MODEL,
+        max_batch_size: int = 32,
+        max_latency: float = 0.005,
+    ):
+        self.embed_fn = embed_fn
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Queue `text` for embedding, returning a future of its vector"""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, future))
+        return future
+
+    def embed(self, text: str) -> List[float]:
+        """Embed one text, sharing a model call with concurrent requests"""
+        return self.submit(text).result()
+
+    def embed_many(self, texts) -> List[List[float]]:
+        """Embed several texts; they are batched together (and with other callers)"""
+        futures = [self.submit(text) for text in texts]
+        return [future.result() for future in futures]
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_latency
+        while len(batch) < self.max_batch_size:
+            # Texts already queued join the batch even once the deadline has
+            # passed, so max_latency=0 still batches requests that piled up
+            # during the previous model call
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            texts = [text for text, _ in batch]
+            try:
+                vectors = [list(vector) for vector in self.embed_fn(texts)]
+                if len(vectors) != len(batch):
+                    raise ValueError(
+                        f"Embedding model returned {len(vectors)} vectors "
+                        f"for {len(batch)} texts"
+                    )
+            except Exception as e:
+                # Every waiter gets an answer, or its caller would hang
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), vector in zip(batch, vectors):
+                future.set_result(vector)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch_size": self.items / self.batches if self.batches else 0.0,
+        }
+
+
+class BatchedEmbeddings(Embeddings):
+    """
+    LangChain embeddings whose queries go through a BatchingEmbedder.
+
+    Only queries are batched: the embedder runs the model's query encoding,
+    so documents are embedded as passages by `embed_documents_fn` instead,
+    which matters for models that encode the two differently.
+    """
+
+    def __init__(self, embedder: BatchingEmbedder, embed_documents_fn=embed_passages):
+        self.embedder = embedder
+        self.embed_documents_fn = embed_documents_fn
+
+    def embed_documents(self, texts):
+        return self.embed_documents_fn(list(texts))
+
+    def embed_query(self, text):
+        return self.embedder.embed(text)
+
+
+query_embedder = BatchingEmbedder(
+    max_batch_size=QUERY_BATCH_SIZE,
+    max_latency=QUERY_BATCH_MAX_LATENCY_MS / 1000,
+)
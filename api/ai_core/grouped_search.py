@@ -0,0 +1,77 @@
+from typing import List
+from qdrant_client import QdrantClient, models
+from api.ai_core.config import TEXT_FIELD_NAME
+
+# Chunks of the same post share the (principal, indexed) original_id payload
+GROUP_BY = "original_id"
+
+
+def chunk_payload(point: models.ScoredPoint) -> dict:
+    """Payload of a chunk without the document text, plus its score"""
+    payload = {
+        key: value for key, value in point.payload.items() if key != TEXT_FIELD_NAME
+    }
+    payload["score"] = point.score
+    return payload
+
+
+def group_entry(group: models.PointGroup) -> dict:
+    """One result per post: its best score and its chunks, best first"""
+    return {
+        "post_id": group.id,
+        "score": group.hits[0].score,
+        "chunks": [chunk_payload(hit) for hit in group.hits],
+    }
+
+
+def query_post_groups(
+    client: QdrantClient,
+    collection_name: str,
+    offset: int = 0,
+    limit: int = 10,
+    group_size: int = 1,
+    score_threshold: float = None,
+    max_groups: int = None,
+    **query,
+) -> dict:
+    """
+    One page of search results grouped by post.
+
+    Qdrant's grouped query has no offset, so the groups before `offset` are
+    fetched and dropped; one extra group tells whether there is a next page.
+    With `max_groups`, the last page is cut at the cap and has no next page,
+    so following `next_offset` never asks for groups past it.
+
+    Args:
+        client (QdrantClient): Qdrant client
+        collection_name (str): Collection (or alias) to search
+        offset (int): Posts to skip
+        limit (int): Posts to return
+        group_size (int): Best chunks returned per post
+        score_threshold (float): Minimum chunk score, if any
+        max_groups (int): Posts reachable by paging, if capped
+        **query: query_points arguments (query, using, prefetch, query_filter, ...)
+
+    Returns:
+        dict: {"result": [...], "offset": ..., "limit": ..., "next_offset": ...}
+    """
+    if max_groups is not None:
+        limit = max(0, min(limit, max_groups - offset))
+    end = offset + limit
+    groups = client.query_points_groups(
+        collection_name=collection_name,
+        group_by=GROUP_BY,
+        limit=end + 1,
+        group_size=group_size,
+        score_threshold=score_threshold,
+        with_payload=True,
+        **query,
+    ).groups
+    page: List[dict] = [group_entry(group) for group in groups[offset:end]]
+    has_next = len(groups) > end and (max_groups is None or end < max_groups)
+    return {
+        "result": page,
+        "offset": offset,
+        "limit": limit,
+        "next_offset": end if has_next else None,
+    }
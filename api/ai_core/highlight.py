@@ -0,0 +1,120 @@
+import re
+from collections import Counter
+from functools import lru_cache
+from api.ai_core.config import HIGHLIGHT_MAX_SNIPPETS, HIGHLIGHT_SNIPPET_CHARS
+
+ELLIPSIS = "…"
+
+
+@lru_cache(maxsize=1024)
+def query_pattern(query: str):
+    """
+    One case-insensitive alternation matching every word of a query, or None.
+
+    Words longer than four characters also match with their last character
+    changed or followed by one more (plurals, "-ed"), like the per-word
+    patterns this replaces. Longer alternatives come first so they win.
+    """
+    alternatives = set()
+    for word in query.lower().split():
+        if len(word) > 4:
+            alternatives.add(rf"{re.escape(word[:-1])}(?:{re.escape(word[-1])})?\w?")
+        else:
+            alternatives.add(re.escape(word))
+    if not alternatives:
+        return None
+    ordered = sorted(alternatives, key=lambda alt: (-len(alt), alt))
+    return re.compile(rf"\b(?:{'|'.join(ordered)})\b", flags=re.IGNORECASE)
+
+
+def _mark(text, spans, start, end):
+    parts = []
+    position = start
+    for match_start, match_end in spans:
+        if match_start < start or match_end > end:
+            continue
+        parts.append(text[position:match_start])
+        parts.append(f"<b>{text[match_start:match_end]}</b>")
+        position = match_end
+    parts.append(text[position:end])
+    return "".join(parts)
+
+
+def _bounds(anchor, size, length):
+    """Window of about `size` characters starting a little before `anchor`"""
+    start = max(0, anchor - size // 4)
+    end = min(length, start + size)
+    return max(0, end - size), end
+
+
+def _trim(text, start, end):
+    """Move window bounds inwards to whole words"""
+    if start > 0:
+        space = text.find(" ", start, end)
+        start = space + 1 if space != -1 else start
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        end = space if space != -1 else end
+    return start, end
+
+
+def best_windows(text, spans, size, max_windows):
+    """
+    Non-overlapping windows covering the densest clusters of matches.
+
+    Each candidate window starts near a match and is scored by the distinct
+    terms it contains, then by its number of matches. Window bounds only move
+    forward with their anchor, so the counts slide along with two pointers.
+    """
+    terms = [text[s:e].lower() for s, e in spans]
+    counts = Counter()
+    candidates = []
+    j = 0
+    for i, (anchor, _) in enumerate(spans):
+        start, end = _bounds(anchor, size, len(text))
+        while j < len(spans) and spans[j][1] <= end:
+            counts[terms[j]] += 1
+            j += 1
+        candidates.append(((len(counts), j - i, -start), start, end))
+        counts[terms[i]] -= 1
+        if not counts[terms[i]]:
+            del counts[terms[i]]
+
+    chosen = []
+    for _, start, end in sorted(candidates, reverse=True):
+        if all(end <= s or start >= e for s, e in chosen):
+            chosen.append((start, end))
+            if len(chosen) == max_windows:
+                break
+    return sorted(_trim(text, start, end) for start, end in chosen)
+
+
+def highlight(
+    text: str,
+    query: str,
+    snippet_chars: int = HIGHLIGHT_SNIPPET_CHARS,
+    max_snippets: int = HIGHLIGHT_MAX_SNIPPETS,
+) -> str:
+    """
+    Wrap the query words found in `text` in <b> tags in a single pass.
+
+    With `snippet_chars`, only up to `max_snippets` windows of about that many
+    characters around the best clusters of matches are returned, joined by an
+    ellipsis; 0 returns the whole text.
+    """
+    pattern = query_pattern(query)
+    spans = [match.span() for match in pattern.finditer(text)] if pattern else []
+
+    if not snippet_chars or len(text) <= snippet_chars:
+        return _mark(text, spans, 0, len(text))
+    if not spans:
+        _, end = _trim(text, 0, min(len(text), snippet_chars))
+        return text[:end] + ELLIPSIS
+
+    windows = best_windows(text, spans, snippet_chars, max_snippets)
+    snippet = f" {ELLIPSIS} ".join(
+        _mark(text, spans, start, end) for start, end in windows
+    )
+    prefix = ELLIPSIS if windows[0][0] > 0 else ""
+    suffix = ELLIPSIS if windows[-1][1] < len(text) else ""
+    return f"{prefix}{snippet}{suffix}"
@@ -0,0 +1,186 @@
+import time
+from typing import List
+from qdrant_client import QdrantClient, models
+from api.ai_core.config import (
+    COLLECTION_NAME,
+    COLLECTION_VERSION_REFRESH_SECONDS,
+    HYBRID_PREFETCH_LIMIT,
+    SEARCH_PROFILE,
+    SPARSE_VECTOR_NAME,
+    TEXT_FIELD_NAME,
+    VECTOR_NAME,
+)
+from api.ai_core.embedding_service import query_embedder
+from api.ai_core.grouped_search import query_post_groups
+from api.ai_core.providers import get_qdrant_client, get_sparse_model
+from api.ai_core.query_cache import query_vector_cache
+from api.ai_core.search_profiles import search_params
+
+# Server-side fusion of the dense and sparse rankings: reciprocal rank fusion
+# only looks at ranks, distribution-based score fusion normalizes the scores
+FUSIONS = {"rrf": models.Fusion.RRF, "dbsf": models.Fusion.DBSF}
+
+
+def embed_sparse_query(text: str) -> models.SparseVector:
+    """Sparse (lexical) vector of a search query"""
+    embedding = next(iter(get_sparse_model().query_embed(text)))
+    return models.SparseVector(
+        indices=embedding.indices.tolist(), values=embedding.values.tolist()
+    )
+
+
+def embed_sparse_documents(chunks, batch_size: int = 64) -> List[models.SparseVector]:
+    """Sparse (lexical) vectors of chunk texts, for indexing"""
+    return [
+        models.SparseVector(
+            indices=embedding.indices.tolist(), values=embedding.values.tolist()
+        )
+        for embedding in get_sparse_model().passage_embed(chunks, batch_size=batch_size)
+    ]
+
+
+def has_sparse_vectors(client, collection_name=COLLECTION_NAME):
+    """Whether a collection stores the sparse vector (collections built before
+    hybrid search do not, until they are rebuilt)"""
+    params = client.get_collection(collection_name).config.params
+    return SPARSE_VECTOR_NAME in (params.sparse_vectors or {})
+
+
+class HybridSearcher:
+    """
+    Dense + sparse search fused by Qdrant in a single query.
+
+    Both the dense (semantic) and the sparse (BM25) vector search contribute
+    `prefetch_limit` candidates, which Qdrant merges with RRF or DBSF before
+    returning the top results, so the keyword match and the semantic match
+    are ranked together in one round trip.
+
+    Collections built before hybrid search have no sparse vectors until they
+    are rebuilt; queries on them raise ValueError instead of failing in
+    Qdrant. Whether the collection has them is re-checked every
+    COLLECTION_VERSION_REFRESH_SECONDS, so a rebuild is picked up.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        client: QdrantClient = None,
+        embedder=None,
+        prefetch_limit: int = HYBRID_PREFETCH_LIMIT,
+    ):
+        self.collection_name = collection_name
+        self.qdrant_client = client or get_qdrant_client()
+        self.embedder = embedder or query_embedder
+        self.prefetch_limit = prefetch_limit
+        self._sparse = (None, float("-inf"))
+
+    def has_sparse_vectors(self) -> bool:
+        """Whether the collection can serve the sparse prefetch (cached)"""
+        sparse, checked_at = self._sparse
+        if time.monotonic() - checked_at > COLLECTION_VERSION_REFRESH_SECONDS:
+            sparse = has_sparse_vectors(self.qdrant_client, self.collection_name)
+            self._sparse = (sparse, time.monotonic())
+        return sparse
+
+    def _fused_query(
+        self,
+        text: str,
+        filter_: dict = None,
+        fusion: str = "rrf",
+        profile: str = SEARCH_PROFILE,
+    ) -> dict:
+        """
+        Prefetch and fusion arguments of a hybrid query.
+
+        Raises:
+            ValueError: If `fusion` is not one of FUSIONS, or the collection
+                has no sparse vectors
+        """
+        if fusion not in FUSIONS:
+            raise ValueError(
+                f"Unknown fusion {fusion!r}, expected one of {', '.join(FUSIONS)}"
+            )
+        if not self.has_sparse_vectors():
+            raise ValueError(
+                f"{self.collection_name} has no sparse vectors for hybrid search; "
+                "rebuild it with `init_blogposts_collection.py --rebuild`"
+            )
+        query_filter = models.Filter(**filter_) if filter_ else None
+        dense = query_vector_cache.get_or_embed(
+            self.embedder.model_name, text, self.embedder.embed
+        )
+        return {
+            "prefetch": [
+                models.Prefetch(
+                    query=dense,
+                    using=VECTOR_NAME,
+                    filter=query_filter,
+                    params=search_params(profile),
+                    limit=self.prefetch_limit,
+                ),
+                models.Prefetch(
+                    query=embed_sparse_query(text),
+                    using=SPARSE_VECTOR_NAME,
+                    filter=query_filter,
+                    limit=self.prefetch_limit,
+                ),
+            ],
+            "query": models.FusionQuery(fusion=FUSIONS[fusion]),
+        }
+
+    def query(
+        self,
+        text: str,
+        filter_: dict = None,
+        fusion: str = "rrf",
+        limit: int = 5,
+        profile: str = SEARCH_PROFILE,
+    ) -> List[models.ScoredPoint]:
+        """
+        Fused search results as scored points.
+
+        Raises:
+            ValueError: If `fusion` is not one of FUSIONS, or the collection
+                has no sparse vectors
+        """
+        return self.qdrant_client.query_points(
+            collection_name=self.collection_name,
+            limit=limit,
+            with_payload=True,
+            **self._fused_query(text, filter_, fusion, profile),
+        ).points
+
+    def search_groups(
+        self,
+        text: str,
+        filter_: dict = None,
+        fusion: str = "rrf",
+        profile: str = SEARCH_PROFILE,
+        **page,
+    ) -> dict:
+        """Fused search results grouped by post, see `query_post_groups`"""
+        start_time = time.time()
+        result = query_post_groups(
+            self.qdrant_client,
+            self.collection_name,
+            **page,
+            **self._fused_query(text, filter_, fusion, profile),
+        )
+        print(f"Grouped hybrid search took {time.time() - start_time} seconds")
+        return result
+
+    def search(
+        self,
+        text: str,
+        filter_: dict = None,
+        fusion: str = "rrf",
+        profile: str = SEARCH_PROFILE,
+    ) -> List[dict]:
+        start_time = time.time()
+        hits = self.query(text, filter_=filter_, fusion=fusion, profile=profile)
+        print(f"Hybrid search took {time.time() - start_time} seconds")
+        # Same shape as NeuralSearcher results
+        return [
+            {key: value for key, value in hit.payload.items() if key != TEXT_FIELD_NAME}
+            for hit in hits
+        ]
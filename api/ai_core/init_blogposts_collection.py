@@ -147,223 +147,965 @@
 
 
 import os.path
-import asyncio
-from tqdm.asyncio import tqdm as async_tqdm
-from qdrant_client import QdrantClient, models
+import time
+import queue
+import argparse
+import threading
+from datetime import datetime, timezone
+from functools import lru_cache
+from dataclasses import dataclass, field
+from qdrant_client import models
+from sqlalchemy.orm import load_only
 from tqdm import tqdm
-from langchain.text_splitter import RecursiveCharacterTextSplitter
+from api.ai_core.chunking import build_chunk_records, content_hash
+from api.ai_core.embedding_cache import EmbeddingCache
+from api.ai_core.retrieval_cache import RetrievalCache
+from api.ai_core.hybrid_search import embed_sparse_documents, has_sparse_vectors
+from api.ai_core.providers import (
+    alias_target,
+    get_embedding_model,
+    get_qdrant_client,
+    sparse_vector_params,
+    vector_params,
+)
+from api.ai_core.search_profiles import QUANTIZATION_TYPES, quantization_config
 from api.ai_core.config import (
-    QDRANT_URL,
-    QDRANT_API_KEY,
     COLLECTION_NAME,
     EMBEDDINGS_MODEL,
+    EMBEDDING_CACHE_DIR,
+    QUANTIZATION,
+    REDIS_URL,
+    SPARSE_VECTOR_NAME,
+    VECTOR_NAME,
 )
 from api.db.database import SessionLocal
 from api.v1.models.blog import BlogPost
 
+# Post fields that end up in chunk payloads
+POST_COLUMNS = (
+    BlogPost.id,
+    BlogPost.title,
+    BlogPost.content,
+    BlogPost.category,
+    BlogPost.author,
+)
+
+# Points per page when scrolling the collection
+SCROLL_BATCH_SIZE = 1000
+# Posts embedded per upsert during reindexing
+REINDEX_BATCH_SIZE = 64
+# Posts fetched per database round trip while streaming the corpus
+POST_FETCH_SIZE = 200
+# Chunks embedded and upserted together by the indexing pipeline
+EMBED_BATCH_SIZE = 64
+# Chunk batches buffered between the chunking and embedding stages
+PREFETCH_BATCHES = 4
+# Versioned collections are named f"{COLLECTION_NAME}{VERSION_SEPARATOR}<timestamp>"
+VERSION_SEPARATOR = "-v"
+# Collection versions kept after a rebuild, so there is something to roll back to
+KEEP_VERSIONS = 2
+# Posts queried with their own first chunk to validate a rebuilt collection
+VALIDATION_SAMPLE_SIZE = 20
+VALIDATION_TOP_K = 5
+# Share of sample queries that must find their own post before the alias swap
+MIN_SAMPLE_RECALL = 0.9
+
+# Payload indexes of the filterable fields. Every chat retrieval is scoped to
+# one post, so original_id is the principal (tenant-like) filter of the collection
+PAYLOAD_INDEXES = {
+    "original_id": models.IntegerIndexParams(
+        type=models.IntegerIndexType.INTEGER,
+        lookup=True,
+        range=False,
+        is_principal=True,
+    ),
+    "category": models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD),
+    "author": models.KeywordIndexParams(type=models.KeywordIndexType.KEYWORD),
+}
+
+
+@lru_cache(maxsize=1)
+def get_embedding_cache():
+    """Persistent chunk embedding cache, or None when EMBEDDING_CACHE_DIR is empty"""
+    if not EMBEDDING_CACHE_DIR:
+        return None
+    return EmbeddingCache(EMBEDDING_CACHE_DIR, EMBEDDINGS_MODEL)
+
+
+@lru_cache(maxsize=1)
+def get_retrieval_cache():
+    """Chat retrieval cache of the API, or None when REDIS_URL is empty"""
+    if not REDIS_URL:
+        return None
+    # Only needed to invalidate the API's caches, so the CLI runs without redis
+    import redis
+
+    return RetrievalCache(redis.Redis.from_url(REDIS_URL, decode_responses=True))
+
+
+def invalidate_retrieval_cache(post_ids, retrieval_cache=None):
+    """Drop the cached chat retrievals (and answers) of reindexed posts"""
+    retrieval_cache = retrieval_cache or get_retrieval_cache()
+    if retrieval_cache is None or not post_ids:
+        return
+    try:
+        for post_id in post_ids:
+            retrieval_cache.invalidate(post_id)
+    except Exception as e:
+        # The posts are indexed; cached results only linger until their TTL
+        print(f"Retrieval cache invalidation failed: {e}")
+
+
+def embed_query(text):
+    """Embed a search query, returning a list of floats"""
+    return next(iter(get_embedding_model().query_embed([text]))).tolist()
+
+
+def run_embedding_model(chunks):
+    vectors = get_embedding_model().passage_embed(chunks, batch_size=EMBED_BATCH_SIZE)
+    return [vector.tolist() for vector in vectors]
+
+
+def embed_documents(chunks):
+    """
+    Embed chunk texts as passages, returning one list of floats per chunk.
+
+    Chunks already in the embedding cache are not sent through the model, so
+    re-embedding unchanged text (reindex, collection rebuild) is nearly free.
+    """
+    cache = get_embedding_cache()
+    if cache is None:
+        return run_embedding_model(chunks)
+    return cache.embed(chunks, run_embedding_model)
+
+
+def create_collection(
+    client, collection_name=COLLECTION_NAME, quantization=QUANTIZATION
+):
+    """Create the blog post collection with its quantization and payload indexes"""
+    client.create_collection(
+        collection_name=collection_name,
+        vectors_config=vector_params(on_disk=True),
+        sparse_vectors_config=sparse_vector_params(),
+        quantization_config=quantization_config(quantization),
+    )
 
-def get_client():
-    client = QdrantClient(
-        url=QDRANT_URL,
-        api_key=QDRANT_API_KEY,
+    # Create payload index for LangChain compatibility
+    client.create_payload_index(
+        collection_name=collection_name,
+        field_name="page_content",
+        field_schema=models.TextIndexParams(
+            type=models.TextIndexType.TEXT,
+            tokenizer=models.TokenizerType.WORD,
+            min_token_len=2,
+            max_token_len=20,
+            lowercase=True,
+        ),
     )
-    client.set_model(EMBEDDINGS_MODEL)
-    return client
+    create_payload_indexes(client, collection_name)
 
 
-def get_all_posts():
-    """Fetch all blog posts"""
+def create_payload_indexes(client, collection_name=COLLECTION_NAME):
+    """Create the PAYLOAD_INDEXES missing from a collection, returning their names"""
+    existing = client.get_collection(collection_name).payload_schema
+    created = []
+    for field_name, field_schema in PAYLOAD_INDEXES.items():
+        if field_name in existing:
+            continue
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=field_schema,
+            wait=True,
+        )
+        created.append(field_name)
+    return created
+
+
+def upsert_chunks(
+    client,
+    chunks,
+    metadata,
+    ids,
+    vectors,
+    collection_name=COLLECTION_NAME,
+    sparse_vectors=None,
+):
+    """Upsert embedded chunks with the payload layout `client.add` produces"""
+    points = []
+    for i, (chunk, meta, point_id, vector) in enumerate(
+        zip(chunks, metadata, ids, vectors)
+    ):
+        named_vectors = {VECTOR_NAME: vector}
+        if sparse_vectors is not None:
+            named_vectors[SPARSE_VECTOR_NAME] = sparse_vectors[i]
+        points.append(
+            models.PointStruct(
+                id=point_id, vector=named_vectors, payload={"document": chunk, **meta}
+            )
+        )
+    client.upsert(collection_name=collection_name, points=points, wait=True)
+
+
+@dataclass
+class StageStats:
+    """Items processed and time spent by one stage of the indexing pipeline"""
+
+    name: str
+    items: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rate(self):
+        return self.items / self.seconds if self.seconds else 0.0
+
+    def __str__(self):
+        return (
+            f"{self.name:>7}: {self.items} items in {self.seconds:.2f}s "
+            f"({self.rate:.1f}/s)"
+        )
+
+
+def iter_posts(stats, fetch_size=POST_FETCH_SIZE):
+    """Stream the POST_COLUMNS of every post, `fetch_size` rows per round trip"""
+    db = SessionLocal()
     try:
-        db = SessionLocal()
-        posts = db.query(BlogPost).order_by(BlogPost.date.desc()).all()
+        rows = iter(db.query(*POST_COLUMNS).order_by(BlogPost.id).yield_per(fetch_size))
+        while True:
+            start = time.perf_counter()
+            row = next(rows, None)
+            stats.seconds += time.perf_counter() - start
+            if row is None:
+                return
+            stats.items += 1
+            yield row
+    finally:
         db.close()
-    except Exception:
-        print("Empty Database")
-        posts = None
 
-    return posts
+
+def iter_chunk_batches(posts, stats, batch_size=EMBED_BATCH_SIZE):
+    """Lazily chunk posts, yielding (chunks, metadata, ids) of `batch_size` chunks"""
+    batch = ([], [], [])
+    for post in posts:
+        start = time.perf_counter()
+        records = build_chunk_records(
+            post.id, post.title, post.content, post.category, post.author
+        )
+        stats.seconds += time.perf_counter() - start
+        stats.items += len(records[0])
+
+        for part, values in zip(batch, records):
+            part.extend(values)
+        while len(batch[0]) >= batch_size:
+            yield tuple(part[:batch_size] for part in batch)
+            batch = tuple(part[batch_size:] for part in batch)
+    if batch[0]:
+        yield batch
 
 
-def process_embeddings(config: dict):
+def index_corpus(
+    client=None,
+    batch_size=EMBED_BATCH_SIZE,
+    prefetch=PREFETCH_BATCHES,
+    fetch_size=POST_FETCH_SIZE,
+    collection_name=COLLECTION_NAME,
+):
     """
-    Uploads or updates embeddings in Qdrant using provided config.
+    Embed every post into the collection with memory bounded by the batch sizes.
+
+    A producer thread streams posts from the database and chunks them into
+    fixed-size batches; at most `prefetch` batches wait in a queue for the
+    consumer, which embeds and upserts them. Peak memory therefore depends on
+    `batch_size * prefetch` and `fetch_size`, not on the size of the corpus.
 
     Args:
-        config (dict): Must contain:
-            - qdrant_url
-            - qdrant_api_key
-            - collection_name
-            - embeddings_model
-            - get_content_fn (function returning list of objects with .id, .title, .content)
+        client (QdrantClient, optional): Client to reuse
+        batch_size (int): Chunks per embedding/upsert batch
+        prefetch (int): Chunk batches buffered ahead of the embedding stage
+        fetch_size (int): Posts fetched per database round trip
+        collection_name (str): Collection (or alias) to write to
+
+    Returns:
+        dict: StageStats for the read, chunk, embed and upsert stages
     """
+    client = client or get_qdrant_client()
+    stats = {name: StageStats(name) for name in ("read", "chunk", "embed", "upsert")}
+    batches = queue.Queue(maxsize=prefetch)
+    stop = threading.Event()
+    done = object()
 
-    client = get_client()
-    # Check if collection exists
-    collections = client.get_collections()
-    collection_exists = any(
-        collection.name == COLLECTION_NAME for collection in collections.collections
-    )
+    def put(item):
+        """Queue an item, returning False once the consumer has stopped"""
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
 
-    # Get content (e.g., blog posts)
-    contents = config["content"]
+    def produce():
+        try:
+            posts = iter_posts(stats["read"], fetch_size)
+            for batch in iter_chunk_batches(posts, stats["chunk"], batch_size):
+                if not put(batch):
+                    # Stop reading the corpus as soon as the consumer failed
+                    return
+        except Exception as e:
+            put(e)
+            return
+        put(done)
 
-    # Initialize text splitter
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=100,
-        separators=["\n\n", "\n", " ", ""],
-    )
+    sparse = has_sparse_vectors(client, collection_name)
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        with tqdm(unit="chunks") as progress:
+            while (batch := batches.get()) is not done:
+                if isinstance(batch, Exception):
+                    raise batch
+                chunks, metadata, ids = batch
 
-    # Prepare data for upload
+                start = time.perf_counter()
+                vectors = embed_documents(chunks)
+                sparse_vectors = embed_sparse_documents(chunks) if sparse else None
+                stats["embed"].seconds += time.perf_counter() - start
+                stats["embed"].items += len(chunks)
+
+                start = time.perf_counter()
+                upsert_chunks(
+                    client,
+                    chunks,
+                    metadata,
+                    ids,
+                    vectors,
+                    collection_name,
+                    sparse_vectors,
+                )
+                stats["upsert"].seconds += time.perf_counter() - start
+                stats["upsert"].items += len(chunks)
+                progress.update(len(chunks))
+    finally:
+        stop.set()
+        producer.join()
+    return stats
+
+
+def upload_embeddings():
+    """Build the collection from scratch, or reindex it incrementally if it exists"""
+    client = get_qdrant_client()
+    if client.collection_exists(COLLECTION_NAME):
+        print(reindex_posts(client=client).summary())
+        return
+
+    print(rebuild_collection(client).summary())
+    if get_embedding_cache() is not None:
+        print(f"Embedding cache: {get_embedding_cache().stats()}")
+
+
+def upload_batch_embeddings(posts, client=None, collection_name=COLLECTION_NAME):
+    """
+    Chunks and embeds a batch of posts with one client and a single upsert.
+
+    Chunks left over from a previous version of a post (different content
+    hash) are deleted first, so the upsert replaces the post's chunks.
+
+    Args:
+        posts (list): dicts with "id", "title", "content" and optionally
+            "category" and "author"
+        client (QdrantClient, optional): Client to reuse
+        collection_name (str): Collection (or alias) to write to
+
+    Returns:
+        int: Number of chunks uploaded
+    """
     all_chunks = []
     all_metadata = []
     all_ids = []
-    chunk_id = 0
-
-    for item in contents:
-        chunks = text_splitter.split_text(item.content)
-        for i, chunk in enumerate(chunks):
-            chunk_id += 1
-            all_chunks.append(chunk)
-            all_metadata.append(
-                {
-                    "original_id": item.id,
-                    "title": item.title,
-                    "chunk_index": i,
-                    "chunk_count": len(chunks),
-                    "page_content": chunk,
-                }
-            )
-            all_ids.append(chunk_id)
-
-    if not collection_exists:
-        # Create collection
-        client.create_collection(
-            collection_name=COLLECTION_NAME,
-            vectors_config=client.get_fastembed_vector_params(on_disk=True),
-            quantization_config=models.ScalarQuantization(
-                scalar=models.ScalarQuantizationConfig(
-                    type=models.ScalarType.INT8,
-                    quantile=0.99,
-                    always_ram=True,
-                )
-            ),
+    for post in posts:
+        chunks, metadata, ids = build_chunk_records(
+            post["id"],
+            post["title"],
+            post["content"],
+            post.get("category"),
+            post.get("author"),
         )
+        all_chunks.extend(chunks)
+        all_metadata.extend(metadata)
+        all_ids.extend(ids)
+
+    client = client or get_qdrant_client()
+    if client.collection_exists(collection_name):
+        delete_stale_chunks(client, posts, collection_name)
+    elif collection_name == COLLECTION_NAME:
+        create_versioned_collection(client)
+    else:
+        create_collection(client, collection_name)
+
+    if not all_chunks:
+        return 0
+
+    vectors = embed_documents(all_chunks)
+    sparse_vectors = (
+        embed_sparse_documents(all_chunks)
+        if has_sparse_vectors(client, collection_name)
+        else None
+    )
+    upsert_chunks(
+        client,
+        all_chunks,
+        all_metadata,
+        all_ids,
+        vectors,
+        collection_name,
+        sparse_vectors,
+    )
+    print(f"Added {len(all_chunks)} chunked records for {len(posts)} posts")
+    return len(all_chunks)
 
-        # Create payload index for LangChain compatibility
-        client.create_payload_index(
-            collection_name=COLLECTION_NAME,
-            field_name="page_content",
-            field_schema=models.TextIndexParams(
-                type=models.TextIndexType.TEXT,
-                tokenizer=models.TokenizerType.WORD,
-                min_token_len=2,
-                max_token_len=20,
-                lowercase=True,
-            ),
-        )
 
-        client.add(
-            collection_name=COLLECTION_NAME,
-            documents=all_chunks,
-            metadata=all_metadata,
-            ids=tqdm(all_ids),
-            parallel=6,
+def delete_stale_chunks(client, posts, collection_name=COLLECTION_NAME):
+    """Delete chunks of `posts` whose payload content hash differs from the current one"""
+    stale = [
+        models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="original_id", match=models.MatchValue(value=post["id"])
+                )
+            ],
+            must_not=[
+                models.FieldCondition(
+                    key="content_hash",
+                    match=models.MatchValue(value=content_hash(post["content"])),
+                )
+            ],
         )
-        print(f"Created collection {COLLECTION_NAME} with {len(all_chunks)} records")
-    else:
-        try:
-            existing_ids = set(
-                p.id
-                for p in client.scroll(
-                    collection_name=COLLECTION_NAME,
-                    limit=100000,
-                )[0]
+        for post in posts
+    ]
+    client.delete(
+        collection_name=collection_name,
+        points_selector=models.FilterSelector(filter=models.Filter(should=stale)),
+    )
+
+
+def delete_post_chunks(client, post_ids, collection_name=COLLECTION_NAME):
+    """Delete every chunk of the given posts"""
+    client.delete(
+        collection_name=collection_name,
+        points_selector=models.FilterSelector(
+            filter=models.Filter(
+                must=[
+                    models.FieldCondition(
+                        key="original_id", match=models.MatchAny(any=list(post_ids))
+                    )
+                ]
             )
-        except Exception as e:
-            print(f"Error retrieving existing records: {e}")
-            existing_ids = set()
+        ),
+    )
+
+
+@dataclass
+class ReindexReport:
+    """Diff between the posts in the database and what is indexed in Qdrant"""
+
+    new: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    orphaned: list = field(default_factory=list)
+    unchanged: int = 0
+    dry_run: bool = False
 
-        new_indices = [
-            i for i, id_val in enumerate(all_ids) if id_val not in existing_ids
+    def summary(self):
+        prefix = "[dry run] " if self.dry_run else ""
+        lines = [
+            f"{prefix}{len(self.new)} new, {len(self.changed)} changed, "
+            f"{len(self.orphaned)} orphaned, {self.unchanged} unchanged posts"
         ]
+        for label, post_ids in (
+            ("new", self.new),
+            ("changed", self.changed),
+            ("orphaned", self.orphaned),
+        ):
+            if post_ids:
+                lines.append(f"  {label}: {', '.join(map(str, post_ids))}")
+        return "\n".join(lines)
 
-        if new_indices:
-            new_chunks = [all_chunks[i] for i in new_indices]
-            new_metadata = [all_metadata[i] for i in new_indices]
-            new_ids = [all_ids[i] for i in new_indices]
-
-            client.add(
-                collection_name=COLLECTION_NAME,
-                documents=new_chunks,
-                metadata=new_metadata,
-                ids=tqdm(new_ids),
-                parallel=6,
+
+def stored_post_hashes():
+    """Map post id -> content hash from the database, backfilling missing hashes"""
+    db = SessionLocal()
+    try:
+        hashes = dict(db.query(BlogPost.id, BlogPost.content_hash).all())
+        missing = [post_id for post_id, value in hashes.items() if value is None]
+        for start in range(0, len(missing), REINDEX_BATCH_SIZE):
+            posts = (
+                db.query(BlogPost)
+                .options(load_only(BlogPost.id, BlogPost.content))
+                .filter(BlogPost.id.in_(missing[start : start + REINDEX_BATCH_SIZE]))
+                .all()
             )
-            print(f"Added {len(new_indices)} new chunked records to {COLLECTION_NAME}")
+            for post in posts:
+                post.content_hash = content_hash(post.content)
+                hashes[post.id] = post.content_hash
+            db.commit()
+    finally:
+        db.close()
+    return hashes
+
+
+def indexed_post_hashes(client, collection_name=COLLECTION_NAME):
+    """Map post id -> content hash currently indexed (None for unhashed legacy points)"""
+    hashes = {}
+    offset = None
+    # The first chunk of every post carries the post-level payload
+    first_chunks = models.Filter(
+        must=[
+            models.FieldCondition(key="chunk_index", match=models.MatchValue(value=0))
+        ]
+    )
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=first_chunks,
+            limit=SCROLL_BATCH_SIZE,
+            offset=offset,
+            with_payload=["original_id", "content_hash"],
+            with_vectors=False,
+        )
+        for point in points:
+            hashes[point.payload["original_id"]] = point.payload.get("content_hash")
+        if offset is None:
+            return hashes
+
+
+def chunkless_posts(post_ids):
+    """
+    IDs among `post_ids` whose content splits into no chunks.
+
+    Such posts (empty or whitespace-only content) never get a point, so they
+    count as indexed rather than as new on every reindex.
+    """
+    chunkless = set()
+    db = SessionLocal()
+    try:
+        for start in range(0, len(post_ids), REINDEX_BATCH_SIZE):
+            rows = (
+                db.query(BlogPost.id, BlogPost.content)
+                .filter(BlogPost.id.in_(post_ids[start : start + REINDEX_BATCH_SIZE]))
+                .all()
+            )
+            # The splitter strips whitespace and drops empty chunks
+            chunkless.update(
+                post_id for post_id, content in rows if not content.strip()
+            )
+    finally:
+        db.close()
+    return chunkless
+
+
+def load_posts(post_ids):
+    """Fetch the POST_COLUMNS of the given posts as dicts"""
+    db = SessionLocal()
+    try:
+        rows = db.query(*POST_COLUMNS).filter(BlogPost.id.in_(post_ids)).all()
+    finally:
+        db.close()
+    return [row._asdict() for row in rows]
+
+
+def reindex_posts(
+    client=None, dry_run=False, collection_name=COLLECTION_NAME, retrieval_cache=None
+):
+    """
+    Bring the collection in line with the database using per-post content hashes.
+
+    Unchanged posts are skipped, new and edited posts are (re)embedded with
+    their stale chunks deleted, and chunks of posts no longer in the
+    database are removed. Embedding cost is proportional to changed posts.
+    Posts without chunks (empty content) have no points and count as
+    unchanged. The chat retrieval cache of every touched post is invalidated.
+
+    Only `content` is hashed: edits of `category` or `author` alone are not
+    detected here; `migrate_payload_indexes` (--migrate-indexes) copies them
+    onto the payloads of every post.
+
+    Args:
+        client (QdrantClient, optional): Client to reuse
+        dry_run (bool): Only compute the diff, without touching the collection
+        collection_name (str): Collection (or alias) to reconcile
+        retrieval_cache (RetrievalCache, optional): Cache to invalidate
+            (default: the one at REDIS_URL, if set)
+
+    Returns:
+        ReindexReport: What was (or would be) changed
+    """
+    client = client or get_qdrant_client()
+    stored = stored_post_hashes()
+    indexed = indexed_post_hashes(client, collection_name)
+
+    report = ReindexReport(dry_run=dry_run)
+    chunkless = chunkless_posts(
+        [post_id for post_id in stored if post_id not in indexed]
+    )
+    for post_id, post_hash in sorted(stored.items()):
+        if post_id in chunkless:
+            report.unchanged += 1
+        elif post_id not in indexed:
+            report.new.append(post_id)
+        elif indexed[post_id] != post_hash:
+            report.changed.append(post_id)
         else:
-            print("No new records to add.")
+            report.unchanged += 1
+    report.orphaned = sorted(set(indexed) - set(stored))
 
+    if dry_run:
+        return report
+
+    if report.orphaned:
+        delete_post_chunks(client, report.orphaned, collection_name)
+
+    to_index = report.new + report.changed
+    for start in tqdm(range(0, len(to_index), REINDEX_BATCH_SIZE)):
+        posts = load_posts(to_index[start : start + REINDEX_BATCH_SIZE])
+        upload_batch_embeddings(posts, client=client, collection_name=collection_name)
+    invalidate_retrieval_cache(report.orphaned + to_index, retrieval_cache)
+    return report
 
-# Wrapper for existing use case
-def upload_embeddings():
-    blogposts = get_all_posts()
-    if blogposts:
-        config = {
-            "content": blogposts,
-        }
-        process_embeddings(config)
-    else:
-        print("No records to add.")
+
+def migrate_payload_indexes(client=None, collection_name=COLLECTION_NAME):
+    """
+    Bring an existing collection up to the current payload layout.
+
+    Creates the missing PAYLOAD_INDEXES and copies `category` and `author` from
+    the database onto the chunks of every post, one batched request per
+    REINDEX_BATCH_SIZE posts. Vectors are left untouched, so nothing is
+    re-embedded.
+
+    Returns:
+        tuple: (names of the indexes created, number of posts updated)
+    """
+    client = client or get_qdrant_client()
+    created = create_payload_indexes(client, collection_name)
+
+    db = SessionLocal()
+    try:
+        rows = (
+            db.query(BlogPost.id, BlogPost.category, BlogPost.author)
+            .order_by(BlogPost.id)
+            .all()
+        )
+    finally:
+        db.close()
+
+    for start in tqdm(range(0, len(rows), REINDEX_BATCH_SIZE)):
+        client.batch_update_points(
+            collection_name=collection_name,
+            update_operations=[
+                models.SetPayloadOperation(
+                    set_payload=models.SetPayload(
+                        payload={"category": row.category, "author": row.author},
+                        filter=models.Filter(
+                            must=[
+                                models.FieldCondition(
+                                    key="original_id",
+                                    match=models.MatchValue(value=row.id),
+                                )
+                            ]
+                        ),
+                    )
+                )
+                for row in rows[start : start + REINDEX_BATCH_SIZE]
+            ],
+            wait=True,
+        )
+    return created, len(rows)
 
 
-async def upload_single_embeddings(new_data):
-    # Run blocking get_client in a separate thread
-    client = await asyncio.to_thread(get_client)
+def new_version_name():
+    """Name of a fresh versioned collection; names sort by creation time"""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S%f")
+    return f"{COLLECTION_NAME}{VERSION_SEPARATOR}{stamp}"
 
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=100,
-        separators=["\n\n", "\n", " ", ""],
+
+def collection_versions(client):
+    """Names of the versioned collections behind the alias, oldest first"""
+    prefix = f"{COLLECTION_NAME}{VERSION_SEPARATOR}"
+    return sorted(
+        collection.name
+        for collection in client.get_collections().collections
+        if collection.name.startswith(prefix)
     )
 
-    chunks = text_splitter.split_text(new_data["content"])
 
-    # Scroll (blocking) in thread
-    scroll_result = await asyncio.to_thread(
-        client.scroll,
-        collection_name=COLLECTION_NAME,
-        limit=100000,
+def swap_alias(client, collection_name):
+    """
+    Atomically point the COLLECTION_NAME alias, which every searcher queries, at
+    `collection_name`.
+
+    A plain collection still named COLLECTION_NAME (from before collections were
+    versioned) has to be dropped first, since an alias cannot shadow it; that
+    one-off migration is the only step that is not atomic.
+    """
+    operations = []
+    if alias_target(client) is not None:
+        operations.append(
+            models.DeleteAliasOperation(
+                delete_alias=models.DeleteAlias(alias_name=COLLECTION_NAME)
+            )
+        )
+    elif client.collection_exists(COLLECTION_NAME):
+        print(f"Replacing unversioned collection {COLLECTION_NAME} with an alias")
+        client.delete_collection(COLLECTION_NAME)
+    operations.append(
+        models.CreateAliasOperation(
+            create_alias=models.CreateAlias(
+                collection_name=collection_name, alias_name=COLLECTION_NAME
+            )
+        )
     )
-    existing_ids = set(p.id for p in scroll_result[0])
-    last_existing_id = max(existing_ids) if existing_ids else 0
-
-    new_ids = [i + 1 for i in range(last_existing_id, last_existing_id + len(chunks))]
-
-    new_metadata = []
-    for i, chunk in zip(new_ids, chunks):
-        new_metadata.append(
-            {
-                "original_id": new_data["id"],
-                "title": new_data["title"],
-                "chunk_index": i,
-                "chunk_count": len(chunks),
-                "page_content": chunk,
-            }
+    client.update_collection_aliases(change_aliases_operations=operations)
+
+
+def create_versioned_collection(client):
+    """Create an empty versioned collection and point the alias at it"""
+    collection_name = new_version_name()
+    create_collection(client, collection_name)
+    swap_alias(client, collection_name)
+    return collection_name
+
+
+def sample_recall(
+    client, collection_name, sample_size=VALIDATION_SAMPLE_SIZE, top_k=VALIDATION_TOP_K
+):
+    """
+    Query a collection with the first chunk of sample posts.
+
+    Returns:
+        tuple: (number of sample queries, share that found their own post in the top k)
+    """
+    points, _ = client.scroll(
+        collection_name=collection_name,
+        scroll_filter=models.Filter(
+            must=[
+                models.FieldCondition(
+                    key="chunk_index", match=models.MatchValue(value=0)
+                )
+            ]
+        ),
+        limit=sample_size,
+        with_payload=["original_id", "page_content"],
+        with_vectors=False,
+    )
+    found = 0
+    for point in points:
+        hits = client.query_points(
+            collection_name=collection_name,
+            query=embed_query(point.payload["page_content"]),
+            using=VECTOR_NAME,
+            limit=top_k,
+            with_payload=["original_id"],
+        ).points
+        if any(
+            hit.payload["original_id"] == point.payload["original_id"] for hit in hits
+        ):
+            found += 1
+    return len(points), found / len(points) if points else 0.0
+
+
+def validate_collection(client, collection_name, expected_points, min_recall):
+    """
+    Check a rebuilt collection before it goes live.
+
+    Raises:
+        RuntimeError: If points are missing, posts are out of date, or sample
+            queries do not find their own posts often enough
+
+    Returns:
+        tuple: (point count, sample query count, sample recall)
+    """
+    points = client.count(collection_name=collection_name, exact=True).count
+    if points != expected_points:
+        raise RuntimeError(
+            f"{collection_name} holds {points} points, expected {expected_points}"
+        )
+
+    diff = reindex_posts(client, dry_run=True, collection_name=collection_name)
+    if diff.new or diff.changed or diff.orphaned:
+        raise RuntimeError(
+            f"{collection_name} is out of sync with the database:\n{diff.summary()}"
+        )
+
+    queries, recall = sample_recall(client, collection_name)
+    if (queries or expected_points) and recall < min_recall:
+        raise RuntimeError(
+            f"Sample queries on {collection_name} found their post in "
+            f"{recall:.0%} of {queries} cases, expected at least {min_recall:.0%}"
         )
+    return points, queries, recall
+
+
+def prune_versions(client, keep=KEEP_VERSIONS):
+    """Delete all but the newest `keep` versions, never the live one"""
+    live = alias_target(client)
+    versions = collection_versions(client)
+    pruned = [name for name in versions[: max(len(versions) - keep, 0)] if name != live]
+    for name in pruned:
+        client.delete_collection(name)
+    return pruned
+
 
-    # Add (blocking) in thread
-    await asyncio.to_thread(
-        client.add,
-        collection_name=COLLECTION_NAME,
-        documents=chunks,
-        metadata=new_metadata,
-        ids=async_tqdm(new_ids),
-        parallel=6,
+@dataclass
+class RebuildReport:
+    """Outcome of a blue/green collection rebuild"""
+
+    collection: str
+    previous: str = None
+    points: int = 0
+    queries: int = 0
+    recall: float = 0.0
+    stats: dict = field(default_factory=dict)
+    pruned: list = field(default_factory=list)
+
+    def summary(self):
+        lines = [
+            f"{COLLECTION_NAME} -> {self.collection} "
+            f"(previously {self.previous or 'unaliased'})",
+            f"  {self.points} points, sample recall {self.recall:.0%} "
+            f"over {self.queries} queries",
+        ]
+        lines += [f"  {stage}" for stage in self.stats.values()]
+        if self.pruned:
+            lines.append(f"  pruned: {', '.join(self.pruned)}")
+        return "\n".join(lines)
+
+
+def rebuild_collection(
+    client=None,
+    keep=KEEP_VERSIONS,
+    min_recall=MIN_SAMPLE_RECALL,
+    quantization=QUANTIZATION,
+):
+    """
+    Rebuild the collection next to the live one and swap it in without downtime.
+
+    The corpus is indexed into a new versioned collection while searchers keep
+    using the COLLECTION_NAME alias. Posts written in the meantime are caught up
+    with a content-hash reindex, and the new collection is validated (point
+    count, every post indexed at its current hash, sample query recall) before
+    the alias is swapped in one atomic operation. A failed rebuild is deleted and
+    leaves the live collection untouched; the previous version is kept for
+    `rollback_collection`.
+
+    Args:
+        client (QdrantClient, optional): Client to reuse
+        keep (int): Collection versions to keep, including the new one
+        min_recall (float): Minimum share of sample queries that find their post
+        quantization (str): Quantization of the new collection, see QUANTIZATION
+
+    Returns:
+        RebuildReport: The new collection and its validation results
+    """
+    client = client or get_qdrant_client()
+    collection_name = new_version_name()
+    create_collection(client, collection_name, quantization)
+    try:
+        stats = index_corpus(client, collection_name=collection_name)
+        # Catch up on posts created or edited while the corpus was streamed
+        caught_up = reindex_posts(client, collection_name=collection_name)
+        expected = (
+            client.count(collection_name=collection_name, exact=True).count
+            if caught_up.new or caught_up.changed or caught_up.orphaned
+            else stats["upsert"].items
+        )
+        points, queries, recall = validate_collection(
+            client, collection_name, expected, min_recall
+        )
+    except BaseException:
+        client.delete_collection(collection_name)
+        raise
+
+    previous = alias_target(client)
+    swap_alias(client, collection_name)
+    # Writes that reached the previous collection just before the swap
+    reindex_posts(client)
+    return RebuildReport(
+        collection=collection_name,
+        previous=previous,
+        points=points,
+        queries=queries,
+        recall=recall,
+        stats=stats,
+        pruned=prune_versions(client, max(keep, 1)),
     )
 
-    print(f"Added {len(new_ids)} new chunked records to {COLLECTION_NAME}")
+
+def rollback_collection(client=None):
+    """
+    Point the alias back at the version preceding the live one.
+
+    Posts written since that version was live are not in it; run a reindex
+    afterwards if the embedding model is unchanged.
+
+    Returns:
+        tuple: (collection rolled back from, collection now live)
+    """
+    client = client or get_qdrant_client()
+    live = alias_target(client)
+    if live is None:
+        raise RuntimeError(f"{COLLECTION_NAME} is not an alias of a collection version")
+    older = [name for name in collection_versions(client) if name < live]
+    if not older:
+        raise RuntimeError(f"No collection version older than {live} to roll back to")
+    swap_alias(client, older[-1])
+    return live, older[-1]
 
 
 if __name__ == "__main__":
-    upload_embeddings()
+    parser = argparse.ArgumentParser(description="Index blog posts into Qdrant")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report which posts would be reindexed without changing the collection",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Build a new collection version and swap the alias to it once validated",
+    )
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Swap the alias back to the previous collection version",
+    )
+    parser.add_argument(
+        "--migrate-indexes",
+        action="store_true",
+        help="Create missing payload indexes and backfill category/author payloads",
+    )
+    parser.add_argument(
+        "--quantization",
+        choices=QUANTIZATION_TYPES,
+        default=QUANTIZATION,
+        help="Quantization of the rebuilt collection",
+    )
+    parser.add_argument(
+        "--keep",
+        type=int,
+        default=KEEP_VERSIONS,
+        help="Collection versions to keep after a rebuild",
+    )
+    args = parser.parse_args()
+
+    if args.dry_run:
+        print(reindex_posts(dry_run=True).summary())
+    elif args.rebuild:
+        print(
+            rebuild_collection(keep=args.keep, quantization=args.quantization).summary()
+        )
+    elif args.migrate_indexes:
+        created, posts = migrate_payload_indexes()
+        print(f"Created indexes {created or 'none'}, updated payloads of {posts} posts")
+    elif args.rollback:
+        previous, live = rollback_collection()
+        print(f"{COLLECTION_NAME} -> {live} (rolled back from {previous})")
+    else:
+        upload_embeddings()
@@ -0,0 +1,402 @@
+import os
+import re
+import json
+import math
+import fcntl
+import heapq
+import argparse
+import tempfile
+import threading
+from contextlib import contextmanager
+from collections import Counter
+import numpy as np
+from api.ai_core.chunking import build_chunk_records
+from api.ai_core.config import COLLECTION_NAME, LEXICAL_INDEX_DIR, TEXT_FIELD_NAME
+from api.ai_core.providers import get_qdrant_client
+from api.ai_core.init_blogposts_collection import (
+    StageStats,
+    iter_posts,
+    load_posts,
+    stored_post_hashes,
+)
+
+# Same tokens as the Qdrant full-text index on page_content
+TOKEN_PATTERN = re.compile(r"\w{2,20}")
+# Documents added since the last compaction before postings are merged again
+MIN_DELTA_SIZE = 4096
+ARRAY_FILES = ("offsets", "doc_ids", "tfs", "doc_lengths")
+# Saves and loads of a directory are serialized across processes with an
+# flock on this file, so a load never mixes the files of two saves
+LOCK_FILE = ".lock"
+
+
+def tokenize(text: str):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def chunk_payloads(post):
+    """(point id, payload) of every chunk of a post, as stored in Qdrant"""
+    chunks, metadata, ids = build_chunk_records(
+        post["id"],
+        post["title"],
+        post["content"],
+        post.get("category"),
+        post.get("author"),
+    )
+    return [
+        (point_id, {TEXT_FIELD_NAME: chunk, **meta})
+        for chunk, meta, point_id in zip(chunks, metadata, ids)
+    ]
+
+
+class LexicalIndex:
+    """
+    In-process BM25 inverted index over chunk text.
+
+    Postings are stored in CSR form: for term id t, `doc_ids[offsets[t]:offsets[t + 1]]`
+    are the documents containing it and `tfs` the matching term frequencies.
+    These arrays are saved with numpy and memory-mapped on load. Documents added
+    afterwards go to a small in-memory delta, and removed posts are tombstoned;
+    both are folded into the arrays by `compact()` once the delta grows.
+
+    Args:
+        k1 (float): BM25 term frequency saturation
+        b (float): BM25 document length normalization
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab = {}
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.doc_ids = np.empty(0, dtype=np.int32)
+        self.tfs = np.empty(0, dtype=np.uint16)
+        self.doc_lengths = np.empty(0, dtype=np.float32)
+        self.deleted = np.empty(0, dtype=bool)
+        self.point_ids = []
+        self.payloads = []
+        self.post_docs = {}
+        self._delta = {}
+        self._delta_docs = 0
+        self._live_docs = 0
+        self._live_length = 0.0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return self._live_docs
+
+    def add_documents(self, documents):
+        """Index (point id, payload) pairs; the text is payload[TEXT_FIELD_NAME]"""
+        with self._lock:
+            lengths = []
+            for point_id, payload in documents:
+                doc = len(self.payloads)
+                tokens = tokenize(payload[TEXT_FIELD_NAME])
+                for term, tf in Counter(tokens).items():
+                    term_id = self.vocab.setdefault(term, len(self.vocab))
+                    docs, tfs = self._delta.setdefault(term_id, ([], []))
+                    docs.append(doc)
+                    tfs.append(min(tf, np.iinfo(np.uint16).max))
+                # page_content duplicates the document text
+                self.payloads.append(
+                    {k: v for k, v in payload.items() if k != "page_content"}
+                )
+                self.point_ids.append(point_id)
+                self.post_docs.setdefault(payload["original_id"], []).append(doc)
+                lengths.append(len(tokens))
+
+            self.doc_lengths = np.concatenate(
+                [self.doc_lengths, np.asarray(lengths, dtype=np.float32)]
+            )
+            self.deleted = np.concatenate([self.deleted, np.zeros(len(lengths), bool)])
+            self._delta_docs += len(lengths)
+            self._live_docs += len(lengths)
+            self._live_length += float(sum(lengths))
+            if self._delta_docs > max(MIN_DELTA_SIZE, len(self.payloads) // 4):
+                self.compact()
+
+    def remove_posts(self, post_ids):
+        """Tombstone every chunk of the given posts"""
+        with self._lock:
+            for post_id in post_ids:
+                for doc in self.post_docs.pop(post_id, []):
+                    self.deleted[doc] = True
+                    self._live_docs -= 1
+                    self._live_length -= float(self.doc_lengths[doc])
+
+    def update_posts(self, posts):
+        """Replace the chunks of posts (dicts with id, title, content, ...)"""
+        with self._lock:
+            self.remove_posts([post["id"] for post in posts])
+            for post in posts:
+                self.add_documents(chunk_payloads(post))
+
+    def post_hashes(self):
+        """Map post id -> indexed content hash"""
+        with self._lock:
+            return {
+                post_id: self.payloads[docs[0]].get("content_hash")
+                for post_id, docs in self.post_docs.items()
+            }
+
+    def _postings(self, term_id):
+        # Terms first seen after the last compaction only have delta postings
+        start = end = 0
+        if term_id + 1 < len(self.offsets):
+            start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        docs = self.doc_ids[start:end]
+        tfs = self.tfs[start:end]
+        delta = self._delta.get(term_id)
+        if delta:
+            docs = np.concatenate([docs, np.asarray(delta[0], dtype=np.int32)])
+            tfs = np.concatenate([tfs, np.asarray(delta[1], dtype=np.uint16)])
+        return docs, tfs
+
+    def compact(self):
+        """Merge the delta into the CSR arrays and drop tombstoned documents"""
+        with self._lock:
+            base_terms = np.repeat(
+                np.arange(len(self.offsets) - 1, dtype=np.int64),
+                np.diff(self.offsets),
+            )
+            delta_terms = [
+                np.full(len(docs), term_id, dtype=np.int64)
+                for term_id, (docs, _) in self._delta.items()
+            ]
+            terms = np.concatenate([base_terms, *delta_terms])
+            docs = np.concatenate(
+                [self.doc_ids]
+                + [np.asarray(d, dtype=np.int32) for d, _ in self._delta.values()]
+            )
+            tfs = np.concatenate(
+                [self.tfs]
+                + [np.asarray(t, dtype=np.uint16) for _, t in self._delta.values()]
+            )
+
+            live = ~self.deleted
+            keep = live[docs]
+            renumber = np.cumsum(live, dtype=np.int64) - 1
+            terms, docs, tfs = terms[keep], renumber[docs[keep]], tfs[keep]
+            order = np.lexsort((docs, terms))
+
+            self.doc_ids = docs[order].astype(np.int32)
+            self.tfs = tfs[order]
+            self.offsets = np.searchsorted(
+                terms[order], np.arange(len(self.vocab) + 1)
+            ).astype(np.int64)
+            self.doc_lengths = np.asarray(self.doc_lengths[live], dtype=np.float32)
+            kept = np.flatnonzero(live)
+            self.point_ids = [self.point_ids[i] for i in kept]
+            self.payloads = [self.payloads[i] for i in kept]
+            self.deleted = np.zeros(len(self.payloads), dtype=bool)
+            self.post_docs = {}
+            for doc, payload in enumerate(self.payloads):
+                self.post_docs.setdefault(payload["original_id"], []).append(doc)
+            self._delta = {}
+            self._delta_docs = 0
+
+    def search(self, query: str, top: int = 5, conditions=None):
+        """
+        BM25 top-k search.
+
+        Args:
+            query (str): Search text
+            top (int): Number of results
+            conditions (dict, optional): payload key -> required value
+
+        Returns:
+            list: (score, payload) pairs, best first
+        """
+        with self._lock:
+            if not self._live_docs:
+                return []
+            avg_length = self._live_length / self._live_docs
+            scores = np.zeros(len(self.payloads), dtype=np.float32)
+            for term in set(tokenize(query)):
+                term_id = self.vocab.get(term)
+                if term_id is None:
+                    continue
+                docs, tfs = self._postings(term_id)
+                live = ~self.deleted[docs]
+                docs, tfs = docs[live], tfs[live].astype(np.float32)
+                if not len(docs):
+                    continue
+                idf = math.log(
+                    1 + (self._live_docs - len(docs) + 0.5) / (len(docs) + 0.5)
+                )
+                norm = self.k1 * (
+                    1 - self.b + self.b * self.doc_lengths[docs] / avg_length
+                )
+                scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm)
+
+            candidates = np.flatnonzero(scores)
+            if conditions:
+                candidates = [
+                    doc
+                    for doc in candidates
+                    if all(
+                        self.payloads[doc].get(key) == value
+                        for key, value in conditions.items()
+                    )
+                ]
+            best = heapq.nlargest(top, candidates, key=scores.__getitem__)
+            results = []
+            for doc in best:
+                payload = dict(self.payloads[doc])
+                payload["page_content"] = payload[TEXT_FIELD_NAME]
+                results.append((float(scores[doc]), payload))
+            return results
+
+    @staticmethod
+    @contextmanager
+    def _locked(directory: str, operation):
+        with open(os.path.join(directory, LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _write(directory: str, name: str, write, mode="wb"):
+        """Write a file through a temp file of its own, then rename it in place"""
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f"{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, mode) as f:
+                write(f)
+            os.replace(tmp_path, os.path.join(directory, name))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def save(self, directory: str):
+        """
+        Compact and write the index; arrays are written for memory-mapping.
+
+        Every API worker may save the same directory at startup: each writes
+        its own temp files, and the saves run one at a time.
+        """
+        with self._lock:
+            self.compact()
+            os.makedirs(directory, exist_ok=True)
+            docs = {
+                "k1": self.k1,
+                "b": self.b,
+                "vocab": sorted(self.vocab, key=self.vocab.get),
+                "point_ids": self.point_ids,
+                "payloads": self.payloads,
+            }
+            with self._locked(directory, fcntl.LOCK_EX):
+                for name in ARRAY_FILES:
+                    array = getattr(self, name)
+                    self._write(directory, f"{name}.npy", lambda f: np.save(f, array))
+                self._write(directory, "docs.json", lambda f: json.dump(docs, f), "w")
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True):
+        """Load a saved index, memory-mapping its postings unless `mmap` is False"""
+        with cls._locked(directory, fcntl.LOCK_SH):
+            with open(os.path.join(directory, "docs.json")) as f:
+                docs = json.load(f)
+            index = cls(k1=docs["k1"], b=docs["b"])
+            for name in ARRAY_FILES:
+                setattr(
+                    index,
+                    name,
+                    np.load(
+                        os.path.join(directory, f"{name}.npy"),
+                        mmap_mode="r" if mmap else None,
+                    ),
+                )
+        index.vocab = {term: i for i, term in enumerate(docs["vocab"])}
+        index.point_ids = docs["point_ids"]
+        index.payloads = docs["payloads"]
+        index.deleted = np.zeros(len(index.payloads), dtype=bool)
+        for doc, payload in enumerate(index.payloads):
+            index.post_docs.setdefault(payload["original_id"], []).append(doc)
+        index._live_docs = len(index.payloads)
+        index._live_length = float(np.sum(index.doc_lengths, dtype=np.float64))
+        return index
+
+    @classmethod
+    def from_posts(cls, posts):
+        """Build an index from posts (dicts or rows with id, title, content, ...)"""
+        index = cls()
+        for post in posts:
+            post = post if isinstance(post, dict) else post._asdict()
+            index.add_documents(chunk_payloads(post))
+        index.compact()
+        return index
+
+    @classmethod
+    def from_collection(cls, client, collection_name, batch_size=1000):
+        """Build an index from the chunk payloads of a Qdrant collection"""
+        index = cls()
+        offset = None
+        while True:
+            points, offset = client.scroll(
+                collection_name=collection_name,
+                limit=batch_size,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False,
+            )
+            index.add_documents((str(point.id), point.payload) for point in points)
+            if offset is None:
+                break
+        index.compact()
+        return index
+
+
+def sync_with_database(index):
+    """
+    Bring an index in line with the posts table using content hashes.
+
+    Returns:
+        int: Number of posts added, updated or removed
+    """
+    stored = stored_post_hashes()
+    indexed = index.post_hashes()
+    stale = [
+        post_id for post_id, value in stored.items() if indexed.get(post_id) != value
+    ]
+    orphaned = [post_id for post_id in indexed if post_id not in stored]
+    index.remove_posts(orphaned)
+    for start in range(0, len(stale), 256):
+        index.update_posts(load_posts(stale[start : start + 256]))
+    return len(stale) + len(orphaned)
+
+
+def load_or_build(directory: str = LEXICAL_INDEX_DIR):
+    """
+    The saved index synced with the database, or a new one built from it.
+
+    The result is saved back whenever it changed, so the next process start
+    only has to memory-map it.
+    """
+    if directory and os.path.exists(os.path.join(directory, "docs.json")):
+        index = LexicalIndex.load(directory)
+        changed = sync_with_database(index)
+    else:
+        index = LexicalIndex.from_posts(iter_posts(StageStats("read")))
+        changed = True
+    if directory and changed:
+        index.save(directory)
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the lexical search index")
+    parser.add_argument(
+        "--from-qdrant",
+        action="store_true",
+        help="Build from the collection payloads instead of the database",
+    )
+    args = parser.parse_args()
+
+    if args.from_qdrant:
+        index = LexicalIndex.from_collection(get_qdrant_client(), COLLECTION_NAME)
+    else:
+        index = LexicalIndex.from_posts(iter_posts(StageStats("read")))
+    index.save(LEXICAL_INDEX_DIR)
+    print(f"Indexed {len(index)} chunks into {LEXICAL_INDEX_DIR}")
@@ -1,18 +1,25 @@
 import os
-import re
 import time
 import opik
+import threading
 from typing import List
 
 from dotenv import load_dotenv
 from qdrant_client import QdrantClient
-from qdrant_client.http.models.models import Filter, FieldCondition, MatchText
+from qdrant_client.http.models.models import Filter
 from api.ai_core.config import (
-    QDRANT_URL,
-    QDRANT_API_KEY,
-    EMBEDDINGS_MODEL,
+    HIGHLIGHT_SNIPPET_CHARS,
+    SEARCH_PROFILE,
     TEXT_FIELD_NAME,
+    VECTOR_NAME,
 )
+from api.ai_core.query_cache import query_vector_cache
+from api.ai_core.search_profiles import search_params
+from api.ai_core.embedding_service import query_embedder
+from api.ai_core.grouped_search import query_post_groups
+from api.ai_core.providers import get_qdrant_client
+from api.ai_core.lexical_index import LexicalIndex, load_or_build, sync_with_database
+from api.ai_core.highlight import highlight
 
 
 load_dotenv()
@@ -22,62 +29,116 @@ os.environ["OPIK_PROJECT_NAME"] = os.getenv("OPIK_PROJECT_NAME")
 
 
 class NeuralSearcher:
-    def __init__(self, collection_name: str):
+    def __init__(
+        self, collection_name: str, client: QdrantClient = None, embedder=None
+    ):
         self.collection_name = collection_name
-        self.qdrant_client = QdrantClient(
-            url=QDRANT_URL, api_key=QDRANT_API_KEY, prefer_grpc=True
+        self.qdrant_client = client or get_qdrant_client()
+        self.embedder = embedder or query_embedder
+
+    def embed(self, text: str) -> List[float]:
+        """Query vector of `text`, served from the shared cache when possible"""
+        return query_vector_cache.get_or_embed(
+            self.embedder.model_name, text, self.embedder.embed
         )
-        self.qdrant_client.set_model(EMBEDDINGS_MODEL)
 
     @opik.track(capture_input=True, capture_output=True)
-    def search(self, text: str, filter_: dict = None) -> List[dict]:
+    def search(
+        self, text: str, filter_: dict = None, profile: str = SEARCH_PROFILE
+    ) -> List[dict]:
         start_time = time.time()
-        hits = self.qdrant_client.query(
+        hits = self.qdrant_client.query_points(
             collection_name=self.collection_name,
-            query_text=text,
+            query=self.embed(text),
+            using=VECTOR_NAME,
             query_filter=Filter(**filter_) if filter_ else None,
             limit=5,
-        )
+            search_params=search_params(profile),
+        ).points
         print(f"Search took {time.time() - start_time} seconds")
-        return [hit.metadata for hit in hits]
+        # Same shape as the fastembed query() metadata: payload without the document
+        return [
+            {key: value for key, value in hit.payload.items() if key != TEXT_FIELD_NAME}
+            for hit in hits
+        ]
+
+    @opik.track(capture_input=True, capture_output=True)
+    def search_groups(
+        self,
+        text: str,
+        filter_: dict = None,
+        profile: str = SEARCH_PROFILE,
+        **page,
+    ) -> dict:
+        """Search results grouped by post, see `query_post_groups`"""
+        start_time = time.time()
+        result = query_post_groups(
+            self.qdrant_client,
+            self.collection_name,
+            query=self.embed(text),
+            using=VECTOR_NAME,
+            query_filter=Filter(**filter_) if filter_ else None,
+            search_params=search_params(profile),
+            **page,
+        )
+        print(f"Grouped search took {time.time() - start_time} seconds")
+        return result
 
 
 class TextSearcher:
-    def __init__(self, collection_name: str):
+    """
+    Ranked keyword search over chunk text with an in-process BM25 index.
+
+    The index is loaded (memory-mapped) or built from the database by `sync`
+    at startup, or on first use otherwise. It is per process: `update_posts`
+    only sees the posts this process's embedding worker indexes, so posts
+    indexed elsewhere (other workers, the CLI) arrive with the next `sync`.
+    """
+
+    def __init__(self, collection_name: str, index: LexicalIndex = None):
         self.highlight_field = TEXT_FIELD_NAME
         self.collection_name = collection_name
-        self.qdrant_client = QdrantClient(
-            url=QDRANT_URL, api_key=QDRANT_API_KEY, prefer_grpc=True
-        )
+        self._index = index
+        self._index_lock = threading.Lock()
+
+    @property
+    def index(self) -> LexicalIndex:
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = load_or_build()
+        return self._index
+
+    def sync(self) -> int:
+        """
+        Load the index, or bring the loaded one in line with the database.
+
+        Returns:
+            int: Posts added, updated or removed in an already loaded index
+        """
+        with self._index_lock:
+            if self._index is None:
+                self._index = load_or_build()
+                return 0
+        return sync_with_database(self._index)
+
+    def update_posts(self, posts):
+        """Reindex posts that were just embedded; an unloaded index syncs on load"""
+        if self._index is not None:
+            self._index.update_posts(posts)
 
     def highlight(self, record, query) -> dict:
-        text = record[self.highlight_field]
-
-        for word in query.lower().split():
-            if len(word) > 4:
-                pattern = re.compile(
-                    rf"(\b{re.escape(word)}?.?\b)", flags=re.IGNORECASE
-                )
-            else:
-                pattern = re.compile(rf"(\b{re.escape(word)}\b)", flags=re.IGNORECASE)
-            text = re.sub(pattern, r"<b>\1</b>", text)
-
-        record[self.highlight_field] = text
+        record[self.highlight_field] = highlight(record[self.highlight_field], query)
+        # The full chunk text is not sent along with its snippets
+        if HIGHLIGHT_SNIPPET_CHARS:
+            record.pop("page_content", None)
         return record
 
-    def search(self, query, top=5):
-        hits = self.qdrant_client.scroll(
-            collection_name=self.collection_name,
-            scroll_filter=Filter(
-                must=[
-                    FieldCondition(
-                        key=TEXT_FIELD_NAME,
-                        match=MatchText(text=query),
-                    )
-                ]
-            ),
-            with_payload=True,
-            with_vectors=False,
-            limit=top,
+    def search(self, query, top=5, filter_: dict = None):
+        conditions = (
+            {cond.key: cond.match.value for cond in Filter(**filter_).must}
+            if filter_
+            else None
         )
-        return [self.highlight(hit.payload, query) for hit in hits[0]]
+        hits = self.index.search(query, top=top, conditions=conditions)
+        return [self.highlight(payload, query) for _, payload in hits]
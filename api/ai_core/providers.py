@@ -0,0 +1,93 @@
+"""
+Process-wide providers of the heavy AI dependencies.
+
+Every searcher, the chat retriever, the embedding worker and the indexing CLI
+get the embedding model and the Qdrant client from here, so a process loads
+the ONNX model once and talks to Qdrant over one pooled client.
+"""
+
+from functools import lru_cache
+
+import httpx
+from fastembed import SparseTextEmbedding, TextEmbedding
+from qdrant_client import QdrantClient, models
+from api.ai_core.config import (
+    COLLECTION_NAME,
+    QDRANT_URL,
+    QDRANT_API_KEY,
+    QDRANT_PREFER_GRPC,
+    QDRANT_POOL_SIZE,
+    EMBEDDINGS_MODEL,
+    SPARSE_EMBEDDINGS_MODEL,
+    SPARSE_VECTOR_NAME,
+    VECTOR_NAME,
+)
+
+
+@lru_cache(maxsize=1)
+def get_embedding_model() -> TextEmbedding:
+    """The fastembed model for EMBEDDINGS_MODEL, loaded on first use"""
+    return TextEmbedding(model_name=EMBEDDINGS_MODEL)
+
+
+@lru_cache(maxsize=1)
+def get_sparse_model() -> SparseTextEmbedding:
+    """The fastembed sparse model for SPARSE_EMBEDDINGS_MODEL, loaded on first use"""
+    return SparseTextEmbedding(model_name=SPARSE_EMBEDDINGS_MODEL)
+
+
+@lru_cache(maxsize=1)
+def get_qdrant_client() -> QdrantClient:
+    """
+    The shared Qdrant client.
+
+    With QDRANT_PREFER_GRPC the client multiplexes requests from all threads
+    over one HTTP/2 channel; calls that fall back to REST reuse up to
+    QDRANT_POOL_SIZE keep-alive connections instead of reconnecting each time.
+    """
+    return QdrantClient(
+        url=QDRANT_URL,
+        api_key=QDRANT_API_KEY,
+        prefer_grpc=QDRANT_PREFER_GRPC,
+        limits=httpx.Limits(
+            max_connections=QDRANT_POOL_SIZE,
+            max_keepalive_connections=QDRANT_POOL_SIZE,
+        ),
+    )
+
+
+def alias_target(client: QdrantClient, alias_name: str = COLLECTION_NAME):
+    """The collection an alias currently points to, or None if it is no alias"""
+    for alias in client.get_aliases().aliases:
+        if alias.alias_name == alias_name:
+            return alias.collection_name
+    return None
+
+
+def embedding_dimension(model_name: str = EMBEDDINGS_MODEL) -> int:
+    """Vector size of a fastembed model, looked up without loading it"""
+    for description in TextEmbedding.list_supported_models():
+        if description["model"].lower() == model_name.lower():
+            return description["dim"]
+    raise ValueError(f"{model_name} is not a supported fastembed model")
+
+
+def vector_params(on_disk: bool = None) -> dict:
+    """Named vector config of the collection, as `client.set_model` would build it"""
+    return {
+        VECTOR_NAME: models.VectorParams(
+            size=embedding_dimension(),
+            distance=models.Distance.COSINE,
+            on_disk=on_disk,
+        )
+    }
+
+
+def sparse_vector_params() -> dict:
+    """Sparse vector config; BM25 term weights need the IDF computed by Qdrant"""
+    return {
+        SPARSE_VECTOR_NAME: models.SparseVectorParams(
+            index=models.SparseIndexParams(on_disk=False),
+            modifier=models.Modifier.IDF,
+        )
+    }
@@ -0,0 +1,141 @@
+import time
+import threading
+import unicodedata
+from collections import OrderedDict
+from langchain_core.embeddings import Embeddings
+from api.ai_core.config import QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_TTL_SECONDS
+
+
+def normalize_query(text: str) -> str:
+    """
+    Canonical form of a query for cache lookups.
+
+    Unicode is NFKC-normalized, whitespace collapsed and case folded; the
+    MiniLM tokenizer lowercases its input anyway, so case variants embed the same.
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+class QueryVectorCache:
+    """
+    Thread-safe LRU (optionally TTL) cache of query embeddings.
+
+    Keys are (model name, normalized query), so searchers sharing a model share
+    entries. A `ttl` of 0 keeps entries until they are evicted.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, model: str, text: str):
+        key = (model, normalize_query(text))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and entry[1] <= self._clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, model: str, text: str, vector):
+        key = (model, normalize_query(text))
+        with self._lock:
+            self._entries[key] = (list(vector), self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_embed(self, model: str, text: str, embed_fn):
+        """
+        Cached vector of `text`, computing and storing it with `embed_fn` on a miss.
+
+        Args:
+            model (str): Name of the embedding model, part of the cache key
+            text (str): Query text
+            embed_fn (callable): Maps a query text to its vector
+
+        Returns:
+            list: The query vector
+        """
+        vector = self.get(model, text)
+        if vector is None:
+            vector = list(embed_fn(text))
+            self.set(model, text, vector)
+        return vector
+
+    def get_or_embed_many(self, model: str, texts, embed_many_fn):
+        """
+        Cached vectors of `texts`, embedding all misses with one `embed_many_fn` call.
+
+        Args:
+            model (str): Name of the embedding model, part of the cache key
+            texts (list): Query texts
+            embed_many_fn (callable): Maps a list of query texts to their vectors
+
+        Returns:
+            list: One query vector per text
+        """
+        vectors = [self.get(model, text) for text in texts]
+        # Queries that normalize alike are embedded once
+        missing = {}
+        for i, vector in enumerate(vectors):
+            if vector is None:
+                missing.setdefault(normalize_query(texts[i]), []).append(i)
+        if missing:
+            positions = list(missing.values())
+            computed = embed_many_fn([texts[group[0]] for group in positions])
+            for group, vector in zip(positions, computed):
+                vector = list(vector)
+                self.set(model, texts[group[0]], vector)
+                for i in group:
+                    vectors[i] = vector
+        return vectors
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class CachedQueryEmbeddings(Embeddings):
+    """LangChain embeddings whose `embed_query` goes through a QueryVectorCache"""
+
+    def __init__(self, embeddings: Embeddings, model_name: str, cache=None):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.cache = cache or query_vector_cache
+
+    def embed_documents(self, texts):
+        return self.embeddings.embed_documents(texts)
+
+    def embed_query(self, text):
+        return self.cache.get_or_embed(
+            self.model_name, text, self.embeddings.embed_query
+        )
+
+
+query_vector_cache = QueryVectorCache(
+    max_entries=QUERY_CACHE_MAX_ENTRIES, ttl=QUERY_CACHE_TTL_SECONDS
+)
@@ -0,0 +1,112 @@
+import json
+import hashlib
+import threading
+from api.ai_core.query_cache import normalize_query
+
+KEY_PREFIX = "retrieval"
+
+
+class RetrievalCache:
+    """
+    Redis cache of retrieved chunks, keyed on everything that shapes the result.
+
+    Keys hash (normalized query, k, search type, collection version) under a
+    per-article namespace: `retrieval:{article_id}:{namespace}:{digest}`.
+    Invalidating an article increments its namespace counter, one INCR
+    instead of a SCAN over the keyspace; the orphaned entries expire with
+    their TTL. Rebuilding the collection changes the collection version
+    (the alias target), so results of the previous build are never served.
+    Redis errors are treated as misses, so the cache never breaks retrieval.
+
+    Args:
+        redis_client: Redis client with decode_responses=True
+        ttl (int): Seconds an entry is kept
+        collection_version (callable): Current version of the collection
+    """
+
+    def __init__(self, redis_client, ttl: int = 3600, collection_version=None):
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.collection_version = collection_version or (lambda: "")
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def namespace_key(article_id) -> str:
+        return f"{KEY_PREFIX}:ns:{article_id}"
+
+    def version(self, article_id) -> tuple:
+        """
+        Version of an article's indexed chunks, shared by every process.
+
+        Changes when the collection is rebuilt or the article is invalidated.
+        """
+        namespace = self.redis_client.get(self.namespace_key(article_id)) or 0
+        return self.collection_version(), str(namespace)
+
+    def key(self, article_id, query: str, k: int, search_type: str) -> str:
+        collection_version, namespace = self.version(article_id)
+        digest = hashlib.sha256(
+            json.dumps(
+                [normalize_query(query), k, search_type, collection_version]
+            ).encode()
+        ).hexdigest()
+        return f"{KEY_PREFIX}:{article_id}:{namespace}:{digest}"
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get_or_retrieve(
+        self, article_id, query: str, k: int, search_type: str, retrieve_fn
+    ):
+        """
+        Cached chunks of a search, running `retrieve_fn()` on a miss.
+
+        Args:
+            article_id: ID of the article searched
+            query (str): Search query
+            k (int): Number of chunks returned
+            search_type (str): Retriever search type
+            retrieve_fn (callable): Returns the chunks as JSON-serializable dicts
+
+        Returns:
+            tuple: (chunks, cache hit)
+        """
+        key = None
+        try:
+            key = self.key(article_id, query, k, search_type)
+            cached = self.redis_client.get(key)
+        except Exception as e:
+            print(f"Retrieval cache lookup failed: {e}")
+            self._count("errors")
+            cached = None
+        if cached is not None:
+            self._count("hits")
+            return json.loads(cached), True
+
+        self._count("misses")
+        chunks = retrieve_fn()
+        if key is not None:
+            try:
+                self.redis_client.setex(key, self.ttl, json.dumps(chunks))
+            except Exception as e:
+                print(f"Retrieval cache write failed: {e}")
+                self._count("errors")
+        return chunks, False
+
+    def invalidate(self, article_id) -> int:
+        """Drop every cached search of an article, returning its new namespace"""
+        return self.redis_client.incr(self.namespace_key(article_id))
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
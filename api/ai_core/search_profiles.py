@@ -0,0 +1,80 @@
+from qdrant_client import models
+from api.ai_core.config import QUANTIZATION
+
+# Query-time trade-offs between recall and latency. hnsw_ef is the size of the
+# HNSW candidate list; with quantized vectors, `oversampling` fetches extra
+# candidates from the compressed index and `rescore` re-ranks them with the
+# original vectors. "exact" bypasses both for a full-precision brute-force scan.
+SEARCH_PROFILES = {
+    "fast": models.SearchParams(
+        hnsw_ef=32,
+        quantization=models.QuantizationSearchParams(
+            ignore=False, rescore=False, oversampling=1.0
+        ),
+    ),
+    "balanced": models.SearchParams(
+        hnsw_ef=128,
+        quantization=models.QuantizationSearchParams(
+            ignore=False, rescore=True, oversampling=2.0
+        ),
+    ),
+    "exact": models.SearchParams(
+        exact=True,
+        quantization=models.QuantizationSearchParams(ignore=True),
+    ),
+}
+
+QUANTIZATION_TYPES = ("scalar", "binary", "product", "none")
+
+
+def search_params(profile: str) -> models.SearchParams:
+    """
+    SearchParams of a named search profile.
+
+    Raises:
+        ValueError: If the profile does not exist
+    """
+    try:
+        return SEARCH_PROFILES[profile]
+    except KeyError:
+        raise ValueError(
+            f"Unknown search profile {profile!r}, "
+            f"expected one of {', '.join(SEARCH_PROFILES)}"
+        ) from None
+
+
+def quantization_config(kind: str = QUANTIZATION):
+    """
+    Collection quantization config for `kind`.
+
+    scalar (INT8, 4x smaller) keeps recall close to the original vectors;
+    binary (32x) and product (16x here) trade more recall for memory and speed
+    and rely on oversampling + rescoring at query time.
+
+    Raises:
+        ValueError: If `kind` is not one of QUANTIZATION_TYPES
+    """
+    if kind == "scalar":
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=True,
+            )
+        )
+    if kind == "binary":
+        return models.BinaryQuantization(
+            binary=models.BinaryQuantizationConfig(always_ram=True)
+        )
+    if kind == "product":
+        return models.ProductQuantization(
+            product=models.ProductQuantizationConfig(
+                compression=models.CompressionRatio.X16,
+                always_ram=True,
+            )
+        )
+    if kind == "none":
+        return None
+    raise ValueError(
+        f"Unknown quantization {kind!r}, expected one of {', '.join(QUANTIZATION_TYPES)}"
+    )
@@ -25,6 +25,26 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 1 day
 
+    # In-process read cache for post listing/lookup responses
+    READ_CACHE_TTL_SECONDS: int = os.environ.get("READ_CACHE_TTL_SECONDS", default=60)
+    READ_CACHE_MAX_ENTRIES: int = os.environ.get("READ_CACHE_MAX_ENTRIES", default=1024)
+    READ_CACHE_MAX_BYTES: int = os.environ.get(
+        "READ_CACHE_MAX_BYTES", default=32 * 1024 * 1024
+    )
+    # max-age sent to clients; 0 makes them revalidate with If-None-Match
+    READ_CACHE_MAX_AGE: int = os.environ.get("READ_CACHE_MAX_AGE", default=0)
+
+    # Background embedding worker
+    INDEX_WORKERS: int = os.environ.get("INDEX_WORKERS", default=1)
+    INDEX_BATCH_SIZE: int = os.environ.get("INDEX_BATCH_SIZE", default=32)
+    INDEX_BATCH_WINDOW_SECONDS: float = os.environ.get(
+        "INDEX_BATCH_WINDOW_SECONDS", default=0.05
+    )
+    INDEX_MAX_RETRIES: int = os.environ.get("INDEX_MAX_RETRIES", default=5)
+    INDEX_RETRY_BACKOFF_SECONDS: float = os.environ.get(
+        "INDEX_RETRY_BACKOFF_SECONDS", default=2.0
+    )
+
     # CORS settings
     CORS_ORIGINS: list[str] = ["http://localhost:3000", "http://localhost:8000"]
 
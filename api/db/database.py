@@ -1,6 +1,7 @@
 """The database module"""
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
 
 from api.config import settings
@@ -13,6 +14,9 @@ DB_NAME = settings.DB_NAME
 DB_TYPE = settings.DB_TYPE
 BASE_DIR = settings.BASE_DIR
 
+# Async DBAPI used for each backend supported by get_db_engine
+ASYNC_DRIVERS = {"postgresql": "postgresql+asyncpg", "sqlite": "sqlite+aiosqlite"}
+
 
 def get_db_engine(test_mode: bool = False):
     DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
@@ -35,9 +39,21 @@ def get_db_engine(test_mode: bool = False):
     return create_engine(DATABASE_URL)
 
 
+def get_async_db_engine(sync_engine):
+    """Create an async engine pointing at the same database as `sync_engine`"""
+    url = sync_engine.url
+    return create_async_engine(
+        url.set(drivername=ASYNC_DRIVERS[url.get_backend_name()])
+    )
+
+
 engine = get_db_engine()
+async_engine = get_async_db_engine(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
 
 db_session = scoped_session(SessionLocal)
 
@@ -48,9 +64,7 @@ def create_database():
     return Base.metadata.create_all(bind=engine)
 
 
-def get_db():
-    db = db_session()
-    try:
+async def get_db():
+    """Request-scoped AsyncSession dependency"""
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
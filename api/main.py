@@ -1,10 +1,31 @@
 # app/main.py
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.v1.routes import route
 from api.db.database import Base, engine
+from api.v1.services.ai_service import sync_lexical_index, text_searcher
+from api.v1.services.indexing_service import embedding_worker
 
-app = FastAPI(title="Blog API", description="Public blog viewing API", version="1.0.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load or build the keyword index before serving, not in the first search
+    await asyncio.to_thread(text_searcher.sync)
+    await embedding_worker.start()
+    lexical_sync = asyncio.create_task(sync_lexical_index())
+    yield
+    lexical_sync.cancel()
+    await embedding_worker.stop()
+
+
+app = FastAPI(
+    title="Blog API",
+    description="Public blog viewing API",
+    version="1.0.0",
+    lifespan=lifespan,
+)
 
 # Set up CORS
 app.add_middleware(
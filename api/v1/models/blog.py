@@ -1,16 +1,27 @@
 # app/models/blog.py
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
 from sqlalchemy.sql import func
 from api.db.database import Base
 
 
+def utc_now():
+    """Naive UTC timestamp, the value CURRENT_TIMESTAMP stores on SQLite"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 class BlogPost(Base):
     __tablename__ = "blog_posts"
+    # Serves the keyset-paginated listing (ORDER BY date DESC, id DESC)
+    __table_args__ = (Index("ix_blog_posts_date_id", "date", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     content = Column(Text, nullable=False)
-    date = Column(DateTime, nullable=False, server_default=func.now())
+    # Set from Python so SQLite stores the same "YYYY-MM-DD HH:MM:SS.ffffff"
+    # text the pagination cursor binds; CURRENT_TIMESTAMP drops the fraction
+    # and breaks the (date, id) keyset comparison
+    date = Column(DateTime, nullable=False, default=utc_now, server_default=func.now())
     description = Column(Text, nullable=False)
     author = Column(String(255), nullable=False)
     published = Column(String(100), nullable=False)
@@ -18,3 +29,5 @@ class BlogPost(Base):
     slug = Column(String(255), nullable=False)
     category = Column(String(100), nullable=False)
     image = Column(String(255), nullable=False)
+    # sha256 of `content`, mirrored in the Qdrant payload of the post's chunks
+    content_hash = Column(String(64), nullable=True)
@@ -0,0 +1,25 @@
+# app/models/index_job.py
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from api.db.database import Base
+
+
+class IndexJob(Base):
+    """Embedding state of a post, driven by the background embedding worker"""
+
+    __tablename__ = "index_jobs"
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    post_id = Column(
+        Integer, ForeignKey("blog_posts.id", ondelete="CASCADE"), primary_key=True
+    )
+    status = Column(String(20), nullable=False, default=PENDING, index=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    updated_at = Column(
+        DateTime, nullable=False, server_default=func.now(), onupdate=func.now()
+    )
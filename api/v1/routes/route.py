@@ -1,49 +1,252 @@
 # app/routes/blog.py
-from fastapi import APIRouter, HTTPException, Depends
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Query, Header, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from api.config import settings
+from api.db.database import get_db
 from api.dependency import verify_admin
-from api.v1.services.ai_service import read_item, chat, reset_conversation
-from api.v1.services.blog_service import get_all_posts, get_post_by_id, create_blog_post
-from api.v1.schemas.blog_schema import BlogPostCreate, BlogPostResponse, ChatRequest
+from api.ai_core.config import (
+    MAX_BATCH_LIMIT,
+    MAX_BATCH_QUERIES,
+    MAX_GROUP_SIZE,
+    MAX_SEARCH_GROUPS,
+)
+from api.ai_core.query_cache import query_vector_cache
+from api.ai_core.search_profiles import SEARCH_PROFILES
+from api.ai_core.hybrid_search import FUSIONS
+from api.v1.services.ai_service import (
+    SEARCH_MODES,
+    read_item,
+    read_items,
+    chat,
+    chat_stream,
+    chat_cache_stats,
+    reset_conversation,
+)
+from api.v1.services.blog_service import (
+    get_all_posts_cached,
+    get_post_by_id_cached,
+    create_blog_post_async,
+    create_blog_posts_bulk_async,
+)
+from api.v1.services.cache_service import CachedResponse, etag_matches, read_cache
+from api.v1.services.indexing_service import get_index_status
+from api.v1.schemas.blog_schema import (
+    BlogPostCreate,
+    BlogPostPage,
+    BlogPostResponse,
+    BatchSearchRequest,
+    BulkPostResponse,
+    ChatRequest,
+    IndexStatusResponse,
+)
 
 router = APIRouter(prefix="/api/v1", tags=["Blog"])
 
 
-@router.get("/")
-def list_all_blog_posts():
-    return get_all_posts()
+def cached_response(cached: CachedResponse, if_none_match: Optional[str]) -> Response:
+    headers = {
+        "ETag": cached.etag,
+        "Cache-Control": f"public, max-age={settings.READ_CACHE_MAX_AGE}",
+    }
+    if etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
+
+
+@router.get("/", response_model=BlogPostPage)
+async def list_all_blog_posts(
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    try:
+        cached = await get_all_posts_cached(db, limit=limit, after=after)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return cached_response(cached, if_none_match)
 
 
 @router.get("/health")
-def health():
+async def health():
     return {"status", "ok"}
 
 
-@router.get("/search/{post_id}")
-def get_blog_post(post_id: int):
-    post = get_post_by_id(post_id)
-    if not post:
+@router.get("/cache-stats")
+async def cache_stats():
+    return {
+        "read": read_cache.stats(),
+        "query_vectors": query_vector_cache.stats(),
+        **chat_cache_stats(),
+    }
+
+
+@router.get("/search/{post_id}", response_model=BlogPostResponse)
+async def get_blog_post(
+    post_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
+):
+    cached = await get_post_by_id_cached(db, post_id)
+    if not cached:
         raise HTTPException(status_code=404, detail="Post not found")
-    return post
+    return cached_response(cached, if_none_match)
 
 
 @router.post(
     "/addpost", response_model=BlogPostResponse, dependencies=[Depends(verify_admin)]
 )
-def create_blog(blog: BlogPostCreate):
-    new_post = create_blog_post(blog)
+async def create_blog(blog: BlogPostCreate, db: AsyncSession = Depends(get_db)):
+    new_post = await create_blog_post_async(db, blog)
     return new_post
 
 
+async def read_ndjson_lines(request: Request):
+    """Collect the non-empty lines of an NDJSON body as it streams in"""
+    lines = []
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *complete, buffer = buffer.split(b"\n")
+        lines.extend(line for line in complete if line.strip())
+    if buffer.strip():
+        lines.append(buffer)
+    return lines
+
+
+@router.post(
+    "/addposts",
+    response_model=BulkPostResponse,
+    dependencies=[Depends(verify_admin)],
+)
+async def create_blogs(request: Request, db: AsyncSession = Depends(get_db)):
+    """Bulk insert posts sent as a JSON array or as NDJSON (application/x-ndjson)"""
+    if request.headers.get("content-type", "").startswith("application/x-ndjson"):
+        items = await read_ndjson_lines(request)
+    else:
+        try:
+            items = json.loads(await request.body())
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Body must be a JSON array")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array")
+    return await create_blog_posts_bulk_async(db, items)
+
+
+@router.get("/index-status/{post_id}", response_model=IndexStatusResponse)
+async def index_status(post_id: int, db: AsyncSession = Depends(get_db)):
+    job = await get_index_status(db, post_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="No indexing job for this post")
+    return job
+
+
+# The Qdrant and Gemini clients are blocking, so they run off the event loop
 @router.get("/ai-search")
-def search_item(q: str, neural: bool = True):
-    return read_item(q, neural)
+async def search_item(
+    q: str,
+    neural: bool = True,
+    category: str = None,
+    author: str = None,
+    profile: Optional[str] = None,
+    mode: Optional[str] = None,
+    fusion: str = "rrf",
+    group_by_post: bool = False,
+    group_size: int = Query(1, ge=1, le=MAX_GROUP_SIZE),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=MAX_SEARCH_GROUPS),
+    score_threshold: Optional[float] = None,
+):
+    for name, value, allowed in (
+        ("profile", profile, SEARCH_PROFILES),
+        ("mode", mode, SEARCH_MODES),
+        ("fusion", fusion, FUSIONS),
+    ):
+        if value is not None and value not in allowed:
+            raise HTTPException(
+                status_code=400,
+                detail=f"{name} must be one of {', '.join(allowed)}",
+            )
+    if not group_by_post:
+        try:
+            return await asyncio.to_thread(
+                read_item, q, neural, category, author, profile, mode, fusion
+            )
+        except ValueError as e:
+            # e.g. hybrid mode on a collection without sparse vectors
+            raise HTTPException(status_code=400, detail=str(e))
+
+    if (mode or ("neural" if neural else "text")) == "text":
+        raise HTTPException(
+            status_code=400, detail="group_by_post needs the neural or hybrid mode"
+        )
+    if offset >= MAX_SEARCH_GROUPS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"offset must be below {MAX_SEARCH_GROUPS}",
+        )
+    try:
+        return await asyncio.to_thread(
+            read_item,
+            q,
+            neural,
+            category,
+            author,
+            profile,
+            mode,
+            fusion,
+            group_by_post=True,
+            offset=offset,
+            limit=limit,
+            group_size=group_size,
+            score_threshold=score_threshold,
+            # The page reaching the cap is shortened instead of rejected
+            max_groups=MAX_SEARCH_GROUPS,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/ai-search/batch")
+async def search_items(request: BatchSearchRequest):
+    if not 0 < len(request.queries) <= MAX_BATCH_QUERIES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Send between 1 and {MAX_BATCH_QUERIES} queries",
+        )
+    if any(not 0 < query.limit <= MAX_BATCH_LIMIT for query in request.queries):
+        raise HTTPException(
+            status_code=400, detail=f"limit must be between 1 and {MAX_BATCH_LIMIT}"
+        )
+    if request.profile is not None and request.profile not in SEARCH_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"profile must be one of {', '.join(SEARCH_PROFILES)}",
+        )
+    return await asyncio.to_thread(read_items, request.queries, request.profile)
 
 
 @router.post("/ask")
-def rag_chat(request: ChatRequest):
-    return chat(request.user_id, request.article_id, request.query)
+async def rag_chat(request: ChatRequest):
+    return await asyncio.to_thread(
+        chat, request.user_id, request.article_id, request.query
+    )
+
+
+@router.post("/ask/stream")
+async def rag_chat_stream(request: ChatRequest):
+    # StreamingResponse iterates the blocking generator in a worker thread
+    return StreamingResponse(
+        chat_stream(request.user_id, request.article_id, request.query),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/reset-conn")
-def reset(user_id: str, article_id: str):
-    return reset_conversation(user_id, article_id)
+async def reset(user_id: str, article_id: str):
+    return await asyncio.to_thread(reset_conversation, user_id, article_id)
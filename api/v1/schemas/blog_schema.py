@@ -28,6 +28,54 @@ class BlogPostResponse(BlogPostBase):
         from_attributes = True
 
 
+class BlogPostSummary(BaseModel):
+    """Listing projection of a post; the body is fetched via /search/{post_id}."""
+
+    id: int
+    date: datetime
+    title: str
+    description: str
+    slug: str
+    category: str
+    image: str
+    readTime: str
+
+    class Config:
+        from_attributes = True
+
+
+class BlogPostPage(BaseModel):
+    items: List[BlogPostSummary]
+    next_cursor: Optional[str] = None
+
+
+class BulkPostResult(BaseModel):
+    index: int
+    status: str  # "created" or "invalid"
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class BulkPostResponse(BaseModel):
+    items: List[BulkPostResult]
+    created: int
+    failed: int
+    queued: int
+    elapsed_seconds: float
+    posts_per_second: float
+
+
+class IndexStatusResponse(BaseModel):
+    post_id: int
+    status: str
+    attempts: int
+    last_error: Optional[str] = None
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
 class RetrievalRequest(BaseModel):
     article_id: str
     query: Optional[str] = None
@@ -46,6 +94,18 @@ class RetrievalResponse(BaseModel):
     cache_hit: bool = False
 
 
+class BatchSearchQuery(BaseModel):
+    q: str
+    category: Optional[str] = None
+    author: Optional[str] = None
+    limit: int = 5
+
+
+class BatchSearchRequest(BaseModel):
+    queries: List[BatchSearchQuery]
+    profile: Optional[str] = None
+
+
 class ChatRequest(BaseModel):
     user_id: str
     article_id: str
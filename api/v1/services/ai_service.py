@@ -1,8 +1,17 @@
 import os
+import asyncio
 from dotenv import load_dotenv
 from api.ai_core.agent import ChatbotService
 from api.ai_core.postsearch import TextSearcher, NeuralSearcher
-from api.ai_core.config import COLLECTION_NAME
+from api.ai_core.hybrid_search import HybridSearcher
+from api.ai_core.batch_search import BatchSearcher
+from api.ai_core.chat_stream import sse_event
+from api.ai_core.config import (
+    COLLECTION_NAME,
+    LEXICAL_INDEX_SYNC_SECONDS,
+    SEARCH_PROFILE,
+)
+from api.v1.services.indexing_service import embedding_worker
 
 load_dotenv()
 
@@ -11,13 +20,104 @@ redis_url = os.getenv("REDIS_URL")
 chatbot = ChatbotService(redis_url=redis_url)
 neural_searcher = NeuralSearcher(collection_name=COLLECTION_NAME)
 text_searcher = TextSearcher(collection_name=COLLECTION_NAME)
+hybrid_searcher = HybridSearcher(collection_name=COLLECTION_NAME)
+batch_searcher = BatchSearcher(collection_name=COLLECTION_NAME)
+# Keep the in-process keyword index in step with newly embedded posts
+embedding_worker.add_listener(text_searcher.update_posts)
 
 
-def read_item(q: str, neural: bool = True):
+def invalidate_chat_caches(posts):
+    """Drop the cached chat retrievals and answers of re-embedded posts"""
+    for post in posts:
+        chatbot.retriever.invalidate_cache(post["id"])
+        chatbot.bot.answer_cache.invalidate(post["id"])
+
+
+embedding_worker.add_listener(invalidate_chat_caches)
+
+
+async def sync_lexical_index(interval: float = LEXICAL_INDEX_SYNC_SECONDS):
+    """Re-sync the keyword index with the database every `interval` seconds"""
+    while interval:
+        await asyncio.sleep(interval)
+        try:
+            changed = await asyncio.to_thread(text_searcher.sync)
+        except Exception as e:
+            print(f"Lexical index sync failed: {e}")
+            continue
+        if changed:
+            print(f"Lexical index synced {changed} posts")
+
+
+SEARCH_MODES = ("neural", "text", "hybrid")
+
+
+def payload_filter(category: str = None, author: str = None):
+    """Qdrant filter on the indexed category/author payload fields, or None"""
+    must = [
+        {"key": key, "match": {"value": value}}
+        for key, value in (("category", category), ("author", author))
+        if value
+    ]
+    return {"must": must} if must else None
+
+
+def read_item(
+    q: str,
+    neural: bool = True,
+    category: str = None,
+    author: str = None,
+    profile: str = None,
+    mode: str = None,
+    fusion: str = "rrf",
+    group_by_post: bool = False,
+    **page,
+):
+    """
+    Search posts; with `group_by_post`, one entry per post and `page` holds
+    the offset, limit, group_size, score_threshold and max_groups of the
+    grouped query.
+    """
+    filter_ = payload_filter(category, author)
+    profile = profile or SEARCH_PROFILE
+    # `mode` supersedes the older neural flag
+    mode = mode or ("neural" if neural else "text")
+    if group_by_post:
+        if mode == "hybrid":
+            return hybrid_searcher.search_groups(
+                text=q, filter_=filter_, fusion=fusion, profile=profile, **page
+            )
+        return neural_searcher.search_groups(
+            text=q, filter_=filter_, profile=profile, **page
+        )
+    if mode == "hybrid":
+        result = hybrid_searcher.search(
+            text=q, filter_=filter_, fusion=fusion, profile=profile
+        )
+    elif mode == "neural":
+        result = neural_searcher.search(text=q, filter_=filter_, profile=profile)
+    else:
+        result = text_searcher.search(query=q, filter_=filter_)
+    return {"result": result}
+
+
+def read_items(queries, profile: str = None):
+    """Run the neural searches of a batch request, results in request order"""
+    results = batch_searcher.search(
+        [
+            {
+                "text": query.q,
+                "filter_": payload_filter(query.category, query.author),
+                "limit": query.limit,
+            }
+            for query in queries
+        ],
+        profile=profile or SEARCH_PROFILE,
+    )
     return {
-        "result": neural_searcher.search(text=q)
-        if neural
-        else text_searcher.search(query=q)
+        "results": [
+            {"q": query.q, "result": result} for query, result in zip(queries, results)
+        ]
     }
 
 
@@ -26,5 +126,24 @@ def chat(user_id: str, article_id: str, query: str):
     return response["answer"], response["chat_history"]
 
 
+def chat_stream(user_id: str, article_id: str, query: str):
+    """Server-Sent Events of a streamed chat answer"""
+    try:
+        events = chatbot.stream_chat(user_id, article_id, query)
+    except Exception as e:
+        # The response has started by now, so errors are reported as events
+        yield sse_event("error", {"detail": str(e)})
+        return
+    for event, data in events:
+        yield sse_event(event, data)
+
+
+def chat_cache_stats():
+    return {
+        "retrieval": chatbot.retriever.retrieval_cache.stats(),
+        "answers": chatbot.bot.answer_cache.stats(),
+    }
+
+
 def reset_conversation(user_id: str, article_id: str):
     chatbot.reset_conversation(user_id, article_id)
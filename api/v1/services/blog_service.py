@@ -1,29 +1,68 @@
 # app/services/blog_service.py
+import base64
+import time
+from datetime import datetime
+from typing import Optional
+
+from pydantic import ValidationError
+from sqlalchemy import and_, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only
+
+from api.ai_core.chunking import content_hash
 from api.db.database import SessionLocal
 from api.v1.models.blog import BlogPost
-from api.v1.schemas.blog_schema import BlogPostCreate
-from api.ai_core.init_blogposts_collection import upload_single_embeddings
+from api.v1.models.index_job import IndexJob
+from api.v1.schemas.blog_schema import BlogPostCreate, BlogPostPage, BlogPostResponse
+from api.v1.services.cache_service import read_cache
+from api.v1.services.indexing_service import embedding_worker
 
 
-def get_all_posts():
-    """Fetch all blog posts"""
-    db = SessionLocal()
-    posts = db.query(BlogPost).order_by(BlogPost.date.desc()).all()
-    db.close()
-    return posts
+# Columns needed by the listing page; `content` stays deferred
+SUMMARY_COLUMNS = (
+    BlogPost.id,
+    BlogPost.date,
+    BlogPost.title,
+    BlogPost.description,
+    BlogPost.slug,
+    BlogPost.category,
+    BlogPost.image,
+    BlogPost.readTime,
+)
 
 
-def get_post_by_id(post_id: int):
-    """Fetch a single blog post by ID"""
-    db = SessionLocal()
-    post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
-    db.close()
-    return post
+def encode_cursor(post: BlogPost) -> str:
+    """Encode the (date, id) keyset position of a post as an opaque cursor"""
+    raw = f"{post.date.isoformat()}|{post.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
 
 
-def create_blog_post(blog: BlogPostCreate):
-    db = SessionLocal()
-    new_post = BlogPost(
+def decode_cursor(cursor: str):
+    """Decode a cursor produced by `encode_cursor`, raising ValueError if invalid"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date, post_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(date), int(post_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _after_cursor(after: str):
+    """Keyset condition selecting the posts that follow `after`"""
+    after_date, after_id = decode_cursor(after)
+    return or_(
+        BlogPost.date < after_date,
+        and_(BlogPost.date == after_date, BlogPost.id < after_id),
+    )
+
+
+def _page(posts, limit: int):
+    next_cursor = encode_cursor(posts[limit - 1]) if len(posts) > limit else None
+    return {"items": posts[:limit], "next_cursor": next_cursor}
+
+
+def _new_post(blog: BlogPostCreate) -> BlogPost:
+    return BlogPost(
         title=blog.title,
         content=blog.content,
         description=blog.description,
@@ -33,12 +72,169 @@ def create_blog_post(blog: BlogPostCreate):
         slug=blog.slug,
         category=blog.category,
         image=blog.image,
+        content_hash=content_hash(blog.content),
+    )
+
+
+def get_all_posts(limit: int = 20, after: Optional[str] = None):
+    """Fetch one page of post summaries, newest first.
+
+    Args:
+        limit: Maximum number of posts to return
+        after: Cursor returned as `next_cursor` by the previous page
+
+    Returns:
+        dict with the page `items` and the `next_cursor` (None on the last page)
+    """
+    db = SessionLocal()
+    query = db.query(BlogPost).options(load_only(*SUMMARY_COLUMNS))
+    if after:
+        query = query.filter(_after_cursor(after))
+    # Fetch one extra row to know whether another page follows
+    posts = (
+        query.order_by(BlogPost.date.desc(), BlogPost.id.desc()).limit(limit + 1).all()
     )
+    db.close()
+    return _page(posts, limit)
+
+
+def get_post_by_id(post_id: int):
+    """Fetch a single blog post by ID"""
+    db = SessionLocal()
+    post = db.query(BlogPost).filter(BlogPost.id == post_id).first()
+    db.close()
+    return post
+
+
+def create_blog_post(blog: BlogPostCreate):
+    db = SessionLocal()
+    new_post = _new_post(blog)
 
     db.add(new_post)
+    db.flush()
+    # The indexing job is committed with the post so it survives a restart
+    db.add(IndexJob(post_id=new_post.id))
     db.commit()
     db.refresh(new_post)
     db.close()
-    data = {"content": new_post.content, "id": new_post.id, "title": new_post.title}
-    upload_single_embeddings(data)
+    read_cache.clear()
+    embedding_worker.enqueue_threadsafe(new_post.id)
     return new_post
+
+
+async def get_all_posts_async(
+    db: AsyncSession, limit: int = 20, after: Optional[str] = None
+):
+    """Async version of `get_all_posts` running on a request-scoped session"""
+    stmt = select(BlogPost).options(load_only(*SUMMARY_COLUMNS))
+    if after:
+        stmt = stmt.where(_after_cursor(after))
+    stmt = stmt.order_by(BlogPost.date.desc(), BlogPost.id.desc()).limit(limit + 1)
+    posts = (await db.scalars(stmt)).all()
+    return _page(posts, limit)
+
+
+async def get_post_by_id_async(db: AsyncSession, post_id: int):
+    """Async version of `get_post_by_id`"""
+    return await db.get(BlogPost, post_id)
+
+
+async def create_blog_post_async(db: AsyncSession, blog: BlogPostCreate):
+    """Async version of `create_blog_post`"""
+    new_post = _new_post(blog)
+
+    db.add(new_post)
+    await db.flush()
+    db.add(IndexJob(post_id=new_post.id))
+    await db.commit()
+    await db.refresh(new_post)
+    read_cache.clear()
+    embedding_worker.enqueue(new_post.id)
+    return new_post
+
+
+async def create_blog_posts_bulk_async(db: AsyncSession, items: list):
+    """Validate and insert a batch of posts in one transaction, queueing their indexing.
+
+    Args:
+        db: Request-scoped session
+        items: Raw posts, either dicts or JSON strings (one NDJSON line each)
+
+    Returns:
+        dict matching BulkPostResponse with per-item status and throughput
+    """
+    start = time.perf_counter()
+    results = []
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            if isinstance(item, (str, bytes)):
+                blog = BlogPostCreate.model_validate_json(item)
+            else:
+                blog = BlogPostCreate.model_validate(item)
+        except ValidationError as e:
+            error = "; ".join(
+                f"{'.'.join(map(str, err['loc'])) or 'body'}: {err['msg']}"
+                for err in e.errors()
+            )
+            results.append({"index": index, "status": "invalid", "error": error})
+            continue
+        valid.append((index, blog))
+
+    ids = []
+    if valid:
+        # Single executemany INSERT ... RETURNING, ids come back in input order
+        stmt = insert(BlogPost).returning(BlogPost.id, sort_by_parameter_order=True)
+        rows = [
+            {**blog.model_dump(), "content_hash": content_hash(blog.content)}
+            for _, blog in valid
+        ]
+        ids = (await db.scalars(stmt, rows)).all()
+        await db.execute(insert(IndexJob), [{"post_id": post_id} for post_id in ids])
+        await db.commit()
+        read_cache.clear()
+        # The embedding worker micro-batches these into a single upsert
+        for post_id in ids:
+            embedding_worker.enqueue(post_id)
+
+    for (index, _), post_id in zip(valid, ids):
+        results.append({"index": index, "status": "created", "id": post_id})
+    results.sort(key=lambda result: result["index"])
+
+    elapsed = time.perf_counter() - start
+    return {
+        "items": results,
+        "created": len(ids),
+        "failed": len(items) - len(ids),
+        "queued": len(ids),
+        "elapsed_seconds": elapsed,
+        "posts_per_second": len(ids) / elapsed if elapsed > 0 else 0.0,
+    }
+
+
+async def get_all_posts_cached(
+    db: AsyncSession, limit: int = 20, after: Optional[str] = None
+):
+    """Serialized listing page, served from the read cache when possible"""
+    key = ("posts", limit, after)
+    cached = read_cache.get(key)
+    if cached is None:
+        generation = read_cache.generation
+        page = await get_all_posts_async(db, limit=limit, after=after)
+        body = BlogPostPage.model_validate(page).model_dump_json().encode()
+        cached = read_cache.set(key, body, generation)
+    return cached
+
+
+async def get_post_by_id_cached(db: AsyncSession, post_id: int):
+    """Serialized post, served from the read cache when possible"""
+    key = ("post", post_id)
+    cached = read_cache.get(key)
+    if cached is None:
+        generation = read_cache.generation
+        post = await get_post_by_id_async(db, post_id)
+        if not post:
+            return None
+        body = BlogPostResponse.model_validate(post).model_dump_json().encode()
+        cached = read_cache.set(key, body, generation)
+    return cached
@@ -0,0 +1,133 @@
+# app/services/cache_service.py
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, Optional
+
+from api.config import settings
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    body: bytes
+    etag: str
+    expires_at: float
+
+
+class ReadCache:
+    """Thread-safe TTL + LRU cache of serialized JSON responses.
+
+    Entries are evicted least-recently-used first once either `max_entries`
+    or the total body size `max_bytes` is exceeded, and expire `ttl` seconds
+    after they were stored.
+
+    `clear()` bumps `generation`; a reader snapshots it before loading the
+    data and passes it to `set()`, so a body read before a concurrent write
+    (and its clear) is not cached after it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        max_bytes: int = 32 * 1024 * 1024,
+        ttl: float = 60,
+        clock=time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.generation = 0
+        self.stale_sets = 0
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        """Strong ETag derived from the response body"""
+        return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    def get(self, key: Hashable) -> Optional[CachedResponse]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(
+        self, key: Hashable, body: bytes, generation: Optional[int] = None
+    ) -> CachedResponse:
+        entry = CachedResponse(
+            body=body,
+            etag=self.make_etag(body),
+            expires_at=self._clock() + self.ttl,
+        )
+        # Oversized bodies are served but never cached
+        if len(body) > self.max_bytes:
+            return entry
+
+        with self._lock:
+            # The data was loaded before a clear(), it may predate a write
+            if generation is not None and generation != self.generation:
+                self.stale_sets += 1
+                return entry
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += len(body)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "stale_sets": self.stale_sets,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _remove(self, key: Hashable):
+        entry = self._entries.pop(key)
+        self._bytes -= len(entry.body)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+read_cache = ReadCache(
+    max_entries=settings.READ_CACHE_MAX_ENTRIES,
+    max_bytes=settings.READ_CACHE_MAX_BYTES,
+    ttl=settings.READ_CACHE_TTL_SECONDS,
+)
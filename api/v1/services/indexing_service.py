@@ -0,0 +1,209 @@
+# app/services/indexing_service.py
+import asyncio
+import time
+from typing import Optional
+
+from sqlalchemy import select, update
+
+from api.config import settings
+from api.db.database import AsyncSessionLocal
+from api.v1.models.blog import BlogPost
+from api.v1.models.index_job import IndexJob
+from api.ai_core.init_blogposts_collection import (
+    POST_COLUMNS,
+    upload_batch_embeddings,
+)
+
+
+class EmbeddingWorker:
+    """
+    In-process embedding queue that keeps chunking and inference off the request path.
+
+    Post ids are pushed onto an asyncio queue; each worker task drains up to
+    `batch_size` of them (waiting at most `batch_window` seconds for the batch
+    to fill), embeds them with one batched upsert in a thread, and records the
+    outcome in the `index_jobs` table. Failed batches are retried with
+    exponential backoff until `max_retries` attempts have been made.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        index_fn=upload_batch_embeddings,
+        workers: int = 1,
+        batch_size: int = 32,
+        batch_window: float = 0.05,
+        max_retries: int = 5,
+        backoff: float = 2.0,
+        max_backoff: float = 300.0,
+    ):
+        self.session_factory = session_factory
+        self.index_fn = index_fn
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks = []
+        self._retry_handles = set()
+        self._listeners = []
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    async def start(self):
+        """Start the worker tasks and re-enqueue jobs left unfinished by a previous run"""
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._tasks = [
+            asyncio.create_task(self._run()) for _ in range(max(1, self.workers))
+        ]
+
+        async with self.session_factory() as db:
+            post_ids = (
+                await db.scalars(
+                    select(IndexJob.post_id).where(
+                        IndexJob.status.in_([IndexJob.PENDING, IndexJob.RUNNING])
+                    )
+                )
+            ).all()
+        for post_id in post_ids:
+            self.enqueue(post_id)
+        if post_ids:
+            print(f"Recovered {len(post_ids)} unfinished indexing jobs")
+
+    async def stop(self):
+        """Cancel the worker tasks; unfinished jobs stay pending in the database"""
+        for handle in self._retry_handles:
+            handle.cancel()
+        self._retry_handles.clear()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def add_listener(self, callback):
+        """Call `callback(posts)` in a thread after each successfully indexed batch"""
+        self._listeners.append(callback)
+
+    def enqueue(self, post_id: int):
+        """Queue a post for indexing; must be called from the worker's event loop"""
+        if self.running:
+            self._queue.put_nowait(post_id)
+
+    def enqueue_threadsafe(self, post_id: int):
+        """Queue a post for indexing from a thread outside the event loop"""
+        if self.running:
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, post_id)
+
+    async def _next_batch(self):
+        post_ids = [await self._queue.get()]
+        deadline = time.monotonic() + self.batch_window
+        while len(post_ids) < self.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                post_ids.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        # The same post may have been queued twice (e.g. retry + recovery)
+        return list(dict.fromkeys(post_ids))
+
+    async def _run(self):
+        while True:
+            post_ids = await self._next_batch()
+            try:
+                await self._process(post_ids)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error processing indexing batch {post_ids}: {e}")
+
+    async def _set_status(self, db, post_ids, **values):
+        await db.execute(
+            update(IndexJob).where(IndexJob.post_id.in_(post_ids)).values(**values)
+        )
+        await db.commit()
+
+    async def _process(self, post_ids):
+        async with self.session_factory() as db:
+            await self._set_status(
+                db,
+                post_ids,
+                status=IndexJob.RUNNING,
+                attempts=IndexJob.attempts + 1,
+            )
+            rows = (
+                await db.execute(select(*POST_COLUMNS).where(BlogPost.id.in_(post_ids)))
+            ).all()
+            posts = [row._asdict() for row in rows]
+
+            missing = set(post_ids) - {post["id"] for post in posts}
+            if missing:
+                await self._set_status(
+                    db,
+                    list(missing),
+                    status=IndexJob.FAILED,
+                    last_error="Post not found",
+                )
+
+            if not posts:
+                return
+            found = [post["id"] for post in posts]
+            try:
+                await asyncio.to_thread(self.index_fn, posts)
+            except Exception as e:
+                await self._handle_failure(db, found, str(e))
+                return
+
+            await self._set_status(db, found, status=IndexJob.DONE, last_error=None)
+
+        for listener in self._listeners:
+            try:
+                await asyncio.to_thread(listener, posts)
+            except Exception as e:
+                print(f"Indexing listener failed for posts {found}: {e}")
+
+    async def _handle_failure(self, db, post_ids, error):
+        jobs = (
+            await db.scalars(select(IndexJob).where(IndexJob.post_id.in_(post_ids)))
+        ).all()
+        for job in jobs:
+            job.last_error = error
+            if job.attempts >= self.max_retries:
+                job.status = IndexJob.FAILED
+                continue
+            job.status = IndexJob.PENDING
+            delay = min(self.backoff * 2 ** (job.attempts - 1), self.max_backoff)
+            self._schedule_retry(job.post_id, delay)
+        await db.commit()
+        print(f"Indexing failed for posts {post_ids}: {error}")
+
+    def _schedule_retry(self, post_id, delay):
+        def retry():
+            self._retry_handles.discard(handle)
+            self.enqueue(post_id)
+
+        handle = self._loop.call_later(delay, retry)
+        self._retry_handles.add(handle)
+
+
+async def get_index_status(db, post_id: int):
+    """Fetch the indexing job of a post"""
+    return await db.get(IndexJob, post_id)
+
+
+embedding_worker = EmbeddingWorker(
+    workers=settings.INDEX_WORKERS,
+    batch_size=settings.INDEX_BATCH_SIZE,
+    batch_window=settings.INDEX_BATCH_WINDOW_SECONDS,
+    max_retries=settings.INDEX_MAX_RETRIES,
+    backoff=settings.INDEX_RETRY_BACKOFF_SECONDS,
+)
@@ -0,0 +1,98 @@
+"""
+Cold-start time and peak RSS of the AI services, shared vs separate providers.
+
+    python -m benchmarks.ai_footprint
+
+Each scenario runs in a fresh interpreter, builds its clients and models,
+embeds one query (models load lazily) and reports the wall time since start
+and the peak resident set size:
+
+    separate  the previous wiring: three Qdrant clients, a fastembed model
+              loaded through `client.set_model` for NeuralSearcher, another
+              for indexing, and a HuggingFaceEmbeddings torch copy of the same
+              MiniLM model for the chat retriever
+    shared    the provider registry: one client and one fastembed model
+"""
+
+import sys
+import time
+import json
+import resource
+import argparse
+import subprocess
+
+START = time.perf_counter()
+
+
+def separate():
+    from fastembed import TextEmbedding
+    from qdrant_client import QdrantClient
+    from langchain_huggingface import HuggingFaceEmbeddings
+    from api.ai_core.config import QDRANT_URL, QDRANT_API_KEY, EMBEDDINGS_MODEL
+
+    neural = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY, prefer_grpc=True)
+    neural.set_model(EMBEDDINGS_MODEL)
+    QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY, prefer_grpc=True)
+    QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
+    indexing = TextEmbedding(model_name=EMBEDDINGS_MODEL)
+    chat = HuggingFaceEmbeddings(model_name=EMBEDDINGS_MODEL)
+
+    list(neural._get_or_init_model(EMBEDDINGS_MODEL).query_embed(["warm up"]))
+    list(indexing.passage_embed(["warm up"]))
+    chat.embed_query("warm up")
+
+
+def shared():
+    from api.ai_core.providers import get_embedding_model, get_qdrant_client
+
+    get_qdrant_client()
+    model = get_embedding_model()
+    list(model.query_embed(["warm up"]))
+    list(model.passage_embed(["warm up"]))
+
+
+SCENARIOS = {"separate": separate, "shared": shared}
+
+
+def measure(name):
+    """Run a scenario in this process and print its measurements as JSON"""
+    SCENARIOS[name]()
+    print(
+        json.dumps(
+            {
+                "seconds": time.perf_counter() - START,
+                # ru_maxrss is in KiB on Linux
+                "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            }
+        )
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.scenario:
+        measure(args.scenario)
+        return
+
+    print(f"{'scenario':>9} {'cold start s':>13} {'peak RSS MB':>12}")
+    for name in SCENARIOS:
+        runs = []
+        for _ in range(args.runs):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.ai_footprint", "--scenario", name],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            runs.append(json.loads(output.strip().splitlines()[-1]))
+        seconds = min(run["seconds"] for run in runs)
+        rss = min(run["rss_mb"] for run in runs)
+        print(f"{name:>9} {seconds:>13.2f} {rss:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Per-turn overhead of the chat pipeline: chain per session vs one shared pipeline.
+
+    python -m benchmarks.chat_pipeline --sessions 200 --turns 3
+
+Replays `--turns` messages for each of `--sessions` sessions with an instant
+fake LLM and retriever, so only object construction and chain plumbing are
+timed. The legacy path builds a retriever every turn and, on the first turn
+of a session, a ConversationalRetrievalChain with its memory that stays
+alive like the old `user_chains` dict; the shared path calls one
+ChatPipeline with the session history as input. Reports the time of a
+session's first and later turns, and the memory held per session.
+"""
+
+import time
+import argparse
+import tracemalloc
+from typing import List
+from langchain.chains import ConversationalRetrievalChain
+from langchain.memory import ConversationBufferMemory
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.chat_history import InMemoryChatMessageHistory
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
+from langchain_core.retrievers import BaseRetriever
+from api.ai_core.chat_pipeline import ChatPipeline
+
+ANSWER_PROMPT = ChatPromptTemplate.from_template(
+    "{chat_history}\n<context>{context}</context>\nUser message: {question}"
+)
+STANDALONE_PROMPT = PromptTemplate.from_template(
+    "Chat History:\n{chat_history}\nFollow Up Input: {question}\nStandalone question:"
+)
+
+
+def retrieve(query, article_id):
+    return [Document(page_content=f"Chunk {i} of {article_id}") for i in range(4)]
+
+
+class ArticleRetriever(BaseRetriever):
+    article_id: int
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return retrieve(query, self.article_id)
+
+
+class LegacyChat:
+    """A ConversationalRetrievalChain per session, as `user_chains` held them"""
+
+    def __init__(self, llm):
+        self.llm = llm
+        self.chains = {}
+        self.histories = {}
+
+    def turn(self, session, question):
+        # As ChatbotService.chat did: a new retriever every turn
+        retriever = ArticleRetriever(article_id=session)
+        if session not in self.chains:
+            self.histories[session] = InMemoryChatMessageHistory()
+            self.chains[session] = ConversationalRetrievalChain.from_llm(
+                condense_question_prompt=STANDALONE_PROMPT,
+                combine_docs_chain_kwargs={"prompt": ANSWER_PROMPT},
+                condense_question_llm=self.llm,
+                memory=ConversationBufferMemory(
+                    chat_memory=self.histories[session],
+                    return_messages=True,
+                    memory_key="chat_history",
+                    output_key="answer",
+                    input_key="question",
+                ),
+                retriever=retriever,
+                llm=self.llm,
+                chain_type="stuff",
+                return_source_documents=True,
+            )
+        self.chains[session].invoke({"question": question})
+
+
+class SharedChat:
+    """One ChatPipeline, the session history passed in every call"""
+
+    def __init__(self, llm):
+        self.pipeline = ChatPipeline(
+            llm, ANSWER_PROMPT, retrieve, standalone_question_prompt=STANDALONE_PROMPT
+        )
+        self.histories = {}
+
+    def turn(self, session, question):
+        history = self.histories.setdefault(session, InMemoryChatMessageHistory())
+        self.pipeline.invoke(question, session, history)
+
+
+def replay(chat, sessions, turns):
+    """Seconds per turn of the first turn of each session and of the others"""
+    seconds = []
+    for turn in range(turns):
+        start = time.perf_counter()
+        for session in range(sessions):
+            chat.turn(session, f"Question {turn}")
+        seconds.append((time.perf_counter() - start) / sessions)
+    later = sum(seconds[1:]) / (turns - 1) if turns > 1 else 0.0
+    return seconds[0], later
+
+
+def memory_per_session(chat_class, llm, sessions):
+    tracemalloc.start()
+    chat = chat_class(llm)
+    for session in range(sessions):
+        chat.turn(session, "Question")
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held / sessions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=3)
+    args = parser.parse_args()
+
+    llm = FakeListChatModel(responses=["An answer"])
+    print(f"{args.sessions} sessions x {args.turns} turns")
+    print(f"{'pipeline':>10} {'first us':>10} {'later us':>10} {'KiB/session':>12}")
+    for name, chat_class in (("legacy", LegacyChat), ("shared", SharedChat)):
+        first, later = replay(chat_class(llm), args.sessions, args.turns)
+        held = memory_per_session(chat_class, llm, args.sessions)
+        print(
+            f"{name:>10} {first * 1e6:>10.0f} {later * 1e6:>10.0f} "
+            f"{held / 1024:>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
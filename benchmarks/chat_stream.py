@@ -0,0 +1,79 @@
+"""
+Time to first token of the streamed /ask answers, with a local fake LLM.
+
+    python -m benchmarks.chat_stream --tokens 200 --token-ms 15 --retrieval-ms 80
+
+Runs `ChatPipeline.stream` with a fake retriever and a fake chat model that emits
+one token every `--token-ms` milliseconds, and reports when the retrieval,
+first_token and done events arrive: the blocking /ask endpoint only replies
+at "done", the streamed one starts rendering at "first_token".
+"""
+
+import time
+import argparse
+import numpy as np
+from langchain_core.chat_history import InMemoryChatMessageHistory
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.prompts import ChatPromptTemplate
+from api.ai_core.chat_pipeline import ChatPipeline
+
+ANSWER_PROMPT = ChatPromptTemplate.from_template(
+    "{chat_history}\n<context>{context}</context>\nUser message: {question}"
+)
+
+
+def fake_retriever(delay):
+    def retrieve(query, article_id):
+        time.sleep(delay)
+        return [Document(page_content=f"Chunk {i} about {query}") for i in range(4)]
+
+    return retrieve
+
+
+def fake_llm(tokens, delay):
+    def messages():
+        while True:
+            yield AIMessage(content=" ".join(["token"] * tokens))
+
+    class SlowFakeChatModel(GenericFakeChatModel):
+        def _stream(self, *args, **kwargs):
+            for chunk in super()._stream(*args, **kwargs):
+                time.sleep(delay)
+                yield chunk
+
+    return SlowFakeChatModel(messages=messages())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--token-ms", type=float, default=15)
+    parser.add_argument("--retrieval-ms", type=float, default=80)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    pipeline = ChatPipeline(
+        fake_llm(args.tokens, args.token_ms / 1000),
+        ANSWER_PROMPT,
+        fake_retriever(args.retrieval_ms / 1000),
+    )
+    timings = {"retrieval": [], "first_token": [], "done": []}
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        for event, _ in pipeline.stream(
+            "How are vectors indexed?", 1, InMemoryChatMessageHistory()
+        ):
+            if event in timings:
+                timings[event].append(time.perf_counter() - start)
+
+    print(f"{args.runs} runs, {args.tokens} tokens at {args.token_ms} ms each")
+    print(f"{'event':>12} {'p50 ms':>8} {'max ms':>8}")
+    for event, seconds in timings.items():
+        seconds = np.array(seconds) * 1000
+        print(f"{event:>12} {np.percentile(seconds, 50):>8.1f} {seconds.max():>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Cost of highlighting text search results: per-word re.sub vs one pass.
+
+    python -m benchmarks.highlight --hits 500 --words 12
+
+Highlights `--hits` synthetic chunks of about 1000 characters for queries of
+growing length and reports the time per result set and the response size of
+the legacy highlighter (one regex compiled and substituted per query word)
+against the single-pass highlighter with and without snippet windows.
+"""
+
+import re
+import time
+import random
+import argparse
+from api.ai_core.highlight import highlight
+
+VOCABULARY = (
+    "vector search index quantization payload filter embedding collection "
+    "posts query recall latency memory chunk model qdrant sparse dense "
+    "fusion ranking cache batch shard replica segment storage"
+).split()
+
+
+def legacy_highlight(text, query):
+    for word in query.lower().split():
+        if len(word) > 4:
+            pattern = re.compile(rf"(\b{re.escape(word)}?.?\b)", flags=re.IGNORECASE)
+        else:
+            pattern = re.compile(rf"(\b{re.escape(word)}\b)", flags=re.IGNORECASE)
+        text = re.sub(pattern, r"<b>\1</b>", text)
+    return text
+
+
+def make_chunks(hits, seed=0):
+    rng = random.Random(seed)
+    chunks = []
+    for _ in range(hits):
+        words = []
+        while sum(len(word) + 1 for word in words) < 1000:
+            words.append(rng.choice(VOCABULARY))
+        chunks.append(" ".join(words))
+    return chunks
+
+
+def run(name, fn, chunks, query, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        output = [fn(chunk, query) for chunk in chunks]
+    elapsed = (time.perf_counter() - start) / repeats
+    size = sum(len(text) for text in output)
+    print(f"{name:>14} {elapsed * 1000:>10.2f} {size / 1024:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--hits", type=int, default=500)
+    parser.add_argument("--words", type=int, default=12)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    chunks = make_chunks(args.hits)
+    highlighters = {
+        "legacy": legacy_highlight,
+        "single-pass": lambda text, q: highlight(text, q, snippet_chars=0),
+        "snippets": lambda text, q: highlight(text, q),
+    }
+
+    for words in sorted({1, 4, args.words}):
+        query = " ".join(VOCABULARY[:words])
+        print(f"\n{args.hits} hits, {words}-word query")
+        print(f"{'highlighter':>14} {'ms/set':>10} {'KiB out':>10}")
+        for name, fn in highlighters.items():
+            run(name, fn, chunks, query, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Query embedding throughput versus concurrency, with and without micro-batching.
+
+    python -m benchmarks.query_batching
+    python -m benchmarks.query_batching --synthetic --concurrency 1 8 64
+
+Each of N client threads embeds queries back to back, either calling the
+model directly (one forward pass per query) or through a BatchingEmbedder.
+--synthetic replaces the model with a serialized sleep of a fixed per-call
+overhead plus a small per-item cost, which is how ONNX/torch batch inference
+scales, and lets the benchmark run without downloading the model.
+"""
+
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from api.ai_core.embedding_service import BatchingEmbedder, embed_queries
+
+
+def synthetic_model(call_ms, item_ms):
+    # One inference engine: concurrent calls queue for it like they do for the
+    # CPU cores an ONNX session already spreads a single call over
+    engine = threading.Lock()
+
+    def embed(texts):
+        with engine:
+            time.sleep((call_ms + item_ms * len(texts)) / 1000)
+        return [[float(len(text))] for text in texts]
+
+    return embed
+
+
+def run(embed_one, concurrency, seconds):
+    """Queries per second and mean latency of `concurrency` threads embedding for `seconds`"""
+    stop = time.perf_counter() + seconds
+    latencies = []
+    lock = threading.Lock()
+
+    def client(worker):
+        own = []
+        i = 0
+        while time.perf_counter() < stop:
+            start = time.perf_counter()
+            embed_one(f"query {worker} {i}")
+            own.append(time.perf_counter() - start)
+            i += 1
+        with lock:
+            latencies.extend(own)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return len(latencies) / elapsed, 1000 * sum(latencies) / len(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--synthetic", action="store_true")
+    parser.add_argument("--call-ms", type=float, default=4.0)
+    parser.add_argument("--item-ms", type=float, default=0.2)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--max-latency-ms", type=float, default=5.0)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    parser.add_argument(
+        "--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64]
+    )
+    args = parser.parse_args()
+
+    embed_fn = (
+        synthetic_model(args.call_ms, args.item_ms) if args.synthetic else embed_queries
+    )
+    embedder = BatchingEmbedder(
+        embed_fn,
+        max_batch_size=args.batch_size,
+        max_latency=args.max_latency_ms / 1000,
+    )
+    # Load the model before timing anything
+    embed_fn(["warm up"])
+
+    print(
+        f"{'threads':>7} {'direct q/s':>11} {'batched q/s':>12} "
+        f"{'direct ms':>10} {'batched ms':>11} {'mean batch':>11}"
+    )
+    for concurrency in args.concurrency:
+        direct_qps, direct_ms = run(
+            lambda text: embed_fn([text]), concurrency, args.seconds
+        )
+        before = embedder.stats()
+        batched_qps, batched_ms = run(embedder.embed, concurrency, args.seconds)
+        after = embedder.stats()
+        batches = after["batches"] - before["batches"]
+        mean_batch = (after["items"] - before["items"]) / batches if batches else 0
+        print(
+            f"{concurrency:>7} {direct_qps:>11.0f} {batched_qps:>12.0f} "
+            f"{direct_ms:>10.2f} {batched_ms:>11.2f} {mean_batch:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
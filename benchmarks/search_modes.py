@@ -0,0 +1,84 @@
+"""
+Relevance and latency of the /ai-search modes: neural, text and hybrid.
+
+    python -m benchmarks.search_modes --sample 200
+    python -m benchmarks.search_modes --queries labeled.jsonl
+
+Runs every query through each mode against the live collection and reports
+hit@k and MRR (the expected post among the returned chunks) with p50/p99
+latency. Without a labeled file (one {"query": ..., "post_id": ...} per line)
+the queries are the titles of sampled posts, each expected to find its own post.
+"""
+
+import json
+import time
+import random
+import argparse
+import numpy as np
+from api.ai_core.config import COLLECTION_NAME
+from api.ai_core.hybrid_search import HybridSearcher
+from api.ai_core.postsearch import NeuralSearcher, TextSearcher
+from api.db.database import SessionLocal
+from api.v1.models.blog import BlogPost
+
+
+def title_queries(sample, seed=0):
+    db = SessionLocal()
+    try:
+        posts = db.query(BlogPost.id, BlogPost.title).all()
+    finally:
+        db.close()
+    random.Random(seed).shuffle(posts)
+    return [{"query": post.title, "post_id": post.id} for post in posts[:sample]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--queries", help="JSONL file of labeled queries")
+    parser.add_argument("--sample", type=int, default=100)
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.queries:
+        with open(args.queries) as f:
+            queries = [json.loads(line) for line in f if line.strip()]
+    else:
+        queries = title_queries(args.sample)
+
+    neural = NeuralSearcher(COLLECTION_NAME)
+    text = TextSearcher(COLLECTION_NAME)
+    hybrid = HybridSearcher(COLLECTION_NAME)
+    modes = {
+        "neural": lambda q: neural.search(q),
+        "text": lambda q: text.search(q, top=args.k),
+        "hybrid-rrf": lambda q: hybrid.search(q, fusion="rrf"),
+        "hybrid-dbsf": lambda q: hybrid.search(q, fusion="dbsf"),
+    }
+
+    print(f"{len(queries)} queries against {COLLECTION_NAME}")
+    print(
+        f"{'mode':>12} {'hit@' + str(args.k):>7} {'MRR':>6} {'p50 ms':>8} {'p99 ms':>8}"
+    )
+    for name, search in modes.items():
+        # Warm up caches and connections outside the measurement
+        search(queries[0]["query"])
+        hits, reciprocal_ranks, latencies = 0, [], []
+        for item in queries:
+            start = time.perf_counter()
+            results = search(item["query"])[: args.k]
+            latencies.append((time.perf_counter() - start) * 1000)
+            ranked = [result["original_id"] for result in results]
+            if item["post_id"] in ranked:
+                hits += 1
+                reciprocal_ranks.append(1 / (ranked.index(item["post_id"]) + 1))
+            else:
+                reciprocal_ranks.append(0.0)
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(
+            f"{name:>12} {hits / len(queries):>7.3f} {np.mean(reciprocal_ranks):>6.3f} "
+            f"{p50:>8.2f} {p99:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Recall@k and latency of the search profiles on a synthetic corpus.
+
+    python -m benchmarks.search_profiles --points 20000 --quantization binary
+    python -m benchmarks.search_profiles --url http://localhost:6333
+
+Runs against Qdrant local mode by default. Local mode always does an exact
+brute-force scan (no HNSW graph, no quantized index), so it checks that every
+profile runs end to end but shows no recall/latency trade-off; point --url at
+a server to measure the real one. Recall is measured against an exact search
+over the original vectors.
+"""
+
+import time
+import argparse
+import numpy as np
+from qdrant_client import QdrantClient, models
+from api.ai_core.search_profiles import (
+    SEARCH_PROFILES,
+    QUANTIZATION_TYPES,
+    quantization_config,
+)
+
+COLLECTION = "benchmark-search-profiles"
+VECTOR_NAME = "dense"
+UPSERT_BATCH_SIZE = 1000
+
+
+def synthetic_corpus(points, dim, clusters, seed=0):
+    """Unit vectors drawn around random centroids, like topic-clustered chunks"""
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(clusters, dim))
+    vectors = centroids[rng.integers(clusters, size=points)]
+    vectors = vectors + rng.normal(scale=0.6, size=(points, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def load_corpus(client, vectors, quantization):
+    if client.collection_exists(COLLECTION):
+        client.delete_collection(COLLECTION)
+    client.create_collection(
+        collection_name=COLLECTION,
+        vectors_config={
+            VECTOR_NAME: models.VectorParams(
+                size=vectors.shape[1], distance=models.Distance.COSINE
+            )
+        },
+        quantization_config=quantization_config(quantization),
+    )
+    for start in range(0, len(vectors), UPSERT_BATCH_SIZE):
+        batch = vectors[start : start + UPSERT_BATCH_SIZE]
+        client.upsert(
+            collection_name=COLLECTION,
+            points=models.Batch(
+                ids=list(range(start, start + len(batch))),
+                vectors={VECTOR_NAME: batch.tolist()},
+            ),
+            wait=True,
+        )
+
+
+def search(client, query, k, params):
+    start = time.perf_counter()
+    points = client.query_points(
+        collection_name=COLLECTION,
+        query=query.tolist(),
+        using=VECTOR_NAME,
+        limit=k,
+        search_params=params,
+        with_payload=False,
+    ).points
+    return [point.id for point in points], time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--url", help="Qdrant server URL (default: local mode)")
+    parser.add_argument("--points", type=int, default=10000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--quantization", choices=QUANTIZATION_TYPES, default="scalar")
+    args = parser.parse_args()
+
+    client = QdrantClient(url=args.url) if args.url else QdrantClient(":memory:")
+    corpus = synthetic_corpus(args.points + args.queries, args.dim, args.clusters)
+    queries, vectors = corpus[: args.queries], corpus[args.queries :]
+
+    start = time.perf_counter()
+    load_corpus(client, vectors, args.quantization)
+    print(
+        f"Loaded {args.points} x {args.dim} vectors ({args.quantization} "
+        f"quantization) in {time.perf_counter() - start:.1f}s "
+        f"{'on ' + args.url if args.url else 'in local mode'}"
+    )
+
+    ground_truth = models.SearchParams(
+        exact=True, quantization=models.QuantizationSearchParams(ignore=True)
+    )
+    truth = [set(search(client, q, args.k, ground_truth)[0]) for q in queries]
+
+    print(f"{'profile':>10} {'recall@' + str(args.k):>10} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, params in SEARCH_PROFILES.items():
+        recalls, latencies = [], []
+        for query, expected in zip(queries, truth):
+            ids, seconds = search(client, query, args.k, params)
+            recalls.append(len(expected.intersection(ids)) / args.k)
+            latencies.append(seconds * 1000)
+        p50, p99 = np.percentile(latencies, [50, 99])
+        print(f"{name:>10} {np.mean(recalls):>10.3f} {p50:>8.2f} {p99:>8.2f}")
+
+    client.delete_collection(COLLECTION)
+
+
+if __name__ == "__main__":
+    main()
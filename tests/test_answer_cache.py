@@ -0,0 +1,68 @@
+# backend/tests/test_answer_cache.py
+
+from api.ai_core import answer_cache
+from api.ai_core.answer_cache import SemanticAnswerCache
+
+
+def test_similar_questions_hit_per_article():
+    cache = SemanticAnswerCache(threshold=0.95, max_articles=10, max_per_article=10)
+    cache.set(1, "What is the main takeaway?", [1.0, 0.0, 0.1], "Use HNSW")
+
+    answer, similarity = cache.get(1, [2.0, 0.0, 0.25])
+    assert answer == "Use HNSW" and similarity > 0.95
+    assert cache.get(1, [0.0, 1.0, 0.0]) is None
+    assert cache.get(2, [1.0, 0.0, 0.1]) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_bounds_and_invalidation():
+    cache = SemanticAnswerCache(threshold=0.99, max_articles=2, max_per_article=2)
+    cache.set(1, "a", [1.0, 0.0], "A")
+    cache.set(1, "b", [0.0, 1.0], "B")
+    cache.set(1, "c", [-1.0, 0.0], "C")
+    # The oldest answer of an article is dropped
+    assert cache.get(1, [1.0, 0.0]) is None
+    assert cache.get(1, [-1.0, 0.0])[0] == "C"
+
+    cache.set(2, "a", [1.0, 0.0], "A2")
+    cache.get(1, [0.0, 1.0])
+    cache.set(3, "a", [1.0, 0.0], "A3")
+    # Article 2 was the least recently used
+    assert cache.get(2, [1.0, 0.0]) is None
+    assert cache.stats()["articles"] == 2
+
+    cache.invalidate(1)
+    assert cache.get(1, [0.0, 1.0]) is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_answers_go_stale_with_the_article_version():
+    versions = {1: ("blogposts_v1", "0")}
+    cache = SemanticAnswerCache(threshold=0.99, article_version=versions.__getitem__)
+    cache.set(1, "a", [1.0, 0.0], "A", cache.version(1))
+    assert cache.get(1, [1.0, 0.0], cache.version(1))[0] == "A"
+
+    # Another process reindexed the article (or the collection was rebuilt)
+    versions[1] = ("blogposts_v1", "1")
+    assert cache.get(1, [1.0, 0.0], cache.version(1)) is None
+    assert cache.stats()["articles"] == 0
+
+    # Without a version (Redis down) nothing is served or stored
+    assert cache.version(2) is None and cache.stats()["errors"] == 1
+    cache.set(2, "a", [1.0, 0.0], "A", None)
+    assert cache.get(2, [1.0, 0.0], None) is None
+
+
+def test_unused_articles_expire(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(answer_cache.time, "monotonic", lambda: now[0])
+    cache = SemanticAnswerCache(threshold=0.99, ttl=60)
+    cache.set(1, "a", [1.0, 0.0], "A")
+
+    now[0] += 50
+    assert cache.get(1, [1.0, 0.0])[0] == "A"
+    # The hit refreshed the entry
+    now[0] += 50
+    assert cache.get(1, [1.0, 0.0])[0] == "A"
+    now[0] += 61
+    assert cache.get(1, [1.0, 0.0]) is None
@@ -0,0 +1,93 @@
+# backend/tests/test_batch_search.py
+
+import pytest
+from qdrant_client import QdrantClient, models
+
+from api.ai_core import batch_search
+from api.ai_core.batch_search import BatchSearcher
+from api.ai_core.config import VECTOR_NAME
+from api.ai_core.query_cache import QueryVectorCache
+
+COLLECTION = "batch"
+TOPICS = ["kubernetes", "sourdough", "hiking"]
+
+
+def topic_vector(text):
+    return [1.0 if topic in text.lower() else 0.01 for topic in TOPICS]
+
+
+class FakeEmbedder:
+    model_name = "fake"
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_many(self, texts):
+        self.batches.append(list(texts))
+        return [topic_vector(text) for text in texts]
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(batch_search, "query_vector_cache", QueryVectorCache())
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        COLLECTION,
+        vectors_config={
+            VECTOR_NAME: models.VectorParams(size=3, distance=models.Distance.COSINE)
+        },
+    )
+    client.upsert(
+        COLLECTION,
+        points=[
+            models.PointStruct(
+                id=i,
+                vector={VECTOR_NAME: topic_vector(f"{topic} post")},
+                payload={
+                    "document": f"{topic} post {i}",
+                    "original_id": i,
+                    "category": "ops" if topic == "kubernetes" else "life",
+                },
+            )
+            for i, topic in enumerate(TOPICS * 3)
+        ],
+    )
+    return client
+
+
+def test_batch_search_embeds_once_and_keeps_request_order(client):
+    embedder = FakeEmbedder()
+    searcher = BatchSearcher(COLLECTION, client=client, embedder=embedder)
+
+    results = searcher.search(
+        [
+            {"text": "Hiking", "limit": 2},
+            {"text": "sourdough", "limit": 3},
+            {"text": "hiking  "},
+            {"text": "kubernetes", "filter_": {"must": []}, "limit": 1},
+        ]
+    )
+
+    # The two hiking queries normalize alike and are embedded once
+    assert embedder.batches == [["Hiking", "sourdough", "kubernetes"]]
+    assert [len(result) for result in results] == [2, 3, 5, 1]
+    assert {hit["original_id"] % 3 for hit in results[0]} == {2}
+    assert {hit["original_id"] % 3 for hit in results[1]} == {1}
+    assert results[3][0]["original_id"] % 3 == 0
+    assert "document" not in results[0][0]
+
+    searcher.search([{"text": "sourdough"}])
+    assert len(embedder.batches) == 1
+
+
+def test_batch_search_applies_per_query_filters(client):
+    searcher = BatchSearcher(COLLECTION, client=client, embedder=FakeEmbedder())
+    ops_only = {"must": [{"key": "category", "match": {"value": "ops"}}]}
+
+    results = searcher.search(
+        [{"text": "hiking", "filter_": ops_only, "limit": 9}, {"text": "hiking"}]
+    )
+
+    assert {hit["category"] for hit in results[0]} == {"ops"}
+    assert len(results[0]) == 3
+    assert searcher.search([]) == []
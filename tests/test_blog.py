@@ -1,10 +1,66 @@
 # backend/tests/test_blog_service.py
 
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock, patch
 
+import pytest
+import pytest_asyncio
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.db.database import Base
 from api.v1.models.blog import BlogPost
 from api.v1.schemas.blog_schema import BlogPostCreate
-from api.v1.services.blog_service import get_post_by_id, get_all_posts, create_blog_post
+from api.v1.services.blog_service import (
+    get_post_by_id,
+    get_all_posts,
+    create_blog_post,
+    create_blog_post_async,
+    create_blog_posts_bulk_async,
+    decode_cursor,
+    get_all_posts_async,
+    get_post_by_id_async,
+)
+
+
+def make_post(post_id, date):
+    return BlogPost(
+        id=post_id,
+        title=f"Post {post_id}",
+        content=f"Content {post_id}",
+        date=date,
+        description="A short summary of the post.",
+        author="John Doe",
+        published="true",
+        readTime="5 min",
+        slug=f"post-{post_id}",
+        category="Technology",
+        image="https://example.com/image.jpg",
+    )
+
+
+@pytest.fixture
+def sqlite_session_local():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def async_session():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(bind=engine, expire_on_commit=False)() as db:
+        yield db
+    await engine.dispose()
 
 
 def test_get_post_by_id_returns_post():
@@ -34,18 +90,53 @@ def test_get_all_posts_returns_list():
     with patch("api.v1.services.blog_service.SessionLocal") as mock_session_local:
         mock_db = MagicMock()
         mock_query = MagicMock()
-        mock_order_by = MagicMock()
 
-        # Chain the mock: query().order_by().all() => mock_posts
-        mock_order_by.all.return_value = mock_posts
-        mock_query.order_by.return_value = mock_order_by
+        # Chain the mock: query().options().order_by().limit().all() => mock_posts
+        mock_query.options.return_value.order_by.return_value.limit.return_value.all.return_value = (
+            mock_posts
+        )
         mock_db.query.return_value = mock_query
         mock_session_local.return_value = mock_db
 
         result = get_all_posts()
 
-        assert len(result) == 2
-        assert result[0].title == "Post 1"
+        assert len(result["items"]) == 2
+        assert result["items"][0].title == "Post 1"
+        assert result["next_cursor"] is None
+
+
+def test_get_all_posts_paginates_by_date_and_id(sqlite_session_local):
+    base = datetime(2025, 1, 1)
+    db = sqlite_session_local()
+    # Posts 3 and 4 share a timestamp, so the id breaks the tie
+    db.add_all(
+        [
+            make_post(1, base),
+            make_post(2, base + timedelta(days=1)),
+            make_post(3, base + timedelta(days=2)),
+            make_post(4, base + timedelta(days=2)),
+            make_post(5, base + timedelta(days=3)),
+        ]
+    )
+    db.commit()
+    db.close()
+
+    with patch("api.v1.services.blog_service.SessionLocal", sqlite_session_local):
+        seen = []
+        cursor = None
+        while True:
+            page = get_all_posts(limit=2, after=cursor)
+            seen.extend(post.id for post in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+    assert seen == [5, 4, 3, 2, 1]
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
 
 
 def test_create_blog_post():
@@ -88,3 +179,97 @@ def test_create_blog_post():
 
         assert result.title == "New Blog"
         assert result.content == "New Content"
+
+
+@pytest.mark.asyncio
+async def test_async_create_then_read(async_session):
+    blog_data = BlogPostCreate(
+        title="Async Blog",
+        content="Async Content",
+        description="A short summary of the post.",
+        author="John Doe",
+        published="true",
+        readTime="5 min",
+        slug="async-blog",
+        category="Technology",
+        image="https://example.com/image.jpg",
+    )
+
+    with patch("api.v1.services.blog_service.embedding_worker") as worker:
+        new_post = await create_blog_post_async(async_session, blog_data)
+        worker.enqueue.assert_called_once_with(new_post.id)
+
+    post = await get_post_by_id_async(async_session, new_post.id)
+    assert post.title == "Async Blog"
+
+    page = await get_all_posts_async(async_session, limit=10)
+    assert [item.id for item in page["items"]] == [new_post.id]
+    assert page["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_per_item_status(async_session):
+    valid = BlogPostCreate(
+        title="Bulk Blog",
+        content="Bulk Content",
+        description="A short summary of the post.",
+        author="John Doe",
+        published="true",
+        readTime="5 min",
+        slug="bulk-blog",
+        category="Technology",
+        image="https://example.com/image.jpg",
+    )
+    items = [
+        valid.model_dump(),
+        {"title": "Missing fields"},
+        valid.model_dump_json(),
+        "{not json",
+    ]
+
+    with patch("api.v1.services.blog_service.embedding_worker") as worker:
+        result = await create_blog_posts_bulk_async(async_session, items)
+
+    statuses = [item["status"] for item in result["items"]]
+    assert statuses == ["created", "invalid", "created", "invalid"]
+    assert result["created"] == 2
+    assert result["failed"] == 2
+    assert result["queued"] == 2
+
+    created_ids = [item["id"] for item in result["items"] if item.get("id")]
+    assert [c.args[0] for c in worker.enqueue.call_args_list] == created_ids
+    page = await get_all_posts_async(async_session, limit=10)
+    assert sorted(item.id for item in page["items"]) == sorted(created_ids)
+
+
+@pytest.mark.asyncio
+async def test_pagination_of_posts_created_in_the_same_second(async_session):
+    # No explicit date: stored by the column default, as /addposts does
+    items = [
+        {
+            "title": f"Post {i}",
+            "content": f"Content {i}",
+            "description": "A short summary of the post.",
+            "author": "John Doe",
+            "published": "true",
+            "readTime": "5 min",
+            "slug": f"post-{i}",
+            "category": "Technology",
+            "image": "https://example.com/image.jpg",
+        }
+        for i in range(5)
+    ]
+    with patch("api.v1.services.blog_service.embedding_worker"):
+        result = await create_blog_posts_bulk_async(async_session, items)
+    created = [item["id"] for item in result["items"]]
+
+    seen = []
+    cursor = None
+    for _ in range(10):
+        page = await get_all_posts_async(async_session, limit=2, after=cursor)
+        seen.extend(post.id for post in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(seen) == sorted(created) and len(seen) == 5
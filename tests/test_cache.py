@@ -0,0 +1,85 @@
+# backend/tests/test_cache.py
+
+from api.v1.services.cache_service import ReadCache, etag_matches
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_read_cache_hit_and_miss_counters():
+    cache = ReadCache(max_entries=4, max_bytes=1024, ttl=60)
+
+    assert cache.get("a") is None
+    stored = cache.set("a", b'{"id": 1}')
+
+    assert cache.get("a") == stored
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_read_cache_evicts_least_recently_used():
+    cache = ReadCache(max_entries=2, max_bytes=1024, ttl=60)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_read_cache_respects_memory_bound():
+    cache = ReadCache(max_entries=10, max_bytes=10, ttl=60)
+    cache.set("a", b"12345")
+    cache.set("b", b"12345")
+    cache.set("c", b"12345")
+
+    assert cache.stats()["bytes"] <= 10
+    assert cache.get("a") is None
+
+    # Bodies larger than the whole budget are never stored
+    cache.set("big", b"x" * 11)
+    assert cache.get("big") is None
+
+
+def test_read_cache_expires_entries():
+    clock = FakeClock()
+    cache = ReadCache(ttl=5, clock=clock)
+    cache.set("a", b"1")
+
+    clock.now = 4.9
+    assert cache.get("a") is not None
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_read_cache_skips_bodies_read_before_a_clear():
+    cache = ReadCache(ttl=60)
+    generation = cache.generation
+    # A write commits and clears the cache while the read is in flight
+    cache.clear()
+    served = cache.set("post", b"old", generation)
+
+    assert served.body == b"old"
+    assert cache.get("post") is None
+    assert cache.stats()["stale_sets"] == 1
+
+    cache.set("post", b"new", cache.generation)
+    assert cache.get("post").body == b"new"
+
+
+def test_etag_matches_if_none_match_lists():
+    etag = ReadCache.make_etag(b"body")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", W/{etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('"other"', etag)
+    assert not etag_matches(None, etag)
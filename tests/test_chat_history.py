@@ -0,0 +1,47 @@
+# backend/tests/test_chat_history.py
+
+import json
+
+from langchain_core.messages import AIMessage, HumanMessage, message_to_dict
+
+from api.ai_core.chat_history import SharedRedisChatMessageHistory
+
+
+class FakeRedis:
+    def __init__(self):
+        self.lists = {}
+        self.ttls = {}
+
+    def lrange(self, key, start, end):
+        return [item.encode() for item in self.lists.get(key, [])]
+
+    def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    def expire(self, key, ttl):
+        self.ttls[key] = ttl
+
+    def delete(self, key):
+        self.lists.pop(key, None)
+
+
+def test_sessions_share_one_client_and_keep_the_redis_layout():
+    redis_client = FakeRedis()
+    history = SharedRedisChatMessageHistory("user:1", redis_client, ttl=60)
+    history.add_user_message("Main takeaway?")
+    history.add_ai_message("Use HNSW")
+
+    other = SharedRedisChatMessageHistory("user:2", redis_client)
+    assert other.messages == []
+    assert SharedRedisChatMessageHistory("user:1", redis_client).messages == [
+        HumanMessage("Main takeaway?"),
+        AIMessage("Use HNSW"),
+    ]
+    # Newest first under the same key as RedisChatMessageHistory
+    assert redis_client.lists["message_store:user:1"][0] == json.dumps(
+        message_to_dict(AIMessage("Use HNSW"))
+    )
+    assert redis_client.ttls == {"message_store:user:1": 60}
+
+    history.clear()
+    assert history.messages == []
@@ -0,0 +1,140 @@
+# backend/tests/test_chat_pipeline.py
+
+import json
+
+from langchain_core.chat_history import InMemoryChatMessageHistory
+from langchain_core.documents import Document
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.prompts import ChatPromptTemplate, PromptTemplate
+
+from api.ai_core.answer_cache import SemanticAnswerCache
+from api.ai_core.chat_pipeline import ChatPipeline
+from api.ai_core.chat_stream import sse_event
+
+ANSWER_PROMPT = ChatPromptTemplate.from_template(
+    "{chat_history}\n{context}\nQuestion: {question}"
+)
+STANDALONE_PROMPT = PromptTemplate.from_template("{chat_history}\n{question}")
+
+
+def make_retrieve(queries):
+    def retrieve(query, article_id):
+        queries.append((query, article_id))
+        return [Document(page_content=f"Article {article_id} is about Qdrant")]
+
+    return retrieve
+
+
+def test_stream_emits_events_and_saves_history_at_the_end():
+    history = InMemoryChatMessageHistory()
+    queries = []
+    pipeline = ChatPipeline(
+        FakeListChatModel(responses=["A vector db"]),
+        ANSWER_PROMPT,
+        make_retrieve(queries),
+    )
+
+    names = []
+    for name, data in pipeline.stream("What is Qdrant?", 7, history):
+        names.append(name)
+        if name == "token":
+            # Nothing is persisted while the answer is streaming
+            assert history.messages == []
+    assert names[:2] == ["retrieval", "first_token"]
+    assert names[-1] == "done" and names.count("token") == len("A vector db")
+    assert queries == [("What is Qdrant?", 7)]
+    assert [m.content for m in history.messages] == ["What is Qdrant?", "A vector db"]
+    assert data["chat_history"][1] == {"role": "assistant", "content": "A vector db"}
+
+
+def test_one_pipeline_serves_sessions_and_articles_per_call():
+    queries = []
+    pipeline = ChatPipeline(
+        FakeListChatModel(responses=["Yes", "Is Qdrant fast?", "Very"]),
+        ANSWER_PROMPT,
+        make_retrieve(queries),
+        standalone_question_prompt=STANDALONE_PROMPT,
+    )
+    first, second = InMemoryChatMessageHistory(), InMemoryChatMessageHistory()
+
+    result = pipeline.invoke("Is Qdrant a database?", 1, first)
+    assert result["answer"] == "Yes"
+    assert result["source_documents"][0].page_content == "Article 1 is about Qdrant"
+
+    # A follow-up is condensed into a standalone question before retrieval
+    result = pipeline.invoke("Is it fast?", 2, first)
+    assert queries[-1] == ("Is Qdrant fast?", 2)
+    assert result["answer"] == "Very"
+    assert [m["content"] for m in result["chat_history"]] == [
+        m.content for m in first.messages
+    ]
+    assert second.messages == []
+
+
+def test_stream_errors_are_events_and_nothing_is_saved():
+    history = InMemoryChatMessageHistory()
+
+    def failing(query, article_id):
+        raise ValueError("qdrant is down")
+
+    pipeline = ChatPipeline(FakeListChatModel(responses=["x"]), ANSWER_PROMPT, failing)
+    events = list(pipeline.stream("Again?", 1, history))
+
+    assert events == [("error", {"detail": "qdrant is down"})]
+    assert history.messages == []
+
+
+def test_sse_event_frame():
+    frame = sse_event("token", {"text": "hi"})
+
+    assert frame.startswith("event: token\ndata: ") and frame.endswith("\n\n")
+    assert json.loads(frame.split("data: ")[1]) == {"text": "hi"}
+
+
+def test_first_turn_answers_are_reused_for_similar_questions():
+    queries = []
+    llm = FakeListChatModel(responses=["Use HNSW", "Other"])
+    pipeline = ChatPipeline(
+        llm,
+        ANSWER_PROMPT,
+        make_retrieve(queries),
+        answer_cache=SemanticAnswerCache(threshold=0.9),
+        embed=lambda text: [1.0, 0.0] if "takeaway" in text else [0.0, 1.0],
+    )
+
+    first = pipeline.invoke("Main takeaway?", 1, InMemoryChatMessageHistory())
+    assert not first["cached"]
+
+    history = InMemoryChatMessageHistory()
+    events = list(pipeline.stream("The takeaway?", 1, history))
+    assert events[-1][1]["answer"] == "Use HNSW" and events[-1][1]["cached"]
+    assert len(queries) == 1 and llm.i == 1
+    assert [m.content for m in history.messages] == ["The takeaway?", "Use HNSW"]
+
+    # Follow-ups depend on the history and always go to the LLM
+    follow_up = pipeline.invoke("The takeaway?", 1, history)
+    assert not follow_up["cached"] and follow_up["answer"] == "Other"
+    # Other articles have their own answers
+    other = pipeline.invoke("Main takeaway?", 2, InMemoryChatMessageHistory())
+    assert not other["cached"]
+
+
+def test_cached_answers_follow_the_article_version():
+    versions = {1: 0}
+    llm = FakeListChatModel(responses=["Old", "New"])
+    pipeline = ChatPipeline(
+        llm,
+        ANSWER_PROMPT,
+        make_retrieve([]),
+        answer_cache=SemanticAnswerCache(
+            threshold=0.9, article_version=versions.__getitem__
+        ),
+        embed=lambda text: [1.0, 0.0],
+    )
+
+    pipeline.invoke("Main takeaway?", 1, InMemoryChatMessageHistory())
+    assert pipeline.invoke("Takeaway?", 1, InMemoryChatMessageHistory())["cached"]
+
+    versions[1] += 1
+    fresh = pipeline.invoke("Takeaway?", 1, InMemoryChatMessageHistory())
+    assert fresh["answer"] == "New" and not fresh["cached"]
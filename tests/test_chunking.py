@@ -0,0 +1,36 @@
+# backend/tests/test_chunking.py
+
+import uuid
+
+from api.ai_core.chunking import build_chunk_records, chunk_point_id
+
+
+def test_chunk_point_id_is_deterministic_uuid():
+    point_id = chunk_point_id(1, 0, "Some chunk")
+
+    assert point_id == chunk_point_id(1, 0, "Some chunk")
+    assert uuid.UUID(point_id).version == 5
+    assert point_id != chunk_point_id(2, 0, "Some chunk")
+    assert point_id != chunk_point_id(1, 1, "Some chunk")
+    assert point_id != chunk_point_id(1, 0, "Edited chunk")
+
+
+def test_build_chunk_records_is_idempotent():
+    content = "\n\n".join(f"Paragraph {i} " + "word " * 150 for i in range(4))
+
+    chunks, metadata, ids = build_chunk_records(7, "Title", content)
+
+    assert len(chunks) > 1
+    assert len(chunks) == len(metadata) == len(ids) == len(set(ids))
+    assert [m["chunk_index"] for m in metadata] == list(range(len(chunks)))
+    assert all(m["original_id"] == 7 for m in metadata)
+    assert build_chunk_records(7, "Title", content)[2] == ids
+
+
+def test_build_chunk_records_copies_filter_fields_to_every_chunk():
+    _, metadata, _ = build_chunk_records(
+        7, "Title", "word " * 500, category="Technology", author="Jane Doe"
+    )
+
+    assert all(m["category"] == "Technology" for m in metadata)
+    assert all(m["author"] == "Jane Doe" for m in metadata)
@@ -0,0 +1,108 @@
+# backend/tests/test_embedding_cache.py
+
+import os
+import fcntl
+import multiprocessing
+
+import numpy as np
+
+from api.ai_core import embedding_cache
+from api.ai_core.embedding_cache import EmbeddingCache
+
+
+def fake_embed(texts):
+    return [[float(len(text)), float(sum(map(ord, text)) % 97), 1.0] for text in texts]
+
+
+def test_embed_only_runs_model_on_misses(tmp_path):
+    calls = []
+
+    def embed_fn(texts):
+        calls.append(list(texts))
+        return fake_embed(texts)
+
+    cache = EmbeddingCache(str(tmp_path), "sentence-transformers/all-MiniLM-L6-v2")
+    first = cache.embed(["alpha", "beta"], embed_fn)
+    second = cache.embed(["beta", "gamma", "alpha"], embed_fn)
+
+    assert calls == [["alpha", "beta"], ["gamma"]]
+    assert second == [first[1], fake_embed(["gamma"])[0], first[0]]
+    assert cache.stats()["hits"] == 2
+
+
+def test_cache_persists_across_instances(tmp_path):
+    texts = [f"chunk {i}" for i in range(50)]
+    EmbeddingCache(str(tmp_path), "model").put_many(texts, fake_embed(texts))
+
+    reopened = EmbeddingCache(str(tmp_path), "model")
+    vectors = reopened.get_many(texts + ["unseen"])
+
+    assert len(reopened) == 50
+    assert vectors[-1] is None
+    np.testing.assert_allclose(np.stack(vectors[:-1]), fake_embed(texts))
+    # Caches are per model
+    assert len(EmbeddingCache(str(tmp_path), "other-model")) == 0
+
+
+def test_torn_append_is_dropped_on_load(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.put_many(["a", "b"], fake_embed(["a", "b"]))
+
+    # Simulate a crash after the vector was written but before its key
+    with open(cache.vectors_path, "ab") as f:
+        f.write(np.ones(3, dtype=np.float32).tobytes())
+
+    reopened = EmbeddingCache(str(tmp_path), "model")
+    assert len(reopened) == 2
+    assert os.path.getsize(reopened.vectors_path) == 2 * 3 * 4
+    assert reopened.get_many(["b"])[0] is not None
+
+    # The next append must not land after the torn row
+    reopened.put_many(["c"], fake_embed(["c"]))
+    fresh = EmbeddingCache(str(tmp_path), "model")
+    np.testing.assert_allclose(fresh.get_many(["c"])[0], fake_embed(["c"])[0])
+
+
+def _open_cache(directory, queue):
+    cache = EmbeddingCache(directory, "model")
+    queue.put((len(cache), os.path.getsize(cache.vectors_path)))
+
+
+def test_open_during_append_of_other_process_keeps_its_rows(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), "model")
+    cache.put_many(["a", "b"], fake_embed(["a", "b"]))
+
+    # Another writer is mid-append: its vector is written, its key is not yet
+    with open(cache.keys_path, "ab") as keys_file:
+        fcntl.flock(keys_file, fcntl.LOCK_EX)
+        with open(cache.vectors_path, "ab") as f:
+            f.write(np.asarray(fake_embed(["c"]), dtype=np.float32).tobytes())
+
+        queue = multiprocessing.get_context("fork").Queue()
+        process = multiprocessing.get_context("fork").Process(
+            target=_open_cache, args=(str(tmp_path), queue)
+        )
+        process.start()
+        rows, vectors_size = queue.get(timeout=10)
+        process.join()
+
+        keys_file.write(EmbeddingCache.key("c"))
+        keys_file.flush()
+        fcntl.flock(keys_file, fcntl.LOCK_UN)
+
+    assert rows == 2
+    assert vectors_size == 3 * 3 * 4
+    fresh = EmbeddingCache(str(tmp_path), "model")
+    assert len(fresh) == 3
+    np.testing.assert_allclose(fresh.get_many(["c"])[0], fake_embed(["c"])[0])
+
+
+def test_tail_entries_are_merged_into_sorted_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(embedding_cache, "MIN_TAIL_SIZE", 4)
+    cache = EmbeddingCache(str(tmp_path), "model")
+    texts = [f"chunk {i}" for i in range(20)]
+    for i in range(0, 20, 3):
+        cache.put_many(texts[i : i + 3], fake_embed(texts[i : i + 3]))
+
+    assert all(vector is not None for vector in cache.get_many(texts))
+    assert len(cache) == 20
@@ -0,0 +1,66 @@
+# backend/tests/test_embedding_service.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from api.ai_core.embedding_service import BatchedEmbeddings, BatchingEmbedder
+
+
+def test_concurrent_requests_share_one_batch():
+    calls = []
+
+    def embed(texts):
+        calls.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    embedder = BatchingEmbedder(embed, max_batch_size=8, max_latency=0.2)
+    texts = [f"query {'x' * i}" for i in range(5)]
+    with ThreadPoolExecutor(5) as pool:
+        vectors = list(pool.map(embedder.embed, texts))
+
+    assert vectors == [[float(len(text))] for text in texts]
+    assert len(calls) == 1 and sorted(calls[0]) == sorted(texts)
+    assert embedder.stats()["mean_batch_size"] == 5
+
+
+def test_batches_are_capped_and_errors_reach_every_waiter():
+    sizes = []
+
+    def embed(texts):
+        sizes.append(len(texts))
+        return [[0.0] for _ in texts]
+
+    embedder = BatchingEmbedder(embed, max_batch_size=3, max_latency=0.05)
+    assert len(embedder.embed_many([str(i) for i in range(7)])) == 7
+    assert max(sizes) == 3 and sum(sizes) == 7
+
+    def broken(texts):
+        raise RuntimeError("model crashed")
+
+    failing = BatchingEmbedder(broken, max_latency=0.01)
+    with pytest.raises(RuntimeError, match="model crashed"):
+        failing.embed_many(["a", "b"])
+
+
+def test_documents_are_embedded_as_passages_not_queries():
+    queries = BatchingEmbedder(lambda texts: [[1.0] for _ in texts])
+    embeddings = BatchedEmbeddings(
+        queries, embed_documents_fn=lambda texts: [[0.0] for _ in texts]
+    )
+
+    assert embeddings.embed_query("q") == [1.0]
+    assert embeddings.embed_documents(["a", "b"]) == [[0.0], [0.0]]
+    assert queries.stats()["items"] == 1
+
+
+def test_short_or_malformed_model_output_fails_every_waiter():
+    short = BatchingEmbedder(lambda texts: [[0.0] for _ in texts[1:]], max_latency=0.05)
+    futures = [short.submit(text) for text in ("a", "b", "c")]
+    for future in futures:
+        with pytest.raises(ValueError, match="vectors for"):
+            future.result(timeout=5)
+
+    malformed = BatchingEmbedder(lambda texts: [None for _ in texts], max_latency=0)
+    with pytest.raises(TypeError):
+        malformed.submit("a").result(timeout=5)
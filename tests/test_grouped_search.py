@@ -0,0 +1,81 @@
+# backend/tests/test_grouped_search.py
+
+import pytest
+from qdrant_client import QdrantClient, models
+
+from api.ai_core.config import VECTOR_NAME
+from api.ai_core.grouped_search import query_post_groups
+
+COLLECTION = "grouped"
+
+
+@pytest.fixture
+def client():
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        COLLECTION,
+        vectors_config={
+            VECTOR_NAME: models.VectorParams(size=2, distance=models.Distance.COSINE)
+        },
+    )
+    # Post 1 has three chunks close to the query, posts 2-4 one chunk each
+    vectors = {
+        1: [[1.0, 0.0], [1.0, 0.05], [1.0, 0.1]],
+        2: [[1.0, 0.2]],
+        3: [[1.0, 0.5]],
+        4: [[0.0, 1.0]],
+    }
+    points = [
+        models.PointStruct(
+            id=len(vectors) * post_id + i,
+            vector={VECTOR_NAME: vector},
+            payload={"document": f"chunk {i}", "original_id": post_id, "chunk": i},
+        )
+        for post_id, chunks in vectors.items()
+        for i, vector in enumerate(chunks)
+    ]
+    client.upsert(COLLECTION, points=points)
+    return client
+
+
+def search(client, **page):
+    return query_post_groups(
+        client, COLLECTION, query=[1.0, 0.0], using=VECTOR_NAME, **page
+    )
+
+
+def test_one_entry_per_post_with_its_best_chunk(client):
+    page = search(client, limit=3)
+
+    assert [entry["post_id"] for entry in page["result"]] == [1, 2, 3]
+    best = page["result"][0]
+    assert best["chunks"] == [
+        {"original_id": 1, "chunk": 0, "score": pytest.approx(best["score"])}
+    ]
+    assert page["next_offset"] == 3
+
+
+def test_group_size_pagination_and_score_threshold(client):
+    first = search(client, limit=1, group_size=2)
+    assert [chunk["chunk"] for chunk in first["result"][0]["chunks"]] == [0, 1]
+
+    second = search(client, offset=first["next_offset"], limit=2)
+    assert [entry["post_id"] for entry in second["result"]] == [2, 3]
+    assert second["next_offset"] == 3
+
+    last = search(client, offset=3, limit=2)
+    assert [entry["post_id"] for entry in last["result"]] == [4]
+    assert last["next_offset"] is None
+
+    close = search(client, limit=10, score_threshold=0.9)
+    assert [entry["post_id"] for entry in close["result"]] == [1, 2]
+
+
+def test_pages_stop_at_the_group_cap(client):
+    first = search(client, limit=2, max_groups=3)
+    assert first["next_offset"] == 2
+
+    # The page reaching the cap is shortened and is the last one
+    last = search(client, offset=first["next_offset"], limit=2, max_groups=3)
+    assert [entry["post_id"] for entry in last["result"]] == [3]
+    assert last["limit"] == 1 and last["next_offset"] is None
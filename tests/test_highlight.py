@@ -0,0 +1,48 @@
+# backend/tests/test_highlight.py
+
+from api.ai_core.highlight import ELLIPSIS, highlight, query_pattern
+
+
+def test_marks_all_terms_in_one_pass():
+    text = "Vectors and a vector index make Qdrant fast"
+
+    marked = highlight(text, "vector qdrant", snippet_chars=0)
+
+    assert marked == (
+        "<b>Vectors</b> and a <b>vector</b> index make <b>Qdrant</b> fast"
+    )
+    assert query_pattern("vector qdrant") is query_pattern("vector qdrant")
+    assert highlight(text, "   ", snippet_chars=0) == text
+
+
+def test_short_words_match_exactly_and_regex_is_escaped():
+    marked = highlight("c++ and cat in the catalog", "cat c++", snippet_chars=0)
+
+    assert marked == "c++ and <b>cat</b> in the catalog"
+
+
+def test_snippets_cover_the_densest_match_clusters():
+    text = (
+        "Filler sentence. " * 20
+        + "Scalar quantization shrinks vectors. "
+        + "Filler sentence. " * 20
+        + "Binary quantization of vectors is smaller still. "
+        + "Filler sentence. " * 20
+    )
+
+    snippet = highlight(text, "binary quantization", snippet_chars=80, max_snippets=1)
+
+    assert snippet.startswith(ELLIPSIS) and snippet.endswith(ELLIPSIS)
+    assert "<b>Binary</b> <b>quantization</b>" in snippet
+    assert "Scalar" not in snippet
+    assert len(snippet) < 120
+
+    both = highlight(text, "binary quantization", snippet_chars=80, max_snippets=2)
+    assert both.index("Scalar") < both.index("Binary")
+    assert f" {ELLIPSIS} " in both
+
+
+def test_snippet_without_matches_is_the_start_of_the_text():
+    text = "word " * 100
+
+    assert highlight(text, "missing", snippet_chars=50) == text[:49] + ELLIPSIS
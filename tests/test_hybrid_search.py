@@ -0,0 +1,120 @@
+# backend/tests/test_hybrid_search.py
+
+import zlib
+from collections import Counter
+
+import pytest
+from qdrant_client import QdrantClient, models
+
+from api.ai_core import hybrid_search, init_blogposts_collection
+from api.ai_core.config import SPARSE_VECTOR_NAME, VECTOR_NAME
+from api.ai_core.embedding_service import BatchingEmbedder
+from api.ai_core.hybrid_search import HybridSearcher
+from api.ai_core.query_cache import QueryVectorCache
+
+
+def dense_vector(text):
+    return [1.0, 0.0, 0.0] if "kubernetes" in text.lower() else [0.0, 1.0, 0.1]
+
+
+def sparse_vector(text):
+    counts = Counter(zlib.crc32(word.encode()) % 10000 for word in text.lower().split())
+    return models.SparseVector(
+        indices=list(counts), values=[float(v) for v in counts.values()]
+    )
+
+
+@pytest.fixture
+def hybrid_client(monkeypatch):
+    monkeypatch.setattr(
+        init_blogposts_collection,
+        "embed_documents",
+        lambda chunks: [dense_vector(chunk) for chunk in chunks],
+    )
+    monkeypatch.setattr(
+        init_blogposts_collection,
+        "embed_sparse_documents",
+        lambda chunks: [sparse_vector(chunk) for chunk in chunks],
+    )
+    monkeypatch.setattr(hybrid_search, "embed_sparse_query", sparse_vector)
+    monkeypatch.setattr(hybrid_search, "query_vector_cache", QueryVectorCache())
+
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        init_blogposts_collection.COLLECTION_NAME,
+        vectors_config={
+            VECTOR_NAME: models.VectorParams(size=3, distance=models.Distance.COSINE)
+        },
+        sparse_vectors_config={
+            SPARSE_VECTOR_NAME: models.SparseVectorParams(modifier=models.Modifier.IDF)
+        },
+    )
+    init_blogposts_collection.upload_batch_embeddings(
+        [
+            {"id": 1, "title": "Cooking", "content": "How to bake sourdough bread"},
+            {"id": 2, "title": "Ops", "content": "Deploying apps on Kubernetes"},
+            {"id": 3, "title": "Travel", "content": "A week of hiking in the Alps"},
+        ],
+        client=client,
+    )
+    return client
+
+
+def test_chunks_store_dense_and_sparse_vectors(hybrid_client):
+    points, _ = hybrid_client.scroll(
+        init_blogposts_collection.COLLECTION_NAME, limit=10, with_vectors=True
+    )
+
+    assert len(points) == 3
+    assert all(set(p.vector) == {VECTOR_NAME, SPARSE_VECTOR_NAME} for p in points)
+
+
+@pytest.mark.parametrize("fusion", ["rrf", "dbsf"])
+def test_hybrid_search_fuses_dense_and_sparse_rankings(hybrid_client, fusion):
+    searcher = HybridSearcher(
+        init_blogposts_collection.COLLECTION_NAME,
+        client=hybrid_client,
+        embedder=BatchingEmbedder(lambda texts: [dense_vector(t) for t in texts]),
+    )
+
+    results = searcher.search("kubernetes deploying", fusion=fusion)
+
+    assert results[0]["original_id"] == 2
+    assert "document" not in results[0]
+
+    with pytest.raises(ValueError, match="Unknown fusion"):
+        searcher.query("kubernetes", fusion="max")
+
+
+def test_hybrid_search_groups_by_post(hybrid_client):
+    searcher = HybridSearcher(
+        init_blogposts_collection.COLLECTION_NAME,
+        client=hybrid_client,
+        embedder=BatchingEmbedder(lambda texts: [dense_vector(t) for t in texts]),
+    )
+
+    page = searcher.search_groups("kubernetes deploying", limit=2)
+
+    assert page["result"][0]["post_id"] == 2
+    assert len(page["result"]) == 2 and page["next_offset"] == 2
+    assert "document" not in page["result"][0]["chunks"][0]
+
+
+def test_hybrid_search_on_a_dense_only_collection_asks_for_a_rebuild():
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        "dense-only",
+        vectors_config={
+            VECTOR_NAME: models.VectorParams(size=3, distance=models.Distance.COSINE)
+        },
+    )
+    searcher = HybridSearcher(
+        "dense-only",
+        client=client,
+        embedder=BatchingEmbedder(lambda texts: [dense_vector(t) for t in texts]),
+    )
+
+    with pytest.raises(ValueError, match="--rebuild"):
+        searcher.search("kubernetes")
+    with pytest.raises(ValueError, match="no sparse vectors"):
+        searcher.search_groups("kubernetes", limit=2)
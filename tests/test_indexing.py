@@ -0,0 +1,381 @@
+# backend/tests/test_indexing.py
+
+import asyncio
+import random
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from qdrant_client import QdrantClient, models
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from api.ai_core import init_blogposts_collection
+from api.ai_core.chunking import content_hash
+from api.db.database import Base
+from api.v1.models.blog import BlogPost
+from api.v1.models.index_job import IndexJob
+from api.v1.services.indexing_service import EmbeddingWorker
+
+
+def make_post(post_id, content):
+    return BlogPost(
+        id=post_id,
+        title=f"Post {post_id}",
+        content=content,
+        description="A short summary of the post.",
+        author="John Doe",
+        published="true",
+        readTime="5 min",
+        slug=f"post-{post_id}",
+        category="Technology",
+        image="https://example.com/image.jpg",
+    )
+
+
+def local_client():
+    """Qdrant local mode client holding the blog post collection"""
+    client = QdrantClient(":memory:")
+    client.create_collection(
+        init_blogposts_collection.COLLECTION_NAME,
+        vectors_config={
+            init_blogposts_collection.VECTOR_NAME: models.VectorParams(
+                size=4, distance=models.Distance.COSINE
+            )
+        },
+    )
+    return client
+
+
+def fake_embed_documents(chunks):
+    return [[random.random() for _ in range(4)] for _ in chunks]
+
+
+@pytest.fixture
+def sqlite_session_local(monkeypatch):
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session_local = sessionmaker(bind=engine)
+    monkeypatch.setattr(init_blogposts_collection, "SessionLocal", session_local)
+    monkeypatch.setattr(
+        init_blogposts_collection, "embed_documents", fake_embed_documents
+    )
+    yield session_local
+    engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path):
+    # A file database gives the worker and the test their own connections
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/blogposts.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async with factory() as db:
+        for post_id in (1, 2):
+            db.add(make_post(post_id, f"Content {post_id}"))
+            db.add(IndexJob(post_id=post_id))
+        await db.commit()
+
+    yield factory
+    await engine.dispose()
+
+
+async def wait_for_status(factory, post_ids, status, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        async with factory() as db:
+            jobs = [await db.get(IndexJob, post_id) for post_id in post_ids]
+        if all(job.status == status for job in jobs):
+            return jobs
+        assert asyncio.get_running_loop().time() < deadline, [j.status for j in jobs]
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_worker_recovers_pending_jobs_and_batches_them(session_factory):
+    batches = []
+    worker = EmbeddingWorker(
+        session_factory=session_factory,
+        index_fn=lambda posts: batches.append([post["id"] for post in posts]),
+        batch_window=0.05,
+    )
+
+    await worker.start()
+    try:
+        jobs = await wait_for_status(session_factory, [1, 2], IndexJob.DONE)
+    finally:
+        await worker.stop()
+
+    assert batches == [[1, 2]]
+    assert all(job.attempts == 1 for job in jobs)
+
+
+@pytest.mark.asyncio
+async def test_worker_notifies_listeners_of_indexed_posts(session_factory):
+    indexed = []
+    worker = EmbeddingWorker(
+        session_factory=session_factory, index_fn=lambda posts: None, batch_window=0.05
+    )
+    worker.add_listener(lambda posts: indexed.extend(posts))
+
+    await worker.start()
+    try:
+        await wait_for_status(session_factory, [1, 2], IndexJob.DONE)
+        for _ in range(200):
+            if len(indexed) == 2:
+                break
+            await asyncio.sleep(0.01)
+    finally:
+        await worker.stop()
+
+    assert sorted(post["id"] for post in indexed) == [1, 2]
+    assert indexed[0]["category"] == "Technology"
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_with_backoff_then_fails(session_factory):
+    calls = []
+
+    def flaky_index(posts):
+        calls.append(posts)
+        raise RuntimeError("Qdrant unavailable")
+
+    worker = EmbeddingWorker(
+        session_factory=session_factory,
+        index_fn=flaky_index,
+        batch_window=0.01,
+        max_retries=3,
+        backoff=0.01,
+    )
+
+    await worker.start()
+    try:
+        jobs = await wait_for_status(session_factory, [1, 2], IndexJob.FAILED)
+    finally:
+        await worker.stop()
+
+    assert len(calls) == 3
+    assert all(job.attempts == 3 for job in jobs)
+    assert all(job.last_error == "Qdrant unavailable" for job in jobs)
+
+
+def test_reindex_only_touches_changed_and_orphaned_posts(sqlite_session_local):
+    session_local = sqlite_session_local
+    db = session_local()
+    db.add_all(
+        [
+            make_post(1, "alpha " * 300),
+            make_post(2, "beta"),
+            make_post(3, "c"),
+            # No chunks: never indexed, never reported as new
+            make_post(4, "  "),
+        ]
+    )
+    db.commit()
+    db.close()
+
+    client = local_client()
+    dry_run = init_blogposts_collection.reindex_posts(client=client, dry_run=True)
+    assert dry_run.new == [1, 2, 3]
+    assert client.count(init_blogposts_collection.COLLECTION_NAME).count == 0
+
+    init_blogposts_collection.reindex_posts(client=client)
+    assert init_blogposts_collection.reindex_posts(client=client).unchanged == 4
+
+    # Edit post 1 into a single chunk and delete post 3
+    db = session_local()
+    post = db.get(BlogPost, 1)
+    post.content = "delta"
+    post.content_hash = content_hash(post.content)
+    db.delete(db.get(BlogPost, 3))
+    db.commit()
+    db.close()
+
+    invalidated = []
+    retrieval_cache = SimpleNamespace(invalidate=invalidated.append)
+    report = init_blogposts_collection.reindex_posts(
+        client=client, retrieval_cache=retrieval_cache
+    )
+    assert (report.new, report.changed, report.orphaned) == ([], [1], [3])
+    assert sorted(invalidated) == [1, 3]
+
+    points, _ = client.scroll(init_blogposts_collection.COLLECTION_NAME, limit=100)
+    assert sorted(p.payload["original_id"] for p in points) == [1, 2]
+
+
+def test_index_corpus_streams_every_chunk_in_fixed_batches(sqlite_session_local):
+    db = sqlite_session_local()
+    db.add_all([make_post(i, f"Post number {i} " * 200) for i in range(1, 11)])
+    db.commit()
+    db.close()
+
+    client = local_client()
+    upserts = []
+    upsert_chunks = init_blogposts_collection.upsert_chunks
+
+    def recording_upsert(client, chunks, *args):
+        upserts.append(len(chunks))
+        upsert_chunks(client, chunks, *args)
+
+    with patch.object(init_blogposts_collection, "upsert_chunks", recording_upsert):
+        stats = init_blogposts_collection.index_corpus(
+            client, batch_size=8, prefetch=1, fetch_size=3
+        )
+
+    total = client.count(init_blogposts_collection.COLLECTION_NAME).count
+    assert stats["read"].items == 10
+    assert stats["chunk"].items == stats["upsert"].items == total
+    assert all(size == 8 for size in upserts[:-1])
+    assert sum(upserts) == total
+
+
+def test_index_corpus_stops_reading_when_upsert_fails(sqlite_session_local):
+    db = sqlite_session_local()
+    db.add_all([make_post(i, f"Post number {i} " * 20) for i in range(1, 201)])
+    db.commit()
+    db.close()
+
+    read = []
+    iter_posts = init_blogposts_collection.iter_posts
+
+    def recording_iter_posts(*args):
+        for post in iter_posts(*args):
+            read.append(post)
+            yield post
+
+    def failing_upsert(*args):
+        raise RuntimeError("Qdrant unavailable")
+
+    with patch.object(
+        init_blogposts_collection, "iter_posts", recording_iter_posts
+    ), patch.object(init_blogposts_collection, "upsert_chunks", failing_upsert):
+        with pytest.raises(RuntimeError, match="Qdrant unavailable"):
+            init_blogposts_collection.index_corpus(
+                local_client(), batch_size=1, prefetch=1, fetch_size=1
+            )
+
+    # The producer gave up after the batches already queued
+    assert len(read) < 10
+
+
+def text_vector(text):
+    rng = random.Random(text)
+    return [rng.random() for _ in range(4)]
+
+
+@pytest.fixture
+def rebuild_env(sqlite_session_local, monkeypatch):
+    def create_local_collection(client, collection_name, quantization=None):
+        client.create_collection(
+            collection_name,
+            vectors_config={
+                init_blogposts_collection.VECTOR_NAME: models.VectorParams(
+                    size=4, distance=models.Distance.COSINE
+                )
+            },
+        )
+
+    monkeypatch.setattr(
+        init_blogposts_collection, "create_collection", create_local_collection
+    )
+    monkeypatch.setattr(
+        init_blogposts_collection,
+        "embed_documents",
+        lambda chunks: [text_vector(chunk) for chunk in chunks],
+    )
+    monkeypatch.setattr(init_blogposts_collection, "embed_query", text_vector)
+
+    db = sqlite_session_local()
+    db.add_all([make_post(i, f"Post number {i} " * 100) for i in range(1, 6)])
+    db.commit()
+    db.close()
+    return sqlite_session_local
+
+
+def test_rebuild_swaps_alias_and_rolls_back(rebuild_env):
+    alias = init_blogposts_collection.COLLECTION_NAME
+    client = local_client()
+
+    # The unversioned collection is replaced by an alias on the first rebuild
+    first = init_blogposts_collection.rebuild_collection(client)
+    assert first.previous is None and first.recall == 1.0
+    assert init_blogposts_collection.alias_target(client) == first.collection
+    assert client.count(alias).count == first.points > 0
+
+    second = init_blogposts_collection.rebuild_collection(client)
+    assert second.previous == first.collection
+    assert init_blogposts_collection.alias_target(client) == second.collection
+
+    assert init_blogposts_collection.rollback_collection(client) == (
+        second.collection,
+        first.collection,
+    )
+    assert init_blogposts_collection.alias_target(client) == first.collection
+
+    third = init_blogposts_collection.rebuild_collection(client, keep=2)
+    assert third.pruned == [first.collection]
+    assert init_blogposts_collection.collection_versions(client) == [
+        second.collection,
+        third.collection,
+    ]
+
+
+def test_posts_without_chunks_count_as_indexed(rebuild_env):
+    db = rebuild_env()
+    db.add_all([make_post(98, ""), make_post(99, " \n ")])
+    db.commit()
+    db.close()
+    client = local_client()
+
+    report = init_blogposts_collection.rebuild_collection(client)
+    assert report.recall == 1.0
+
+    diff = init_blogposts_collection.reindex_posts(client, dry_run=True)
+    assert (diff.new, diff.changed, diff.orphaned) == ([], [], [])
+    assert diff.unchanged == 7
+
+
+def test_failed_rebuild_leaves_live_collection_untouched(rebuild_env):
+    client = local_client()
+    live = init_blogposts_collection.rebuild_collection(client).collection
+
+    with pytest.raises(RuntimeError, match="Sample queries"):
+        init_blogposts_collection.rebuild_collection(client, min_recall=1.1)
+
+    assert init_blogposts_collection.alias_target(client) == live
+    assert init_blogposts_collection.collection_versions(client) == [live]
+
+
+def test_migrate_payload_indexes_backfills_category_and_author(
+    sqlite_session_local,
+):
+    db = sqlite_session_local()
+    db.add_all([make_post(1, "alpha " * 300), make_post(2, "beta")])
+    db.commit()
+    db.close()
+
+    # Chunks indexed before category/author were part of the payload
+    client = local_client()
+    init_blogposts_collection.upload_batch_embeddings(
+        [
+            {"id": 1, "title": "Post 1", "content": "alpha " * 300},
+            {"id": 2, "title": "Post 2", "content": "beta"},
+        ],
+        client=client,
+    )
+
+    created, posts = init_blogposts_collection.migrate_payload_indexes(client)
+    assert posts == 2
+    assert set(created) <= set(init_blogposts_collection.PAYLOAD_INDEXES)
+
+    points, _ = client.scroll(init_blogposts_collection.COLLECTION_NAME, limit=100)
+    assert len(points) > 2
+    assert all(p.payload["category"] == "Technology" for p in points)
+    assert all(p.payload["author"] == "John Doe" for p in points)
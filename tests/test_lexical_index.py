@@ -0,0 +1,90 @@
+# backend/tests/test_lexical_index.py
+
+import os
+import multiprocessing
+
+import numpy as np
+
+from api.ai_core.lexical_index import LexicalIndex
+
+
+def post(post_id, content, category="Technology"):
+    return {
+        "id": post_id,
+        "title": f"Post {post_id}",
+        "content": content,
+        "category": category,
+        "author": "John Doe",
+    }
+
+
+POSTS = [
+    post(1, "Python tips for writing readable code"),
+    post(2, "Qdrant vector search: filtering, payload indexes and vector quantization"),
+    post(3, "Cooking pasta at home", category="Food"),
+    post(4, "Vector databases compared"),
+]
+
+
+def ids(results):
+    return [payload["original_id"] for _, payload in results]
+
+
+def test_bm25_ranks_by_relevance_not_storage_order():
+    index = LexicalIndex.from_posts(POSTS)
+
+    results = index.search("vector quantization", top=3)
+
+    assert ids(results) == [2, 4]
+    assert results[0][0] > results[1][0]
+    assert results[0][1]["page_content"] == POSTS[1]["content"]
+    assert index.search("vector", top=5, conditions={"category": "Food"}) == []
+
+
+def test_incremental_updates_match_a_fresh_build():
+    index = LexicalIndex.from_posts(POSTS[:2])
+    index.add_documents([])
+    index.update_posts([post(1, "Vector search in Python"), *POSTS[2:]])
+    index.remove_posts([3])
+
+    expected = LexicalIndex.from_posts(
+        [post(1, "Vector search in Python"), POSTS[1], POSTS[3]]
+    )
+    for query in ("vector", "python search", "pasta"):
+        assert index.search(query) == expected.search(query)
+
+    index.compact()
+    assert index.search("vector search") == expected.search("vector search")
+    assert len(index) == len(expected) == 3
+
+
+def test_saved_index_is_memory_mapped_and_still_updatable(tmp_path):
+    index = LexicalIndex.from_posts(POSTS)
+    index.remove_posts([1])
+    index.save(tmp_path)
+
+    loaded = LexicalIndex.load(tmp_path)
+    assert isinstance(loaded.doc_ids, np.memmap)
+    assert loaded.search("vector") == index.search("vector")
+    assert loaded.post_hashes() == index.post_hashes()
+
+    loaded.update_posts([post(5, "Scalar quantization of vectors")])
+    assert ids(loaded.search("quantization")) == [5, 2]
+
+
+def _save(directory):
+    LexicalIndex.from_posts(POSTS).save(directory)
+
+
+def test_concurrent_saves_of_worker_processes(tmp_path):
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_save, args=(tmp_path,)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=30)
+
+    assert [process.exitcode for process in processes] == [0, 0, 0, 0]
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    expected = LexicalIndex.from_posts(POSTS).search("vector")
+    assert LexicalIndex.load(tmp_path).search("vector") == expected
@@ -0,0 +1,17 @@
+# backend/tests/test_providers.py
+
+import pytest
+
+from api.ai_core.config import VECTOR_NAME
+from api.ai_core.providers import embedding_dimension, vector_params
+
+
+def test_vector_params_match_the_fastembed_model_without_loading_it():
+    params = vector_params(on_disk=True)
+
+    assert list(params) == [VECTOR_NAME]
+    assert params[VECTOR_NAME].size == 384
+    assert params[VECTOR_NAME].on_disk
+
+    with pytest.raises(ValueError, match="not a supported fastembed model"):
+        embedding_dimension("acme/unknown-model")
@@ -0,0 +1,69 @@
+# backend/tests/test_query_cache.py
+
+from langchain_core.embeddings import Embeddings
+
+from api.ai_core.query_cache import CachedQueryEmbeddings, QueryVectorCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class CountingEmbeddings(Embeddings):
+    def __init__(self):
+        self.calls = 0
+
+    def embed_documents(self, texts):
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text):
+        self.calls += 1
+        return [float(len(text))]
+
+
+def test_query_cache_normalizes_text_and_keys_by_model():
+    cache = QueryVectorCache(max_entries=10)
+    calls = []
+
+    def embed(text):
+        calls.append(text)
+        return [1.0, 2.0]
+
+    cache.get_or_embed("model-a", "What is  RAG?", embed)
+    cache.get_or_embed("model-a", " what is rag? ", embed)
+    cache.get_or_embed("model-b", "What is RAG?", embed)
+
+    assert calls == ["What is  RAG?", "What is RAG?"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+
+def test_query_cache_evicts_lru_and_expires():
+    clock = FakeClock()
+    cache = QueryVectorCache(max_entries=2, ttl=10, clock=clock)
+    cache.set("m", "a", [1.0])
+    cache.set("m", "b", [2.0])
+    cache.get("m", "a")
+    cache.set("m", "c", [3.0])
+
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "a") == [1.0]
+    assert cache.stats()["evictions"] == 1
+
+    clock.now = 10
+    assert cache.get("m", "a") is None
+
+
+def test_cached_query_embeddings_only_caches_queries():
+    inner = CountingEmbeddings()
+    embeddings = CachedQueryEmbeddings(
+        inner, model_name="m", cache=QueryVectorCache(max_entries=10)
+    )
+
+    assert embeddings.embed_query("hello") == embeddings.embed_query("Hello")
+    assert inner.calls == 1
+    assert embeddings.embed_documents(["ab", "c"]) == [[2.0], [1.0]]
@@ -0,0 +1,83 @@
+# backend/tests/test_retrieval_cache.py
+
+from api.ai_core.retrieval_cache import RetrievalCache
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.commands = []
+
+    def get(self, key):
+        self.commands.append("GET")
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.commands.append("SETEX")
+        self.data[key] = value
+
+    def incr(self, key):
+        self.commands.append("INCR")
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+
+def retrieve(chunks):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return chunks
+
+    return fn, calls
+
+
+def test_cache_is_keyed_on_the_normalized_query():
+    cache = RetrievalCache(FakeRedis())
+    fn, calls = retrieve([{"content": "a", "metadata": {"original_id": 1}}])
+
+    assert cache.get_or_retrieve(1, "What is HNSW?", 4, "similarity", fn)[1] is False
+    chunks, hit = cache.get_or_retrieve(1, "  what is hnsw? ", 4, "similarity", fn)
+    assert hit and chunks == [{"content": "a", "metadata": {"original_id": 1}}]
+
+    # A different query, k, search type or article is a different entry
+    cache.get_or_retrieve(1, "Other question", 4, "similarity", fn)
+    cache.get_or_retrieve(1, "What is HNSW?", 8, "similarity", fn)
+    cache.get_or_retrieve(1, "What is HNSW?", 4, "mmr", fn)
+    cache.get_or_retrieve(2, "What is HNSW?", 4, "similarity", fn)
+    assert len(calls) == 5
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 5
+
+
+def test_invalidation_is_one_command_per_article():
+    redis_client = FakeRedis()
+    cache = RetrievalCache(redis_client)
+    fn, calls = retrieve([])
+    cache.get_or_retrieve(1, "q", 4, "similarity", fn)
+    cache.get_or_retrieve(2, "q", 4, "similarity", fn)
+
+    redis_client.commands.clear()
+    assert cache.invalidate(1) == 1
+    assert redis_client.commands == ["INCR"]
+
+    assert cache.get_or_retrieve(1, "q", 4, "similarity", fn)[1] is False
+    assert cache.get_or_retrieve(2, "q", 4, "similarity", fn)[1] is True
+    assert len(calls) == 3
+
+
+def test_collection_version_is_part_of_the_key_and_errors_are_misses():
+    version = ["blogposts-v1"]
+    cache = RetrievalCache(FakeRedis(), collection_version=lambda: version[0])
+    fn, calls = retrieve([])
+    cache.get_or_retrieve(1, "q", 4, "similarity", fn)
+    version[0] = "blogposts-v2"
+    cache.get_or_retrieve(1, "q", 4, "similarity", fn)
+    assert len(calls) == 2
+
+    class DownRedis(FakeRedis):
+        def get(self, key):
+            raise ConnectionError("redis is down")
+
+    cache = RetrievalCache(DownRedis())
+    assert cache.get_or_retrieve(1, "q", 4, "similarity", fn) == ([], False)
+    assert cache.stats()["errors"] == 1
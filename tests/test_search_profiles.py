@@ -0,0 +1,33 @@
+# backend/tests/test_search_profiles.py
+
+import pytest
+from qdrant_client import models
+
+from api.ai_core.search_profiles import (
+    QUANTIZATION_TYPES,
+    quantization_config,
+    search_params,
+)
+
+
+def test_search_profiles_trade_recall_for_latency():
+    fast, balanced, exact = (search_params(p) for p in ("fast", "balanced", "exact"))
+
+    assert fast.hnsw_ef < balanced.hnsw_ef
+    assert not fast.quantization.rescore and balanced.quantization.rescore
+    assert exact.exact and exact.quantization.ignore
+
+    with pytest.raises(ValueError, match="Unknown search profile"):
+        search_params("fastest")
+
+
+def test_quantization_config_covers_every_type():
+    configs = {kind: quantization_config(kind) for kind in QUANTIZATION_TYPES}
+
+    assert isinstance(configs["scalar"], models.ScalarQuantization)
+    assert isinstance(configs["binary"], models.BinaryQuantization)
+    assert isinstance(configs["product"], models.ProductQuantization)
+    assert configs["none"] is None
+
+    with pytest.raises(ValueError, match="Unknown quantization"):
+        quantization_config("int4")